@@ -2,12 +2,19 @@ from flask import Flask, jsonify,request
 from flask_cors import CORS
 from app.config import Config
 from app.database import db
+from app.catalog import catalog
+from app.aggregates import rating_reconciler
+from app import compression, json_provider
 import traceback
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
     
+    # Faster JSON encoding and negotiated gzip/brotli (both optional)
+    json_provider.init_app(app)
+    compression.init_app(app)
+    
     # CRITICAL: Enable CORS BEFORE registering routes
     CORS(app, 
          resources={r"/api/*": {
@@ -17,16 +24,29 @@ def create_app():
              "supports_credentials": True
          }})
     
+    # Each request (or app context, like the catalog load below) holds at most
+    # one pooled connection; hand it back when the context ends. Registered
+    # before anything runs in an app context so startup doesn't keep one.
+    app.teardown_appcontext(db.release_request_connection)
+    
     # Connect to database
     print("\n🔌 Initializing database connection...")
     if db.connect():
         print("✅ Database connection successful")
+        # Repair rating aggregates that drifted while the API was down, before
+        # the catalog reads them; then keep checking in the background
+        rating_reconciler.run()
+        rating_reconciler.start()
+        # Build the in-memory restaurant catalog up front (falls back to SQL if it fails)
+        if catalog.enabled:
+            with app.app_context():
+                catalog.load()
     else:
         print("❌ Database connection failed")
     
     # Register blueprints
     try:
-        from app.routes import auth, restaurants, reviews, ratings, analytics
+        from app.routes import auth, restaurants, reviews, ratings, analytics, metrics
         
         # Try to import profile, but don't fail if it doesn't exist
         try:
@@ -41,6 +61,7 @@ def create_app():
         app.register_blueprint(reviews.bp, url_prefix='/api/reviews')
         app.register_blueprint(ratings.bp, url_prefix='/api/ratings')
         app.register_blueprint(analytics.bp, url_prefix='/api/analytics')
+        app.register_blueprint(metrics.bp, url_prefix='/api/metrics')
         
         print("✅ All routes registered successfully")
     except Exception as e:
@@ -0,0 +1,173 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from app.catalog import catalog
+from app.database import db
+
+# Restaurants whose running rating_sum/rating_count disagree with RATINGS, or
+# whose avg_rating disagrees with them. The tolerances absorb float rounding
+# in SQLite's REAL sums; real drift is at least one rating (>= 1.0) off.
+DRIFT_SQL = """
+    SELECT r.restaurant_id, r.rating_sum, r.rating_count, r.avg_rating,
+           NVL(x.actual_sum, 0) AS actual_sum, NVL(x.actual_count, 0) AS actual_count
+    FROM RESTAURANTS r
+    LEFT JOIN (
+        SELECT restaurant_id, SUM(rating_value) AS actual_sum, COUNT(*) AS actual_count
+        FROM RATINGS
+        GROUP BY restaurant_id
+    ) x ON x.restaurant_id = r.restaurant_id
+    WHERE r.rating_count <> NVL(x.actual_count, 0)
+       OR ABS(r.rating_sum - NVL(x.actual_sum, 0)) > 0.001
+       OR (r.rating_count > 0 AND ABS(r.avg_rating - ROUND(r.rating_sum / r.rating_count, 1)) > 0.001)
+"""
+
+# Recount one restaurant in the same statement that writes the result, so a
+# rating committed between the drift scan and the repair is not lost.
+# votes is left alone: bulk loads keep the imported vote counts there until
+# the first live rating.
+REPAIR_SQL = """
+    UPDATE RESTAURANTS
+    SET (rating_sum, rating_count, avg_rating) = (
+        SELECT NVL(SUM(rating_value), 0), COUNT(*), NVL(ROUND(AVG(rating_value), 1), 0)
+        FROM RATINGS
+        WHERE restaurant_id = :restaurant_id
+    )
+    WHERE restaurant_id = :restaurant_id
+"""
+
+# Restaurants with a RATING_HISTOGRAM bin that disagrees with RATINGS: stored
+# counts minus actual counts per (restaurant, bin) must cancel out
+HISTOGRAM_DRIFT_SQL = """
+    SELECT DISTINCT restaurant_id
+    FROM (
+        SELECT restaurant_id, bin, SUM(n) AS diff
+        FROM (
+            SELECT restaurant_id, bin, rating_count AS n
+            FROM RATING_HISTOGRAM
+            UNION ALL
+            SELECT restaurant_id, ROUND(rating_value * 2) / 2 AS bin, -COUNT(*) AS n
+            FROM RATINGS
+            GROUP BY restaurant_id, ROUND(rating_value * 2) / 2
+        ) counts
+        GROUP BY restaurant_id, bin
+    ) bins
+    WHERE diff <> 0
+"""
+
+# Rebuild one restaurant's histogram from its ratings (run in one transaction)
+HISTOGRAM_REPAIR_SQL = (
+    "DELETE FROM RATING_HISTOGRAM WHERE restaurant_id = :restaurant_id",
+    """INSERT INTO RATING_HISTOGRAM (restaurant_id, bin, rating_count)
+       SELECT restaurant_id, ROUND(rating_value * 2) / 2, COUNT(*)
+       FROM RATINGS
+       WHERE restaurant_id = :restaurant_id
+       GROUP BY restaurant_id, ROUND(rating_value * 2) / 2""",
+)
+
+
+def find_drift(database=db):
+    """Restaurants whose rating aggregates are off, as dicts with stored and actual values"""
+    rows = database.execute_query(DRIFT_SQL)
+    if rows is None:
+        raise RuntimeError("Rating drift query failed")
+    return rows
+
+
+def find_histogram_drift(database=db):
+    """Ids of restaurants whose half-star histogram disagrees with RATINGS"""
+    rows = database.execute_query(HISTOGRAM_DRIFT_SQL, row_format='tuple')
+    if rows is None:
+        raise RuntimeError("Rating histogram drift query failed")
+    return [row.restaurant_id for row in rows]
+
+
+class RatingReconciler:
+    """
+    Periodic check of the running rating aggregates that the RATINGS triggers
+    maintain by delta. Each run compares RESTAURANTS.rating_sum/rating_count
+    and the RATING_HISTOGRAM bins with a full aggregate of RATINGS and
+    recounts only the restaurants that drifted (e.g. ratings loaded with the
+    triggers disabled, or a file made before the columns existed). Runs at
+    startup and then every `interval_seconds` on a daemon thread; 0 disables
+    the periodic runs.
+    """
+
+    def __init__(self, database, interval_seconds=3600):
+        self.db = database
+        self.interval_seconds = interval_seconds
+        self._thread = None
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._repaired = 0
+        self._failures = 0
+        self._last_run = None
+        self._last_drift = []
+        self._histograms_repaired = 0
+        self._last_histogram_drift = []
+
+    def run(self, fix=True):
+        """
+        Find (and unless fix=False, repair) drifted restaurants. Returns
+        (aggregate drift rows, ids with histogram drift), or None on failure.
+        """
+        with self._lock:
+            try:
+                drift = find_drift(self.db)
+                histogram_drift = find_histogram_drift(self.db)
+                if drift and fix:
+                    params = [{'restaurant_id': row['restaurant_id']} for row in drift]
+                    if self.db.execute_many(REPAIR_SQL, params) is None:
+                        raise RuntimeError("Rating aggregate repair failed")
+                    self._repaired += len(drift)
+                    for row in drift:
+                        catalog.refresh_restaurant(row['restaurant_id'])
+                    print(f"🔧 Repaired rating aggregates of {len(drift)} restaurants")
+                if histogram_drift and fix:
+                    with self.db.transaction():
+                        for restaurant_id in histogram_drift:
+                            for sql in HISTOGRAM_REPAIR_SQL:
+                                self.db.execute_non_query(sql, {'restaurant_id': restaurant_id})
+                    self._histograms_repaired += len(histogram_drift)
+                    print(f"🔧 Rebuilt rating histograms of {len(histogram_drift)} restaurants")
+                self._runs += 1
+                self._last_run = time.time()
+                self._last_drift = [row['restaurant_id'] for row in drift]
+                self._last_histogram_drift = histogram_drift
+                return drift, histogram_drift
+            except Exception as e:
+                self._failures += 1
+                print(f"⚠️  Rating reconciliation failed: {e}", file=sys.stderr)
+                traceback.print_exc()
+                return None
+
+    def start(self):
+        """Start the periodic runs (no-op when disabled or already running)"""
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='RatingReconciler', daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval_seconds)
+            self.run()
+
+    def stats(self):
+        return {
+            'runs': self._runs,
+            'repaired': self._repaired,
+            'failed_runs': self._failures,
+            'last_run': self._last_run,
+            'last_drift': self._last_drift[:50],
+            'histograms_repaired': self._histograms_repaired,
+            'last_histogram_drift': self._last_histogram_drift[:50],
+            'interval_seconds': self.interval_seconds,
+        }
+
+
+rating_reconciler = RatingReconciler(
+    db,
+    interval_seconds=int(os.getenv('RATING_RECONCILE_SECONDS', 3600))
+)
@@ -0,0 +1,16 @@
+import os
+
+
+def create_backend(name=None):
+    """
+    Build the storage backend selected by DB_BACKEND (oracle | sqlite).
+    Backends are imported lazily so each one's driver is only needed when used.
+    """
+    name = (name or os.getenv('DB_BACKEND') or 'oracle').strip().lower()
+    if name == 'oracle':
+        from app.backends.oracle import OracleBackend
+        return OracleBackend()
+    if name == 'sqlite':
+        from app.backends.sqlite import SQLiteBackend
+        return SQLiteBackend()
+    raise ValueError(f"Unknown DB_BACKEND '{name}' (expected 'oracle' or 'sqlite')")
@@ -0,0 +1,67 @@
+class Backend:
+    """
+    Storage backend used by app.database.Database.
+
+    A backend owns driver specifics: creating the connection pool, which column
+    types are LOBs, and the handful of SQL constructs that differ between
+    engines. Routes keep writing Oracle-flavoured SQL with named binds; each
+    backend is responsible for running it.
+    """
+
+    name = 'base'
+
+    # Driver type codes (cursor.description[i][1]) that need .read()
+    lob_types = ()
+
+    def create_pool(self):
+        """Return a pool object exposing acquire() and close()"""
+        raise NotImplementedError
+
+    def describe(self):
+        """Short connection description for logs and error messages"""
+        return self.name
+
+    def is_pool_timeout(self, exc):
+        """True if `exc` means the pool gave up waiting for a free connection"""
+        return False
+
+    def paginate(self, sql, limit, offset=0):
+        """Wrap an ordered query so it returns `limit` rows after skipping `offset`"""
+        raise NotImplementedError
+
+    def list_agg(self, expr, separator):
+        """Aggregate expression joining `expr` values with `separator` (order unspecified)"""
+        raise NotImplementedError
+
+    def text_prefix(self, expr, length):
+        """Expression for the first `length` characters of a CLOB/text column, as a plain string"""
+        raise NotImplementedError
+
+    def text_length(self, expr):
+        """Expression for the length in characters of a CLOB/text column"""
+        raise NotImplementedError
+
+    def insert_ignore_sql(self, table, columns, key_index):
+        """
+        Head of an INSERT into `table` (`columns`) that skips rows duplicating
+        unique index `key_index`; the caller appends VALUES (...) or a SELECT.
+        """
+        raise NotImplementedError
+
+    def upsert_sql(self, table, id_column, keys, values, bind_name):
+        """
+        One statement that inserts a `table` row or, if a row with the same
+        `keys` (columns of a unique key) exists, updates it with `values`
+        ({column: SQL expression}). Binds :<id_column> (used when inserting)
+        and :<key> for each key; run it with execute_returning(`bind_name`),
+        which yields the id of the inserted or updated row.
+        """
+        raise NotImplementedError
+
+    def row_estimate_sql(self, table):
+        """Query returning the approximate row count of `table` from statistics (NULL if unknown)"""
+        raise NotImplementedError
+
+    def execute_returning(self, cursor, sql, params, bind_name):
+        """Run DML with a `RETURNING <col> INTO :<bind_name>` clause; return the value"""
+        raise NotImplementedError
@@ -0,0 +1,115 @@
+import os
+import oracledb
+from app.backends.base import Backend
+from app.backends.pool_monitor import pool_settings
+
+# Try to initialize thick mode for older Oracle versions
+try:
+    if oracledb.is_thin_mode():
+        try:
+            oracledb.init_oracle_client()
+            print("✅ Initialized Oracle client in thick mode")
+        except Exception as e:
+            error_msg = str(e)
+            if "DPY-3010" in error_msg or "thick mode" in error_msg.lower():
+                print("⚠️  Oracle Instant Client not found or not in PATH")
+                print("   Please install Oracle Instant Client for Oracle XE 11g")
+            else:
+                print(f"⚠️  Could not initialize thick mode: {e}")
+except Exception:
+    pass
+
+
+class OracleBackend(Backend):
+    name = 'oracle'
+    lob_types = (oracledb.DB_TYPE_CLOB, oracledb.DB_TYPE_NCLOB, oracledb.DB_TYPE_BLOB)
+
+    def __init__(self):
+        self.user = os.getenv('ORACLE_USER')
+        self.password = os.getenv('ORACLE_PASSWORD')
+        self.dsn = os.getenv('ORACLE_DSN')
+
+    def create_pool(self):
+        settings = pool_settings()
+        print(f"Attempting to create DB pool with user={self.user}, dsn={self.dsn}, "
+              f"min={settings['min']}, max={settings['max']}")
+        options = {}
+        if settings['wait_timeout_ms']:
+            # Fail fast with DPY-4005 instead of blocking requests indefinitely
+            options['getmode'] = oracledb.POOL_GETMODE_TIMEDWAIT
+            options['wait_timeout'] = settings['wait_timeout_ms']
+        else:
+            options['getmode'] = oracledb.POOL_GETMODE_WAIT
+        return oracledb.create_pool(
+            user=self.user,
+            password=self.password,
+            dsn=self.dsn,
+            min=settings['min'],
+            max=settings['max'],
+            increment=settings['increment'],
+            **options
+        )
+
+    def is_pool_timeout(self, exc):
+        return 'DPY-4005' in str(exc)
+
+    def describe(self):
+        return f"User: {self.user}, DSN: {self.dsn}"
+
+    def paginate(self, sql, limit, offset=0):
+        # ROWNUM for Oracle 11g compatibility (no OFFSET/FETCH)
+        if not offset:
+            return f"SELECT * FROM ({sql}) WHERE ROWNUM <= {int(limit)}"
+        return f"""
+            SELECT * FROM (
+                SELECT page_.*, ROWNUM rnum_ FROM ({sql}) page_
+                WHERE ROWNUM <= {int(offset) + int(limit)}
+            ) WHERE rnum_ > {int(offset)}
+        """
+
+    def list_agg(self, expr, separator):
+        return f"LISTAGG({expr}, '{separator}') WITHIN GROUP (ORDER BY {expr})"
+
+    def text_prefix(self, expr, length):
+        # A VARCHAR2 result, fetched inline with the row rather than as a LOB locator
+        return f"DBMS_LOB.SUBSTR({expr}, {int(length)}, 1)"
+
+    def text_length(self, expr):
+        return f"DBMS_LOB.GETLENGTH({expr})"
+
+    def insert_ignore_sql(self, table, columns, key_index):
+        # 11g hint: duplicate keys are skipped instead of raising ORA-00001 (works with array binds)
+        return f"INSERT /*+ IGNORE_ROW_ON_DUPKEY_INDEX({table}, {key_index}) */ INTO {table} ({', '.join(columns)})"
+
+    def upsert_sql(self, table, id_column, keys, values, bind_name):
+        # 11g MERGE has no RETURNING clause: an anonymous block merges and
+        # reads the id back in the same round trip. A concurrent insert of
+        # the same key (ORA-00001) falls back to updating that row.
+        match = ' AND '.join(f"{key} = :{key}" for key in keys)
+        assignments = ', '.join(f"{column} = {expr}" for column, expr in values.items())
+        columns = ', '.join((id_column, *keys, *values))
+        exprs = ', '.join((f":{id_column}", *(f":{key}" for key in keys), *values.values()))
+        return f"""BEGIN
+            MERGE INTO {table} USING DUAL ON ({match})
+            WHEN MATCHED THEN UPDATE SET {assignments}
+            WHEN NOT MATCHED THEN INSERT ({columns}) VALUES ({exprs});
+            SELECT {id_column} INTO :{bind_name} FROM {table} WHERE {match};
+        EXCEPTION WHEN DUP_VAL_ON_INDEX THEN
+            UPDATE {table} SET {assignments} WHERE {match}
+            RETURNING {id_column} INTO :{bind_name};
+        END;"""
+
+    def row_estimate_sql(self, table):
+        # Optimizer statistics (DBMS_STATS / auto stats job); NULL until gathered
+        return f"SELECT num_rows FROM USER_TABLES WHERE table_name = '{table.upper()}'"
+
+    def execute_returning(self, cursor, sql, params, bind_name):
+        out_var = cursor.var(oracledb.DB_TYPE_VARCHAR)
+        bind_params = dict(params or {})
+        bind_params[bind_name] = out_var
+        cursor.execute(sql, bind_params)
+        value = out_var.getvalue()
+        # DML RETURNING yields one value per affected row
+        if isinstance(value, list):
+            return value[0] if value else None
+        return value
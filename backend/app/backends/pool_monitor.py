@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+
+# Upper bounds (ms) of the acquire-wait histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def pool_settings():
+    """
+    Pool sizing from the environment:
+      DB_POOL_MIN / DB_POOL_MAX / DB_POOL_INCREMENT  initial pool size
+      DB_POOL_CEILING         hard upper bound the adaptive policy may grow max to
+      DB_POOL_WAIT_TIMEOUT_MS give up on acquire after this long (0 = wait forever)
+      DB_POOL_ADAPTIVE        'false' disables automatic resizing
+    """
+    pool_min = max(1, _env_int('DB_POOL_MIN', 1))
+    pool_max = max(pool_min, _env_int('DB_POOL_MAX', 4))
+    return {
+        'min': pool_min,
+        'max': pool_max,
+        'increment': max(1, _env_int('DB_POOL_INCREMENT', 1)),
+        'ceiling': max(pool_max, _env_int('DB_POOL_CEILING', pool_max * 4)),
+        'wait_timeout_ms': max(0, _env_int('DB_POOL_WAIT_TIMEOUT_MS', 5000)),
+        'adaptive': os.getenv('DB_POOL_ADAPTIVE', 'true').lower() not in ('0', 'false', 'no'),
+    }
+
+
+class PoolMonitor:
+    """
+    Records how long callers wait for a pooled connection and adapts the pool's
+    max size to observed load.
+
+    Every `window` seconds the policy looks at what happened since the last
+    decision: if callers timed out, queued behind a saturated pool, or waited
+    longer than `grow_wait_ms` on average, max grows by `increment` (up to the
+    ceiling); if the busy high-water mark stayed at or below half of max, it
+    shrinks back by `increment` (never below the configured max).
+    """
+
+    def __init__(self, settings, window=10.0, grow_wait_ms=20.0):
+        self.settings = settings
+        self.window = window
+        self.grow_wait_ms = grow_wait_ms
+        self._lock = threading.Lock()
+        self.acquires = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.resizes = []
+        self._reset_window(time.monotonic())
+
+    def _reset_window(self, now):
+        self._window_start = now
+        self._window_acquires = 0
+        self._window_wait = 0.0
+        self._window_timeouts = 0
+        self._window_saturated = 0
+        self._window_busy_high = 0
+
+    # -- recording ---------------------------------------------------------
+
+    def begin_wait(self):
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def record_acquire(self, wait_seconds, pool):
+        busy, pool_max = getattr(pool, 'busy', 0), getattr(pool, 'max', 0)
+        with self._lock:
+            self.waiting -= 1
+            self.acquires += 1
+            self.total_wait += wait_seconds
+            self.max_wait = max(self.max_wait, wait_seconds)
+            wait_ms = wait_seconds * 1000
+            for i, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+            self._window_acquires += 1
+            self._window_wait += wait_seconds
+            self._window_busy_high = max(self._window_busy_high, busy)
+            if pool_max and busy >= pool_max:
+                self._window_saturated += 1
+        self._maybe_adapt(pool)
+
+    def record_failure(self, pool, timeout=False):
+        with self._lock:
+            self.waiting -= 1
+            if timeout:
+                self.timeouts += 1
+                self._window_timeouts += 1
+            else:
+                self.errors += 1
+        self._maybe_adapt(pool)
+
+    # -- adaptive sizing -----------------------------------------------------
+
+    def _maybe_adapt(self, pool):
+        if not self.settings['adaptive'] or not hasattr(pool, 'reconfigure'):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._window_start < self.window:
+                return
+            acquires = self._window_acquires
+            avg_wait_ms = (self._window_wait / acquires * 1000) if acquires else 0.0
+            pressured = (
+                self._window_timeouts > 0
+                or (self._window_saturated > 0 and avg_wait_ms > 1)
+                or avg_wait_ms > self.grow_wait_ms
+            )
+            idle = self._window_busy_high * 2 <= pool.max and not self._window_timeouts
+            self._reset_window(now)
+
+        step = self.settings['increment']
+        new_max = pool.max
+        if pressured and pool.max < self.settings['ceiling']:
+            new_max = min(self.settings['ceiling'], pool.max + step)
+        elif idle and pool.max > self.settings['max']:
+            new_max = max(self.settings['max'], pool.max - step)
+        if new_max == pool.max:
+            return
+        try:
+            old_max = pool.max
+            pool.reconfigure(max=new_max)
+            with self._lock:
+                self.resizes.append({'at': time.time(), 'from': old_max, 'to': new_max})
+                del self.resizes[:-20]
+            print(f"🔧 DB pool max resized {old_max} -> {new_max} (avg wait {avg_wait_ms:.1f}ms)")
+        except Exception as e:
+            print(f"⚠️  Could not resize DB pool: {e}")
+
+    # -- reporting -----------------------------------------------------------
+
+    def snapshot(self, pool=None):
+        with self._lock:
+            labels = [f"le_{b}ms" for b in WAIT_BUCKETS_MS] + ['gt_5000ms']
+            data = {
+                'acquires': self.acquires,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'waiting': self.waiting,
+                'max_waiting': self.max_waiting,
+                'avg_wait_ms': round(self.total_wait / self.acquires * 1000, 3) if self.acquires else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+                'wait_histogram': dict(zip(labels, self.buckets)),
+                'resizes': list(self.resizes),
+                'settings': dict(self.settings),
+            }
+        if pool is not None:
+            data['pool'] = {
+                'open': getattr(pool, 'opened', None),
+                'busy': getattr(pool, 'busy', None),
+                'min': getattr(pool, 'min', None),
+                'max': getattr(pool, 'max', None),
+            }
+        return data
@@ -0,0 +1,326 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from app.backends.base import Backend
+from app.backends.pool_monitor import pool_settings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_PATH = os.path.join(BACKEND_DIR, 'database', 'dinewise.sqlite3')
+SCHEMA_PATH = os.path.join(BACKEND_DIR, 'database', 'schema_sqlite.sql')
+
+_SYSDATE = re.compile(r'\bSYSDATE\b', re.IGNORECASE)
+_RETURNING_INTO = re.compile(r'\bRETURNING\s+(\w+)\s+INTO\s+:\w+', re.IGNORECASE)
+_CREATE_TABLE = re.compile(r'^CREATE TABLE (\w+) \(.*?^\);', re.MULTILINE | re.DOTALL)
+_CREATE_INDEX = re.compile(r'^CREATE (?:UNIQUE )?INDEX (\w+) ON .*?;', re.MULTILINE)
+_CREATE_TRIGGER = re.compile(r'^CREATE TRIGGER (\w+) .*?^END;', re.MULTILINE | re.DOTALL)
+_COLUMN = re.compile(r'^    (\w+) (.*?),?$', re.MULTILINE)
+_TABLE_CONSTRAINTS = ('PRIMARY', 'FOREIGN', 'UNIQUE', 'CONSTRAINT', 'CHECK')
+
+
+def _parse_date(value):
+    text = value.decode('utf-8')
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+# DATE columns round-trip as Python datetimes, like they do with oracledb
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(' ', 'seconds'))
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_converter('DATE', _parse_date)
+
+
+@lru_cache(maxsize=512)
+def translate(sql):
+    """Rewrite the few Oracle-only constructs the routes use into SQLite SQL"""
+    return _SYSDATE.sub("datetime('now', 'localtime')", sql)
+
+
+def _to_char(value):
+    return None if value is None else str(value)
+
+
+def _nvl(value, default):
+    return default if value is None else value
+
+
+class SQLiteCursor:
+    """DB-API cursor wrapper that translates Oracle SQL before executing it"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=None):
+        self._cursor.execute(translate(sql), params or {})
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate(sql), seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def arraysize(self):
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value):
+        self._cursor.arraysize = value
+
+    def close(self):
+        self._cursor.close()
+
+
+class PooledConnection:
+    """A pool checkout: close() hands the underlying connection back to the pool"""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def cursor(self):
+        return SQLiteCursor(self._raw.cursor())
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool._release(raw)
+
+
+class PoolTimeout(RuntimeError):
+    """Raised when no pooled connection became free within the wait timeout"""
+
+
+class SQLitePool:
+    """
+    Minimal blocking connection pool with the attributes oracledb pools expose
+    (min, max, opened, busy, reconfigure), so Database treats both backends the
+    same way.
+    """
+
+    def __init__(self, connect, min=1, max=4, wait_timeout_ms=0):
+        self._connect = connect
+        self._idle = []
+        self._cond = threading.Condition()
+        self.min = min
+        self.max = max
+        self.wait_timeout = wait_timeout_ms / 1000 if wait_timeout_ms else None
+        self.opened = 0
+        self.busy = 0
+        for _ in range(min):
+            self._idle.append(self._connect())
+            self.opened += 1
+
+    def acquire(self):
+        deadline = time.monotonic() + self.wait_timeout if self.wait_timeout else None
+        with self._cond:
+            while not self._idle and self.opened >= self.max:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeout("Timed out waiting for a free SQLite connection")
+                self._cond.wait(remaining)
+            if self._idle:
+                raw = self._idle.pop()
+            else:
+                raw = self._connect()
+                self.opened += 1
+            self.busy += 1
+        return PooledConnection(self, raw)
+
+    def reconfigure(self, min=None, max=None, increment=None):
+        with self._cond:
+            if min is not None:
+                self.min = min
+            if max is not None:
+                self.max = max
+                # Drop idle connections beyond the new size
+                while self._idle and self.opened > self.max:
+                    self._idle.pop().close()
+                    self.opened -= 1
+            self._cond.notify_all()
+
+    def _release(self, raw):
+        try:
+            # Match Oracle's pool: uncommitted work does not survive a release
+            raw.rollback()
+        except Exception:
+            pass
+        with self._cond:
+            self.busy -= 1
+            if self.opened > self.max:
+                # Pool was shrunk while this connection was checked out
+                self.opened -= 1
+                raw.close()
+            else:
+                self._idle.append(raw)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            for raw in self._idle:
+                raw.close()
+            self.opened -= len(self._idle)
+            self._idle = []
+
+
+class SQLiteBackend(Backend):
+    """
+    Embedded backend for local runs, load tests and benchmarks.
+    Uses database/schema_sqlite.sql (same tables, constraints, indexes and
+    avg-rating trigger semantics as the Oracle schema) and creates it on
+    first use if the file is empty. Load data with database/seed_sqlite.py.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv('SQLITE_PATH') or DEFAULT_PATH
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            timeout=30
+        )
+        conn.create_function('TO_CHAR', 1, _to_char, deterministic=True)
+        conn.create_function('NVL', 2, _nvl, deterministic=True)
+        conn.execute('PRAGMA foreign_keys = ON')
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        return conn
+
+    def ensure_schema(self, conn):
+        with open(SCHEMA_PATH, encoding='utf-8') as f:
+            schema = f.read()
+        existing = {name.upper() for (name,) in conn.execute("SELECT name FROM sqlite_master")}
+        if 'RESTAURANTS' not in existing:
+            conn.executescript(schema)
+            print(f"✅ Created SQLite schema in {self.path}")
+            return
+        # A file made from an older schema: add the tables, columns and indexes
+        # introduced since (columns before indexes, which may cover them)
+        self._add_objects(conn, _CREATE_TABLE, schema, existing)
+        self._add_columns(conn, schema)
+        self._add_objects(conn, _CREATE_INDEX, schema, existing)
+        self._replace_triggers(conn, schema)
+
+    def _add_objects(self, conn, pattern, schema, existing):
+        """Run the schema file's CREATE statements (matched by `pattern`) for objects not in `existing`"""
+        for match in pattern.finditer(schema):
+            if match.group(1).upper() in existing:
+                continue
+            try:
+                conn.execute(match.group(0))
+                conn.commit()
+                print(f"✅ Added {match.group(1)} to {self.path}")
+            except sqlite3.IntegrityError as e:
+                # e.g. a UNIQUE index over rows that already repeat
+                print(f"⚠️  Could not add {match.group(1)}: {e}")
+
+    def _add_columns(self, conn, schema):
+        """ALTER TABLE ADD COLUMN for columns the schema file has and the tables lack"""
+        for table in _CREATE_TABLE.finditer(schema):
+            present = {row[1].upper() for row in conn.execute(f"PRAGMA table_info({table.group(1)})")}
+            for column, definition in _COLUMN.findall(table.group(0)):
+                if column.upper() in _TABLE_CONSTRAINTS or column.upper() in present:
+                    continue
+                conn.execute(f"ALTER TABLE {table.group(1)} ADD COLUMN {column} {definition}")
+                conn.commit()
+                print(f"✅ Added column {table.group(1)}.{column} to {self.path}")
+
+    def _replace_triggers(self, conn, schema):
+        """(Re)create triggers that are missing or differ from the schema file"""
+        stored = {name.upper(): sql for name, sql in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")}
+        for match in _CREATE_TRIGGER.finditer(schema):
+            name, sql = match.group(1), match.group(0)
+            if stored.get(name.upper()) == sql.rstrip(';'):
+                continue
+            with conn:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute(sql)
+            print(f"✅ Updated trigger {name} in {self.path}")
+
+    def create_pool(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            self.ensure_schema(conn)
+        finally:
+            conn.close()
+        settings = pool_settings()
+        return SQLitePool(
+            self._connect,
+            min=settings['min'],
+            max=settings['max'],
+            wait_timeout_ms=settings['wait_timeout_ms']
+        )
+
+    def is_pool_timeout(self, exc):
+        return isinstance(exc, PoolTimeout)
+
+    def describe(self):
+        return f"SQLite: {self.path}"
+
+    def paginate(self, sql, limit, offset=0):
+        return f"SELECT * FROM ({sql}) LIMIT {int(limit)} OFFSET {int(offset)}"
+
+    def list_agg(self, expr, separator):
+        return f"GROUP_CONCAT({expr}, '{separator}')"
+
+    def text_prefix(self, expr, length):
+        return f"SUBSTR({expr}, 1, {int(length)})"
+
+    def text_length(self, expr):
+        return f"LENGTH({expr})"
+
+    def insert_ignore_sql(self, table, columns, key_index):
+        return f"INSERT OR IGNORE INTO {table} ({', '.join(columns)})"
+
+    def upsert_sql(self, table, id_column, keys, values, bind_name):
+        # RETURNING yields the id of whichever row the upsert wrote
+        columns = ', '.join((id_column, *keys, *values))
+        exprs = ', '.join((f":{id_column}", *(f":{key}" for key in keys), *values.values()))
+        assignments = ', '.join(f"{column} = excluded.{column}" for column in values)
+        return (f"INSERT INTO {table} ({columns}) VALUES ({exprs}) "
+                f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {assignments} "
+                f"RETURNING {id_column} INTO :{bind_name}")
+
+    def row_estimate_sql(self, table):
+        # Largest rowid: one descent to the right edge of the table b-tree.
+        # Exact until rows are deleted, an overestimate after that
+        return f"SELECT MAX(rowid) FROM {table}"
+
+    def execute_returning(self, cursor, sql, params, bind_name):
+        cursor.execute(_RETURNING_INTO.sub(r'RETURNING \1', sql), params)
+        row = cursor.fetchone()
+        return row[0] if row else None
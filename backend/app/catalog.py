@@ -0,0 +1,616 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left, bisect_right, insort
+from app.database import db
+from app.utils import bitmap, facets, pagination, ranking
+from app.utils.loaders import IN_LIST_CHUNK, bind_in_list, load_cuisines
+from app.utils.trie import PrefixTrie, TOP_K
+from app.utils.trigram import TrigramIndex
+
+RESTAURANT_COLUMNS = """
+    r.restaurant_id, r.name, r.address, r.city, r.region,
+    r.phone_number, r.website_url, r.avg_rating, r.price_range,
+    r.dining_type, r.timings, r.votes, r.rating_type, r.created_at
+"""
+
+_EMPTY = frozenset()
+
+
+def _record(row, cuisines):
+    """Restaurant row -> the dict shape /api/restaurants returns"""
+    return {
+        'restaurant_id': row['restaurant_id'],
+        'name': row['name'],
+        'address': row.get('address'),
+        'city': row.get('city'),
+        'region': row.get('region'),
+        'phone_number': row.get('phone_number'),
+        'website_url': row.get('website_url'),
+        'avg_rating': float(row['avg_rating']) if row.get('avg_rating') is not None else 0.0,
+        'price_range': int(row['price_range']) if row.get('price_range') is not None else 0,
+        'dining_type': row.get('dining_type'),
+        'timings': row.get('timings'),
+        'votes': int(row['votes']) if row.get('votes') is not None else 0,
+        'rating_type': row.get('rating_type'),
+        'cuisines': cuisines
+    }
+
+
+def fetch_records(database, restaurant_ids):
+    """{restaurant_id: record} read from the database, one IN-list query per chunk of ids"""
+    ids = list(dict.fromkeys(restaurant_ids))
+    records = {}
+    for start in range(0, len(ids), IN_LIST_CHUNK):
+        placeholders, params = bind_in_list(ids[start:start + IN_LIST_CHUNK], 'rid')
+        rows = database.execute_query(
+            f"SELECT {RESTAURANT_COLUMNS} FROM RESTAURANTS r WHERE r.restaurant_id IN ({placeholders})",
+            params
+        )
+        if rows is None:
+            raise RuntimeError("Failed to load restaurants")
+        for row in rows:
+            records[row['restaurant_id']] = row
+    cuisines = load_cuisines(records)
+    return {rid: _record(row, cuisines.get(rid, [])) for rid, row in records.items()}
+
+
+def rating_key(record):
+    """Position of a record in rating order (avg_rating DESC, votes DESC, restaurant_id)"""
+    return (-record['avg_rating'], -record['votes'], record['restaurant_id'])
+
+
+# Region matches count as partial name matches, so they rank below any
+# name that contains the search term
+REGION_WEIGHT = 0.8
+
+
+# Facets with a bitmap per value
+BITMAP_FACETS = ('city', 'cuisine', 'dining_type', 'price')
+
+# Listing orders kept presorted besides rating order (see pagination.SORT_ORDERS)
+PRESORTED = ('weighted', 'votes', 'price_asc', 'price_desc', 'newest')
+
+
+class Snapshot:
+    """
+    One immutable view of the catalog. Readers grab the current snapshot and
+    never see a half-applied update; writers build a new one and swap it in.
+
+    Restaurants are numbered by their position in rating order, and every
+    city / cuisine / dining type / price value has a bitmap over those
+    positions (app/utils/bitmap.py). Filters are AND/OR of bitmaps, min_rating
+    is a prefix of the order, and walking set bits lowest-first yields the
+    matches already in rating order.
+
+    The other listing orders (PRESORTED) are kept as sorted key lists, patched
+    in place of re-sorting when a restaurant changes. The weighted rating's
+    mean is fixed per full load so one update never reorders the rest.
+    """
+
+    def __init__(self, records, unpriced=_EMPTY, created=None):
+        self.records = records                       # restaurant_id -> record
+        self.unpriced = set(unpriced)                # ids whose price_range is NULL
+        self.created = dict(created or {})           # restaurant_id -> created_at
+        self.mean_rating = ranking.mean_rating(records.values())
+        self.by_cuisine = {}                         # category name -> set of ids
+        self.by_region = {}                          # (city, region) -> set of ids
+        self.names = TrigramIndex()                  # fuzzy text search over names
+        self.regions = TrigramIndex()                # ... and regions
+        for rid, rec in records.items():
+            self._index(rid, rec)
+            self.names.add(rid, rec['name'])
+            self.regions.add(rid, rec['region'])
+        self.order_keys = sorted(rating_key(rec) for rec in records.values())
+        self.order = [key[2] for key in self.order_keys]
+        self.position = {rid: pos for pos, rid in enumerate(self.order)}
+        self.bitmaps = {facet: {} for facet in BITMAP_FACETS}
+        for pos, rid in enumerate(self.order):
+            for facet, values in self._facet_values(rid, records[rid]).items():
+                index = self.bitmaps[facet]
+                for value in values:
+                    index[value] = index.get(value, 0) | (1 << pos)
+        self.prices = sorted(self.bitmaps['price'])
+        self.orders = {sort: sorted(self.sort_key(sort, rid) for rid in records) for sort in PRESORTED}
+
+    def sort_row(self, sort, rid):
+        """A restaurant as listed in `sort` order, with the field its cursor needs (pagination.SORT_FIELDS)"""
+        rec = self.records[rid]
+        if sort == 'weighted':
+            return dict(rec, weighted_rating=ranking.weighted_rating(rec['avg_rating'], rec['votes'], self.mean_rating))
+        if sort == 'newest':
+            # created_at may be NULL (None); it then sorts last, see pagination.OLDEST
+            return dict(rec, created_at=pagination.timestamp_text(self.created.get(rid)))
+        return rec
+
+    def sort_key(self, sort, rid):
+        return pagination.sort_key(sort, self.sort_row(sort, rid))
+
+    def _facet_values(self, rid, rec):
+        return {
+            'city': [rec['city']] if rec['city'] else [],
+            'cuisine': rec['cuisines'],
+            'dining_type': [rec['dining_type']] if rec['dining_type'] else [],
+            'price': [] if rid in self.unpriced else [rec['price_range']],
+        }
+
+    def _index(self, rid, rec):
+        for cuisine in rec['cuisines']:
+            self.by_cuisine.setdefault(cuisine, set()).add(rid)
+        if rec['region']:
+            self.by_region.setdefault((rec['city'], rec['region']), set()).add(rid)
+
+    def _unindex(self, rid, rec):
+        for index, values in ((self.by_cuisine, rec['cuisines']),
+                              (self.by_region, [(rec['city'], rec['region'])] if rec['region'] else [])):
+            for value in values:
+                ids = index.get(value)
+                if ids is not None:
+                    ids.discard(rid)
+                    if not ids:
+                        del index[value]
+
+    def replace(self, rid, record, priced=True, created_at=None):
+        """New snapshot with `rid` replaced by `record` (None removes it)"""
+        new = Snapshot.__new__(Snapshot)
+        new.records = dict(self.records)
+        new.unpriced = set(self.unpriced)
+        new.created = dict(self.created)
+        new.mean_rating = self.mean_rating
+        new.orders = {sort: list(keys) for sort, keys in self.orders.items()}
+        # Copy the indexes one level deep so this snapshot's sets stay untouched
+        new.by_cuisine = {k: set(v) for k, v in self.by_cuisine.items()}
+        new.by_region = {k: set(v) for k, v in self.by_region.items()}
+        new.bitmaps = {facet: dict(index) for facet, index in self.bitmaps.items()}
+        new.order_keys = list(self.order_keys)
+        new.order = list(self.order)
+
+        old = new.records.get(rid)
+        if (old is None or record is None or old['name'] != record['name']
+                or old['region'] != record['region']):
+            new.names = self.names.copy()
+            new.regions = self.regions.copy()
+            new.names.remove(rid)
+            new.regions.remove(rid)
+            if record is not None:
+                new.names.add(rid, record['name'])
+                new.regions.add(rid, record['region'])
+        else:
+            # Rating-only change: the text indexes can be shared
+            new.names = self.names
+            new.regions = self.regions
+
+        if rid in self.records:
+            for sort, keys in new.orders.items():
+                del keys[bisect_left(keys, self.sort_key(sort, rid))]
+        old = new.records.pop(rid, None)
+        if old is not None:
+            new._unindex(rid, old)
+            pos = bisect_left(new.order_keys, rating_key(old))
+            del new.order_keys[pos]
+            del new.order[pos]
+            # Every bitmap loses this position; later restaurants move down one
+            for index in new.bitmaps.values():
+                for value, mask in list(index.items()):
+                    mask = bitmap.delete_bit(mask, pos)
+                    if mask:
+                        index[value] = mask
+                    else:
+                        del index[value]
+            new.unpriced.discard(rid)
+        if record is not None:
+            if not priced:
+                new.unpriced.add(rid)
+            if created_at is not None:
+                new.created[rid] = created_at
+            new.records[rid] = record
+            for sort, keys in new.orders.items():
+                insort(keys, new.sort_key(sort, rid))
+            new._index(rid, record)
+            key = rating_key(record)
+            pos = bisect_left(new.order_keys, key)
+            new.order_keys.insert(pos, key)
+            new.order.insert(pos, rid)
+            values = new._facet_values(rid, record)
+            for facet, index in new.bitmaps.items():
+                mine = values[facet]
+                for value, mask in index.items():
+                    index[value] = bitmap.insert_bit(mask, pos, value in mine)
+                for value in mine:
+                    if value not in index:
+                        index[value] = 1 << pos
+        new.position = {rid: pos for pos, rid in enumerate(new.order)}
+        new.prices = sorted(new.bitmaps['price'])
+        return new
+
+    @property
+    def universe(self):
+        return bitmap.low_mask(len(self.order))
+
+    def text_scores(self, query):
+        """{restaurant_id: relevance} for restaurants whose name or region matches `query`"""
+        scores = self.names.search(query)
+        for rid, score in self.regions.search(query).items():
+            score = min(score, 1.0) * REGION_WEIGHT
+            if score > scores.get(rid, 0.0):
+                scores[rid] = score
+        return scores
+
+    def mask_of(self, ids):
+        position = self.position
+        return bitmap.from_positions(position[rid] for rid in ids if rid in position)
+
+    def rating_mask(self, min_rating):
+        """Restaurants rated >= min_rating: a prefix of the rating order"""
+        return bitmap.low_mask(bisect_right(self.order_keys, (-min_rating, float('inf'))))
+
+    def price_mask(self, max_price):
+        index = self.bitmaps['price']
+        return bitmap.union(index[p] for p in self.prices[:bisect_right(self.prices, max_price)])
+
+    def filter_masks(self, filters):
+        """{facet: bitmap} for each filter given in `filters` (parse_filters() shape)"""
+        masks = {}
+        index = self.bitmaps
+        if filters.get('cities'):
+            masks['city'] = bitmap.union(index['city'].get(c, 0) for c in filters['cities'])
+        if filters.get('cuisines'):
+            cuisine_masks = [index['cuisine'].get(c, 0) for c in filters['cuisines']]
+            if filters.get('cuisine_match') == 'all':
+                masks['cuisine'] = bitmap.intersection(cuisine_masks, self.universe)
+            else:
+                masks['cuisine'] = bitmap.union(cuisine_masks)
+        if filters.get('dining_types'):
+            masks['dining_type'] = bitmap.union(index['dining_type'].get(d, 0) for d in filters['dining_types'])
+        if filters.get('min_rating'):
+            masks['rating'] = self.rating_mask(filters['min_rating'])
+        if filters.get('max_price') is not None:
+            masks['price'] = self.price_mask(filters['max_price'])
+        return masks
+
+
+def _restaurant_suggestion(rec):
+    return (rec['restaurant_id'], rec['name'], rating_key(rec), {
+        'restaurant_id': rec['restaurant_id'],
+        'name': rec['name'],
+        'city': rec['city'],
+        'avg_rating': rec['avg_rating'],
+        'votes': rec['votes']
+    })
+
+
+def _group_suggestion(snap, entry_id, label, ids, payload):
+    # Groups rank by the votes of their restaurants, then by size
+    votes = sum(snap.records[rid]['votes'] for rid in ids)
+    return (entry_id, label, (-votes, -len(ids), entry_id), dict(payload, count=len(ids)))
+
+
+def _cuisine_suggestion(snap, name):
+    ids = snap.by_cuisine.get(name)
+    return _group_suggestion(snap, name, name, ids, {'name': name}) if ids else None
+
+
+def _region_suggestion(snap, key):
+    ids = snap.by_region.get(key)
+    city, region = key
+    if not ids:
+        return None
+    return _group_suggestion(snap, f"{city}/{region}", region, ids, {'name': region, 'city': city})
+
+
+def build_suggestions(snap):
+    """Autocomplete tries over restaurant names, cuisines and regions"""
+    return {
+        'restaurants': PrefixTrie.build(_restaurant_suggestion(rec) for rec in snap.records.values()),
+        'cuisines': PrefixTrie.build(_cuisine_suggestion(snap, name) for name in snap.by_cuisine),
+        'regions': PrefixTrie.build(_region_suggestion(snap, key) for key in snap.by_region),
+    }
+
+
+class Catalog:
+    """
+    In-process snapshot of RESTAURANTS + cuisines for the listing/search
+    endpoints. Filters are answered from inverted indexes (city, cuisine,
+    price) walked in presorted rating order, so a page costs a few set lookups
+    instead of a LIKE scan and joins.
+
+    The snapshot is built at startup, reloaded in full every `refresh_seconds`
+    (to pick up writes made by other processes or outside the API) and
+    patched per restaurant after rating writes via refresh_restaurant().
+    """
+
+    def __init__(self, database, refresh_seconds=300, retry_seconds=30, enabled=True):
+        self.db = database
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self.enabled = enabled
+        self._snapshot = None
+        self._suggestions = None
+        self._loaded_at = 0.0
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+        self._loading = threading.Lock()
+
+    # -- loading -------------------------------------------------------------
+
+    def load(self):
+        """Build a fresh snapshot from the database. Returns False (keeping the old one) on failure."""
+        self._last_attempt = time.monotonic()
+        try:
+            rows = self.db.execute_query(f"SELECT {RESTAURANT_COLUMNS} FROM RESTAURANTS r")
+            links = self.db.execute_query(
+                """SELECT rc.restaurant_id, c.category_name
+                   FROM RESTAURANT_CATEGORIES rc
+                   JOIN CATEGORIES c ON c.category_id = rc.category_id
+                   ORDER BY rc.restaurant_id, c.category_name""",
+                row_format='tuple'
+            )
+            if rows is None or links is None:
+                raise RuntimeError("Catalog queries failed")
+
+            cuisines = {}
+            for link in links:
+                cuisines.setdefault(link.restaurant_id, []).append(link.category_name)
+            records = {}
+            unpriced = set()
+            created = {}
+            for row in rows:
+                rec = _record(row, cuisines.get(row['restaurant_id'], []))
+                records[rec['restaurant_id']] = rec
+                created[rec['restaurant_id']] = row['created_at']
+                if row.get('price_range') is None:
+                    unpriced.add(rec['restaurant_id'])
+
+            snapshot = Snapshot(records, unpriced, created)
+            suggestions = build_suggestions(snapshot)
+            with self._lock:
+                self._snapshot = snapshot
+                self._suggestions = suggestions
+                self._loaded_at = time.monotonic()
+            print(f"✅ Restaurant catalog loaded ({len(records)} restaurants)")
+            return True
+        except Exception as e:
+            print(f"⚠️  Could not load restaurant catalog: {e}", file=sys.stderr)
+            traceback.print_exc()
+            return False
+
+    def snapshot(self):
+        """
+        Current snapshot, reloading it when stale. Returns None when the catalog
+        is disabled or has never loaded, so callers fall back to SQL.
+        """
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        snap = self._snapshot
+        stale = snap is None or now - self._loaded_at > self.refresh_seconds
+        if stale and now - self._last_attempt > self.retry_seconds and self._loading.acquire(blocking=False):
+            # One request reloads; concurrent ones keep serving the old snapshot
+            try:
+                self.load()
+            finally:
+                self._loading.release()
+            snap = self._snapshot
+        return snap
+
+    def refresh_restaurant(self, restaurant_id):
+        """Re-read one restaurant (e.g. after its rating changed) into the snapshot"""
+        if self._snapshot is None:
+            return
+        try:
+            row = self.db.execute_query(
+                f"SELECT {RESTAURANT_COLUMNS} FROM RESTAURANTS r WHERE r.restaurant_id = :restaurant_id",
+                {'restaurant_id': restaurant_id},
+                fetch_one=True
+            )
+            record = None
+            priced = True
+            created_at = None
+            if row:
+                links = self.db.execute_query(
+                    """SELECT c.category_name
+                       FROM RESTAURANT_CATEGORIES rc
+                       JOIN CATEGORIES c ON c.category_id = rc.category_id
+                       WHERE rc.restaurant_id = :restaurant_id
+                       ORDER BY c.category_name""",
+                    {'restaurant_id': restaurant_id},
+                    row_format='tuple'
+                )
+                if links is None:
+                    raise RuntimeError("Cuisine query failed")
+                record = _record(row, [link.category_name for link in links])
+                priced = row.get('price_range') is not None
+                created_at = row['created_at']
+            with self._lock:
+                old = self._snapshot.records.get(restaurant_id)
+                self._snapshot = self._snapshot.replace(restaurant_id, record, priced, created_at)
+                self._update_suggestions(restaurant_id, old, record)
+        except Exception as e:
+            # The periodic reload will pick the change up
+            print(f"⚠️  Could not refresh catalog entry {restaurant_id}: {e}", file=sys.stderr)
+
+    def _update_suggestions(self, restaurant_id, old, record):
+        """Patch the autocomplete entries touched by one restaurant's change"""
+        snap = self._snapshot
+        tries = self._suggestions
+        if record is None:
+            tries['restaurants'].remove(restaurant_id)
+        else:
+            tries['restaurants'].put(*_restaurant_suggestion(record))
+
+        # Cuisine/region ranks depend on their restaurants' votes
+        cuisines = set()
+        regions = set()
+        for rec in (old, record):
+            if rec is not None:
+                cuisines.update(rec['cuisines'])
+                if rec['region']:
+                    regions.add((rec['city'], rec['region']))
+        for name in cuisines:
+            item = _cuisine_suggestion(snap, name)
+            if item:
+                tries['cuisines'].put(*item)
+            else:
+                tries['cuisines'].remove(name)
+        for key in regions:
+            item = _region_suggestion(snap, key)
+            if item:
+                tries['regions'].put(*item)
+            else:
+                tries['regions'].remove(f"{key[0]}/{key[1]}")
+
+    # -- queries ---------------------------------------------------------------
+
+    def select(self, filters, search=None, sort='rating', after=None, offset=0, limit=50):
+        """
+        Restaurants matching `filters` (app/utils/filters.parse_filters() shape).
+        `search` matches names and regions with typo tolerance (see
+        app/utils/trigram.py).
+
+        sort='rating' walks the set bits of the combined filter bitmap, which
+        come out in rating order; the PRESORTED orders walk their key list and
+        keep the restaurants whose bit is set; sort='relevance' ranks search
+        matches by score (then rating) and returns copies of the records
+        carrying a `relevance` field. `after` is a pagination.seek_key() tuple to seek
+        past (keyset pagination), otherwise `offset` rows are skipped.
+        Returns (records, has_more, total) where total is the exact number of
+        matches (a popcount), or None when the catalog is unavailable.
+        Raises ValueError for limit < 1 or offset < 0 (the routes return 400
+        before getting here, for this path and the SQL fallback alike).
+        """
+        if limit < 1 or offset < 0:
+            raise ValueError(f"Invalid page window: limit={limit}, offset={offset}")
+        snap = self.snapshot()
+        if snap is None:
+            return None
+
+        masks = list(snap.filter_masks(filters).values())
+        scores = snap.text_scores(search) if search else None
+        if scores is not None:
+            masks.append(snap.mask_of(scores))
+        mask = bitmap.intersection(masks, snap.universe)
+        total = mask.bit_count()
+
+        records = snap.records
+        order = snap.order
+        if sort == 'relevance' and scores is not None:
+            ranked = sorted(
+                (-round(scores[order[pos]], 4),) + snap.order_keys[pos]
+                for pos in bitmap.iter_bits(mask)
+            )
+            if after:
+                ranked = ranked[bisect_right(ranked, after):]
+            else:
+                ranked = ranked[offset:]
+            page = [dict(records[key[-1]], relevance=-key[0]) for key in ranked[:limit]]
+            return page, len(ranked) > limit, total
+
+        if sort in snap.orders:
+            keys = snap.orders[sort]
+            position = snap.position
+            matched = []
+            skip = offset
+            want = limit + 1
+            for i in range(bisect_right(keys, after) if after else 0, len(keys)):
+                rid = keys[i][-1]
+                if not mask >> position[rid] & 1:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                matched.append(snap.sort_row(sort, rid))
+                if len(matched) == want:
+                    break
+            return matched[:limit], len(matched) > limit, total
+
+        if after:
+            mask = bitmap.drop_below(mask, bisect_right(snap.order_keys, after[-3:]))
+        matched = []
+        skip = offset
+        want = limit + 1
+        for pos in bitmap.iter_bits(mask):
+            if skip:
+                skip -= 1
+                continue
+            matched.append(records[order[pos]])
+            if len(matched) == want:
+                break
+
+        has_more = len(matched) > limit
+        return matched[:limit], has_more, total
+
+    def facets(self, filters, search=None):
+        """
+        Raw facet counts (see app/utils/facets.py) as bitmap popcounts. Each
+        facet's counts apply every filter except its own, so the sidebar shows
+        the alternatives to the current value. None when the catalog is unavailable.
+        """
+        snap = self.snapshot()
+        if snap is None:
+            return None
+        masks = snap.filter_masks(filters)
+        base = snap.mask_of(snap.text_scores(search)) if search else snap.universe
+
+        def without(facet):
+            return bitmap.intersection((m for f, m in masks.items() if f != facet), base)
+
+        counts = facets.empty_counts()
+        counts['total'] = without(None).bit_count()
+        for facet in ('city', 'cuisine', 'dining_type'):
+            scope = without(facet)
+            for value, mask in snap.bitmaps[facet].items():
+                n = (scope & mask).bit_count()
+                if n:
+                    counts[facet][value] = n
+
+        # Band counts are per band (shape() makes them cumulative)
+        scope = without('rating')
+        previous = 0
+        for band in facets.RATING_BANDS:
+            cumulative = (scope & snap.rating_mask(band)).bit_count()
+            counts['rating'][band] = cumulative - previous
+            previous = cumulative
+        scope = without('price')
+        previous = 0
+        for band in sorted(facets.PRICE_BANDS):
+            cumulative = (scope & snap.price_mask(band)).bit_count()
+            counts['price'][band] = cumulative - previous
+            previous = cumulative
+        return counts
+
+    def get_many(self, restaurant_ids):
+        """{restaurant_id: record} for the ids present, or None when the catalog is unavailable"""
+        snap = self.snapshot()
+        if snap is None:
+            return None
+        records = snap.records
+        return {rid: records[rid] for rid in restaurant_ids if rid in records}
+
+    def suggest(self, prefix, limit=TOP_K):
+        """
+        Top `limit` restaurants (by rating), cuisines and regions (by votes)
+        with a word starting with `prefix`, or None when the catalog is unavailable.
+        """
+        if self.snapshot() is None:
+            return None
+        tries = self._suggestions
+        return {kind: trie.suggest(prefix, limit) for kind, trie in tries.items()}
+
+    def stats(self):
+        snap = self._snapshot
+        return {
+            'enabled': self.enabled,
+            'loaded': snap is not None,
+            'restaurants': len(snap.records) if snap else 0,
+            'age_seconds': round(time.monotonic() - self._loaded_at, 1) if snap else None,
+            'refresh_seconds': self.refresh_seconds,
+        }
+
+
+catalog = Catalog(
+    db,
+    refresh_seconds=int(os.getenv('CATALOG_REFRESH_SECONDS', 300)),
+    enabled=os.getenv('CATALOG_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+)
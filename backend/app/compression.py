@@ -0,0 +1,56 @@
+import gzip
+from flask import request
+
+# brotli is optional: without it only gzip is offered
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/html', 'text/plain', 'text/css'}
+
+
+def _encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=config['COMPRESS_GZIP_LEVEL'], mtime=0)
+
+
+def init_app(app):
+    """
+    Compress responses with brotli or gzip, whichever the client's
+    Accept-Encoding prefers (brotli wins ties). Bodies smaller than
+    COMPRESS_MIN_BYTES are sent as-is (the framing would outweigh the gain),
+    and streamed responses are left alone so rows still go out as fetched.
+    """
+    config = {
+        'COMPRESS_MIN_BYTES': app.config.get('COMPRESS_MIN_BYTES', 1024),
+        'COMPRESS_GZIP_LEVEL': app.config.get('COMPRESS_GZIP_LEVEL', 6),
+        'COMPRESS_BROTLI_QUALITY': app.config.get('COMPRESS_BROTLI_QUALITY', 4),
+    }
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    @app.after_request
+    def compress_response(response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or not 200 <= response.status_code < 300 or response.status_code == 204
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(_encodings())
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_BYTES']:
+            return response
+
+        response.set_data(_compress(data, encoding, config))
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -18,4 +18,27 @@ class Config:
     # Database
     ORACLE_USER = os.getenv('ORACLE_USER')
     ORACLE_PASSWORD = os.getenv('ORACLE_PASSWORD')
-    ORACLE_DSN = os.getenv('ORACLE_DSN')
\ No newline at end of file
+    ORACLE_DSN = os.getenv('ORACLE_DSN')
+    
+    # Storage backend: 'oracle' (default) or 'sqlite' for local runs/benchmarks
+    DB_BACKEND = os.getenv('DB_BACKEND', 'oracle')
+    SQLITE_PATH = os.getenv('SQLITE_PATH')
+    
+    # Connection pool: DB_POOL_* are read where the pool is built
+    # (pool_settings() in app/backends/pool_monitor.py)
+    
+    # Query result cache: QUERY_CACHE_* are read by cache_from_env() (app/query_cache.py)
+    
+    # In-memory restaurant catalog: CATALOG_* are read where `catalog` is built (app/catalog.py)
+    
+    # Buffered review helpful votes: COUNTER_* are read where `helpful_ledger` is built (app/counters.py)
+    
+    # Rating aggregate drift check: RATING_RECONCILE_SECONDS is read where
+    # `rating_reconciler` is built (app/aggregates.py)
+    
+    # Responses: orjson serializer when installed, gzip/brotli above a size threshold
+    JSON_FAST = os.getenv('JSON_FAST', 'true').lower() not in ('0', 'false', 'no')
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+    COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
\ No newline at end of file
@@ -0,0 +1,289 @@
+import atexit
+import os
+import sys
+import threading
+import time
+import traceback
+import uuid
+from app.database import db
+from app.utils.bloom import BloomFilter
+
+
+class FlushingBuffer:
+    """
+    Base for write buffers: a daemon thread, started on first use, calls
+    flush() every `flush_seconds` or as soon as wake() is called (a size
+    threshold was hit). Subclasses implement flush().
+    """
+
+    def __init__(self, flush_seconds=2.0, max_pending=500):
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._wake = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def flush(self):
+        raise NotImplementedError
+
+    def wake(self):
+        self._wake.set()
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=f'{type(self).__name__}-flush', daemon=True)
+            self._thread.start()
+        # Clean shutdowns write what is still buffered
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️  {type(self).__name__} flush failed: {e}", file=sys.stderr)
+                traceback.print_exc()
+
+
+class VoteLedger(FlushingBuffer):
+    """
+    Helpful votes: one HELPFUL_VOTES row per (review, user), so each user
+    counts once per review, and REVIEWS.helpful_count kept in step with them.
+
+    add() answers from memory: a Bloom filter over every stored vote says
+    "definitely not voted" for a new vote without touching the database;
+    only a filter hit (a repeat click, or a ~1% false positive) is checked
+    against the table. Accepted votes are buffered and written every
+    `flush_seconds` (or once `max_pending` are waiting): one duplicate-
+    skipping INSERT stamps the rows it actually stores with the flush's id,
+    and one UPDATE adds exactly those rows to helpful_count, in the same
+    transaction. A vote another worker stored first (each worker's filter
+    only knows its own votes) is skipped by the INSERT and never counted.
+    Readers add pending() to the stored count. The filter is sized from the
+    table when first used and rebuilt larger once it fills up; if it can't
+    be loaded every vote falls back to the table.
+    """
+
+    MIN_CAPACITY = 100000
+    RETRY_SECONDS = 30
+
+    # Counts the votes one flush stored (rows skipped as duplicates keep the
+    # flush_id of the flush that stored them)
+    COUNT_SQL = """
+        UPDATE REVIEWS
+        SET helpful_count = helpful_count + (
+            SELECT COUNT(*) FROM HELPFUL_VOTES hv
+            WHERE hv.review_id = REVIEWS.review_id AND hv.flush_id = :flush_id
+        )
+        WHERE review_id IN (SELECT review_id FROM HELPFUL_VOTES WHERE flush_id = :flush_id)"""
+
+    def __init__(self, database, flush_seconds=2.0, max_pending=500, error_rate=0.01, enabled=True):
+        super().__init__(flush_seconds, max_pending)
+        self.db = database
+        self.error_rate = error_rate
+        self.enabled = enabled
+        # Votes whose review or user was deleted since the click are skipped,
+        # so one of them can't fail (and keep re-failing) the whole batch
+        self.insert_sql = database.insert_ignore_sql('HELPFUL_VOTES', ('review_id', 'user_id', 'flush_id'), 'pk_helpful_votes') + """
+            SELECT rv.review_id, u.user_id, :flush_id
+            FROM REVIEWS rv, USERS u
+            WHERE rv.review_id = :review_id AND u.user_id = :user_id"""
+        self._pending = {}                  # (review_id, user_id) -> None, insertion ordered
+        self._inflight = {}
+        self._per_review = {}               # review_id -> pending + inflight votes
+        self._bloom = None
+        self._last_load = None
+        self._lock = threading.Lock()
+        self._loading = threading.Lock()
+        self._flushing = threading.Lock()
+        self._checks = 0
+        self._table_checks = 0
+        self._duplicates = 0
+        self._written = 0
+        self._stored = 0
+        self._failures = 0
+        self._last_flush = None
+
+    @staticmethod
+    def _member(review_id, user_id):
+        return f"{review_id}|{user_id}"
+
+    def _load(self):
+        """Build a filter holding every stored vote. Returns None (and logs) on failure."""
+        self._last_load = time.monotonic()
+        try:
+            row = self.db.execute_query("SELECT COUNT(*) FROM HELPFUL_VOTES", fetch_one=True, row_format='tuple')
+            if row is None:
+                raise RuntimeError("Vote count query failed")
+            bloom = BloomFilter(max(int(row[0]) * 2, self.MIN_CAPACITY), self.error_rate)
+            for vote in self.db.stream_query("SELECT review_id, user_id FROM HELPFUL_VOTES", row_format='tuple'):
+                bloom.add(self._member(vote.review_id, vote.user_id))
+            with self._lock:
+                # Votes accepted while the table was being read
+                for review_id, user_id in list(self._pending) + list(self._inflight):
+                    bloom.add(self._member(review_id, user_id))
+                self._bloom = bloom
+            print(f"✅ Helpful-vote filter loaded ({bloom.count} votes, {bloom.nbytes() // 1024} KiB)")
+            return bloom
+        except Exception as e:
+            print(f"⚠️  Could not load helpful-vote filter: {e}", file=sys.stderr)
+            traceback.print_exc()
+            return None
+
+    def _filter(self):
+        bloom = self._bloom
+        retry = self._last_load is None or time.monotonic() - self._last_load > self.RETRY_SECONDS
+        if bloom is None and retry and self._loading.acquire(blocking=False):
+            try:
+                bloom = self._load()
+            finally:
+                self._loading.release()
+        return bloom
+
+    def _seen(self, vote):
+        return vote in self._pending or vote in self._inflight
+
+    def add(self, user_id, review_id):
+        """
+        Record `user_id`'s vote for `review_id`. False if that user already
+        voted for it; RuntimeError if that could not be checked (or, unbuffered,
+        the vote could not be written).
+        """
+        vote = (review_id, user_id)
+        with self._lock:
+            self._checks += 1
+            if self._seen(vote):
+                self._duplicates += 1
+                return False
+        bloom = self._filter()
+        member = self._member(review_id, user_id)
+        if bloom is None or member in bloom:
+            self._table_checks += 1
+            # A list, not fetch_one: None then means the lookup failed, [] that there is no vote
+            rows = self.db.execute_query(
+                "SELECT 1 FROM HELPFUL_VOTES WHERE review_id = :review_id AND user_id = :user_id",
+                {'review_id': review_id, 'user_id': user_id},
+                row_format='tuple'
+            )
+            if rows is None:
+                raise RuntimeError("Helpful-vote lookup failed")
+            if rows:
+                with self._lock:
+                    self._duplicates += 1
+                return False
+        if not self.enabled:
+            stored = self._write([vote])
+            if stored is None:
+                raise RuntimeError("Helpful-vote write failed")
+            with self._lock:
+                if bloom is not None and self._bloom is bloom:
+                    bloom.add(member)
+                if not stored:
+                    self._duplicates += 1
+            return stored > 0
+        with self._lock:
+            # A concurrent click for the same vote may have got here first
+            if self._seen(vote):
+                self._duplicates += 1
+                return False
+            self._pending[vote] = None
+            self._per_review[review_id] = self._per_review.get(review_id, 0) + 1
+            if self._bloom is not None:
+                self._bloom.add(member)
+            full = len(self._pending) >= self.max_pending
+        self._start()
+        if full:
+            self.wake()
+        return True
+
+    def pending(self, review_id):
+        """Votes for `review_id` accepted here and not yet in helpful_count"""
+        with self._lock:
+            return self._per_review.get(review_id, 0)
+
+    def _write(self, votes):
+        """
+        Insert `votes` (duplicates skipped) and add the rows actually stored
+        to helpful_count, in one transaction. Returns how many were stored,
+        or None if nothing was written.
+        """
+        flush_id = uuid.uuid4().hex
+        # Sorted: concurrent flushers (other workers) take index entries in the same order
+        params = [{'review_id': review_id, 'user_id': user_id, 'flush_id': flush_id}
+                  for review_id, user_id in sorted(votes)]
+        try:
+            with self.db.transaction():
+                result = self.db.execute_many(self.insert_sql, params)
+                if result is not None and result['rowcount']:
+                    self.db.execute_non_query(self.COUNT_SQL, {'flush_id': flush_id})
+        except Exception as e:
+            # Rolled back: none of the votes were stored or counted
+            print(f"⚠️  Helpful-vote write failed: {e}", file=sys.stderr)
+            return None
+        with self._lock:
+            self._written += len(votes)
+            self._stored += result['rowcount']
+            self._last_flush = time.time()
+        return result['rowcount']
+
+    def flush(self):
+        """Write buffered votes and their counts. Returns the number of votes sent."""
+        with self._flushing:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if batch:
+                stored = self._write(batch)
+                with self._lock:
+                    self._inflight = {}
+                    if stored is None:
+                        self._failures += 1
+                        self._pending = {**batch, **self._pending}
+                        return 0
+                    for review_id, _ in batch:
+                        left = self._per_review[review_id] - 1
+                        if left:
+                            self._per_review[review_id] = left
+                        else:
+                            del self._per_review[review_id]
+            bloom = self._bloom
+            if bloom is not None and bloom.saturated:
+                # Grow the filter before its false-positive rate sends most votes to the table
+                with self._loading:
+                    self._load()
+            return len(batch)
+
+    def stats(self):
+        bloom = self._bloom
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'filter_loaded': bloom is not None,
+                'filter_votes': bloom.count if bloom else 0,
+                'filter_capacity': bloom.capacity if bloom else 0,
+                'filter_bytes': bloom.nbytes() if bloom else 0,
+                'pending_votes': len(self._pending),
+                'checks': self._checks,
+                'table_checks': self._table_checks,
+                'duplicates': self._duplicates,
+                'votes_flushed': self._written,
+                'votes_stored': self._stored,
+                'failed_flushes': self._failures,
+                'last_flush': self._last_flush,
+                'flush_seconds': self.flush_seconds,
+                'max_pending': self.max_pending,
+            }
+
+
+helpful_ledger = VoteLedger(
+    db,
+    flush_seconds=float(os.getenv('COUNTER_FLUSH_SECONDS', 2)),
+    max_pending=int(os.getenv('COUNTER_MAX_PENDING', 500)),
+    enabled=os.getenv('COUNTER_BUFFER_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+)
@@ -1,54 +1,48 @@
 import traceback
-import os
-import oracledb
 import sys
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
+from flask import g, has_app_context
+from app.backends import create_backend
+from app.backends.pool_monitor import PoolMonitor, pool_settings
+from app.query_cache import cache_from_env, read_tables, written_tables
 
 load_dotenv()
 
-# Try to initialize thick mode for older Oracle versions
-try:
-    if oracledb.is_thin_mode():
-        try:
-            oracledb.init_oracle_client()
-            print("✅ Initialized Oracle client in thick mode")
-        except Exception as e:
-            error_msg = str(e)
-            if "DPY-3010" in error_msg or "thick mode" in error_msg.lower():
-                print("⚠️  Oracle Instant Client not found or not in PATH")
-                print("   Please install Oracle Instant Client for Oracle XE 11g")
-            else:
-                print(f"⚠️  Could not initialize thick mode: {e}")
-except Exception:
-    pass
+
+@lru_cache(maxsize=256)
+def _row_class(cols):
+    """Named tuple type for a column list, built once per distinct result shape"""
+    return namedtuple('Row', cols, rename=True)
+
 
 class Database:
-    def __init__(self):
-        self.user = os.getenv('ORACLE_USER')
-        self.password = os.getenv('ORACLE_PASSWORD')
-        self.dsn = os.getenv('ORACLE_DSN')
+    def __init__(self, backend=None):
+        # Storage engine is chosen by DB_BACKEND (oracle by default, or sqlite)
+        self.backend = backend or create_backend()
         self.pool = None
+        self.monitor = PoolMonitor(pool_settings())
+        # Opt-in result cache for read queries (execute_query(..., cache_ttl=...))
+        self.cache = cache_from_env()
+        # Connection/transaction state for work done outside a Flask app context
+        self._local = threading.local()
 
     def connect(self):
         if self.pool:
             return True
         try:
-            print(f"Attempting to create DB pool with user={self.user}, dsn={self.dsn}")
-            self.pool = oracledb.create_pool(
-                user=self.user,
-                password=self.password,
-                dsn=self.dsn,
-                min=1,
-                max=4,
-                increment=1,
-                getmode=oracledb.SPOOL_ATTRVAL_WAIT
-            )
-            print("✅ Database pool created successfully.")
+            self.pool = self.backend.create_pool()
+            print(f"✅ Database pool created successfully ({self.backend.name}).")
             return True
         except Exception as err:
             print("❌ Database connection error:", repr(err))
             traceback.print_exc()
-            print("Ensure ORACLE_USER/ORACLE_PASSWORD/ORACLE_DSN are correct and DB listener is running.")
+            if self.backend.name == 'oracle':
+                print("Ensure ORACLE_USER/ORACLE_PASSWORD/ORACLE_DSN are correct and DB listener is running.")
             self.pool = None
             return False
 
@@ -67,43 +61,192 @@ class Database:
                 raise RuntimeError(
                     "Database pool not initialized. "
                     "Please check your .env file and ensure the database is running. "
-                    f"User: {self.user}, DSN: {self.dsn}"
+                    f"{self.backend.describe()}"
                 )
-        return self.pool.acquire()
+        pool = self.pool
+        self.monitor.begin_wait()
+        start = time.perf_counter()
+        try:
+            conn = pool.acquire()
+        except Exception as e:
+            self.monitor.record_failure(pool, timeout=self.backend.is_pool_timeout(e))
+            raise
+        self.monitor.record_acquire(time.perf_counter() - start, pool)
+        return conn
+
+    def pool_stats(self):
+        """Acquire-wait metrics plus current open/busy counts for /api/metrics/pool"""
+        return self.monitor.snapshot(self.pool)
     
-    def _dict_from_cursor(self, cursor):
-        """Convert cursor.description + rows -> list[dict]"""
-        cols = []
-        if cursor.description:
-            cols = [d[0].lower() for d in cursor.description]
-        rows = cursor.fetchall()
-        if not cols:
+    def _scope(self):
+        """Where the bound connection lives: Flask's `g` per request, else per thread"""
+        return g if has_app_context() else self._local
+
+    def _acquire(self):
+        """
+        Return (connection, scoped). Inside a request the first call binds a pool
+        connection to `g` and every later statement reuses it; outside a request a
+        connection is only bound while a transaction() block is open.
+        """
+        scope = self._scope()
+        conn = getattr(scope, 'db_conn', None)
+        if conn is not None:
+            return conn, True
+        conn = self.get_connection()
+        if scope is g:
+            g.db_conn = conn
+            return conn, True
+        return conn, False
+
+    def _in_transaction(self):
+        return getattr(self._scope(), 'db_tx_depth', 0) > 0
+
+    def _mark_failed(self):
+        if self._in_transaction():
+            self._scope().db_tx_failed = True
+
+    def _invalidate_for(self, sql):
+        """Drop cached results for the tables `sql` writes, once the write is committed"""
+        tables = written_tables(sql)
+        if not tables:
+            return
+        if self._in_transaction():
+            self._scope().db_tx_tables.update(tables)
+        else:
+            self.cache.invalidate(tables)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: statements inside the block share one connection and are
+        committed once on exit. If any statement in the block failed, everything
+        is rolled back and RuntimeError is raised. Nested blocks join the outermost one.
+        """
+        scope = self._scope()
+        depth = getattr(scope, 'db_tx_depth', 0)
+        if depth == 0:
+            if getattr(scope, 'db_conn', None) is None:
+                scope.db_conn = self.get_connection()
+            scope.db_tx_failed = False
+            scope.db_tx_tables = set()
+        scope.db_tx_depth = depth + 1
+        try:
+            yield
+        except Exception:
+            scope.db_tx_failed = True
+            raise
+        finally:
+            scope.db_tx_depth = depth
+            if depth == 0:
+                conn = scope.db_conn
+                failed = scope.db_tx_failed
+                try:
+                    if failed:
+                        conn.rollback()
+                    else:
+                        conn.commit()
+                        self.cache.invalidate(scope.db_tx_tables)
+                finally:
+                    scope.db_tx_tables = set()
+                    if scope is not g:
+                        scope.db_conn = None
+                        self._close_quietly(conn)
+        if depth == 0 and failed:
+            # A statement inside the block failed (and was swallowed by execute_*)
+            raise RuntimeError("Transaction rolled back: a statement in the unit of work failed")
+
+    def release_request_connection(self, exc=None):
+        """Return the request-bound connection to the pool (teardown_appcontext hook)"""
+        conn = g.pop('db_conn', None)
+        if conn is None:
+            return
+        try:
+            # Anything still uncommitted here was never meant to be kept
+            conn.rollback()
+        except Exception:
+            pass
+        self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(resource):
+        if resource is None:
+            return
+        try:
+            resource.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _read_lob(value):
+        if hasattr(value, 'read'):
+            try:
+                return value.read()
+            except Exception:
+                return str(value)
+        return value
+
+    def _shape_rows(self, cursor, rows, row_format='dict'):
+        """
+        Shape fetched rows according to row_format:
+          'dict'    -> list[dict]            (column names lowercased)
+          'tuple'   -> list[namedtuple]      (attribute access, no per-row dict)
+          'columns' -> dict[col, list]       (one list per column)
+        Only LOB columns (known from cursor.description) are read/converted.
+        """
+        if not cursor.description:
             return rows
-        result = []
-        for row in rows:
-            row_dict = {}
-            for i, col in enumerate(cols):
-                value = row[i]
-                # Handle CLOB types
-                if hasattr(value, 'read'):
-                    try:
-                        value = value.read()
-                    except:
-                        value = str(value)
-                row_dict[col] = value
-            result.append(row_dict)
-        return result
+        cols = tuple(d[0].lower() for d in cursor.description)
+        lob_types = self.backend.lob_types
+        lob_idx = [i for i, d in enumerate(cursor.description) if d[1] in lob_types]
+        if lob_idx:
+            read_lob = self._read_lob
+            converted = []
+            for row in rows:
+                row = list(row)
+                for i in lob_idx:
+                    row[i] = read_lob(row[i])
+                converted.append(row)
+            rows = converted
+
+        if row_format == 'tuple':
+            make = _row_class(cols)._make
+            return [make(row) for row in rows]
+        if row_format == 'columns':
+            if not rows:
+                return {col: [] for col in cols}
+            return {col: list(values) for col, values in zip(cols, zip(*rows))}
+        return [dict(zip(cols, row)) for row in rows]
 
-    def execute_query(self, sql, params=None, fetch_one=False):
+    def execute_query(self, sql, params=None, fetch_one=False, row_format='dict', cache_ttl=None):
         """
         Run a SELECT or other query that returns rows.
         Returns: list of dicts (column names lowercased) or empty list.
         If fetch_one=True, returns single dict or None.
+        row_format='tuple' returns named tuples instead of dicts and
+        row_format='columns' returns {column: [values...]} (fetch_one is ignored).
+        cache_ttl=<seconds> serves the result from the query cache when possible;
+        cached results are shared, so callers must not modify them.
         """
+        if not cache_ttl or not self.cache.enabled or self._in_transaction():
+            return self._run_query(sql, params, fetch_one, row_format)
+        
+        key = self.cache.make_key(sql, params, fetch_one, row_format)
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+        tags = read_tables(sql)
+        generation = self.cache.generation(tags)
+        result = self._run_query(sql, params, fetch_one, row_format)
+        if result is not None:
+            self.cache.put(key, result, cache_ttl, tags, generation)
+        return result
+
+    def _run_query(self, sql, params, fetch_one, row_format):
         conn = None
+        scoped = False
         cursor = None
         try:
-            conn = self.get_connection()
+            conn, scoped = self._acquire()
             cursor = conn.cursor()
             
             if params:
@@ -111,73 +254,164 @@ class Database:
             else:
                 cursor.execute(sql)
             
-            data = self._dict_from_cursor(cursor)
-            cursor.close()
-            conn.close()
+            if fetch_one and row_format != 'columns':
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                return self._shape_rows(cursor, [row], row_format)[0]
             
-            if fetch_one:
-                return data[0] if data else None
-            return data
+            return self._shape_rows(cursor, cursor.fetchall(), row_format)
         except Exception as e:
             print(f"DB execute_query error: {repr(e)}", file=sys.stderr)
             traceback.print_exc()
-            if cursor:
-                try:
-                    cursor.close()
-                except Exception:
-                    pass
-            if conn:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+            self._mark_failed()
             return None
+        finally:
+            self._close_quietly(cursor)
+            if not scoped:
+                self._close_quietly(conn)
+
+    def paginate(self, sql, limit, offset=0):
+        """Backend-specific wrapper returning `limit` rows of an ordered query after `offset`"""
+        return self.backend.paginate(sql, limit, offset)
+
+    def list_agg(self, expr, separator=','):
+        """Backend-specific string aggregate of `expr` (LISTAGG / GROUP_CONCAT)"""
+        return self.backend.list_agg(expr, separator)
+
+    def text_prefix(self, expr, length):
+        """Backend-specific first `length` characters of a CLOB (DBMS_LOB.SUBSTR / SUBSTR)"""
+        return self.backend.text_prefix(expr, length)
+
+    def text_length(self, expr):
+        """Backend-specific length of a CLOB (DBMS_LOB.GETLENGTH / LENGTH)"""
+        return self.backend.text_length(expr)
+
+    def insert_ignore_sql(self, table, columns, key_index):
+        """Backend-specific INSERT head that skips duplicate keys (IGNORE_ROW_ON_DUPKEY_INDEX / INSERT OR IGNORE)"""
+        return self.backend.insert_ignore_sql(table, columns, key_index)
+
+    def upsert_sql(self, table, id_column, keys, values, bind_name='upsert_id'):
+        """Backend-specific single-statement insert-or-update returning the row id (MERGE / ON CONFLICT)"""
+        return self.backend.upsert_sql(table, id_column, keys, values, bind_name)
+
+    def estimate_rows(self, table, cache_ttl=60):
+        """Approximate row count of `table` from backend statistics, or None if unavailable"""
+        row = self.execute_query(
+            self.backend.row_estimate_sql(table), fetch_one=True, row_format='tuple', cache_ttl=cache_ttl
+        )
+        if not row or row[0] is None:
+            return None
+        return int(row[0])
+
+    def stream_query(self, sql, params=None, row_format='dict', arraysize=500):
+        """
+        Generator version of execute_query for large/unbounded results.
+        Fetches `arraysize` rows per round trip and yields shaped rows one at a
+        time, so memory is bounded by one batch rather than the whole result.
+        Uses its own pool connection (acquired on first iteration, released when
+        the generator is exhausted or closed). Errors are raised, not swallowed.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.arraysize = arraysize
+            
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            
+            while True:
+                rows = cursor.fetchmany(arraysize)
+                if not rows:
+                    break
+                yield from self._shape_rows(cursor, rows, row_format)
+        except Exception as e:
+            print(f"DB stream_query error: {repr(e)}", file=sys.stderr)
+            traceback.print_exc()
+            raise
+        finally:
+            self._close_quietly(cursor)
+            self._close_quietly(conn)
 
     def execute_non_query(self, sql, params=None, returning=False):
         """
         Run INSERT/UPDATE/DELETE.
+        Commits immediately unless called inside a transaction() block.
         Returns: dict with keys: rowcount, returning (if any)
         """
         conn = None
+        scoped = False
         cursor = None
         try:
-            conn = self.get_connection()
+            conn, scoped = self._acquire()
             cursor = conn.cursor()
             
             if returning and isinstance(returning, tuple) and len(returning) == 2:
                 return_col, bind_name = returning
-                out_var = cursor.var(oracledb.DB_TYPE_VARCHAR)
-                bind_params = params or {}
-                bind_params[bind_name] = out_var
-                cursor.execute(sql, bind_params)
-                conn.commit()
-                val = out_var.getvalue()
-                cursor.close()
-                conn.close()
-                return {'rowcount': cursor.rowcount, 'returning': val}
+                value = self.backend.execute_returning(cursor, sql, params, bind_name)
+                rowcount = cursor.rowcount
+                if not self._in_transaction():
+                    conn.commit()
+                self._invalidate_for(sql)
+                return {'rowcount': rowcount, 'returning': value}
             else:
                 if params:
                     cursor.execute(sql, params)
                 else:
                     cursor.execute(sql)
-                conn.commit()
-                rc = cursor.rowcount
-                cursor.close()
-                conn.close()
-                return {'rowcount': rc}
+                if not self._in_transaction():
+                    conn.commit()
+                self._invalidate_for(sql)
+                return {'rowcount': cursor.rowcount}
         except Exception as e:
             print(f"DB execute_non_query error: {repr(e)}", file=sys.stderr)
             traceback.print_exc()
-            if cursor:
+            self._mark_failed()
+            if conn is not None and not self._in_transaction():
                 try:
-                    cursor.close()
+                    conn.rollback()
                 except Exception:
                     pass
-            if conn:
+            return None
+        finally:
+            self._close_quietly(cursor)
+            if not scoped:
+                self._close_quietly(conn)
+
+    def execute_many(self, sql, seq_of_params):
+        """
+        Run one DML statement for every param set in a single array-bound
+        round trip (cursor.executemany). Commits like execute_non_query.
+        Returns: dict with key rowcount (total over all sets), or None on error.
+        """
+        conn = None
+        scoped = False
+        cursor = None
+        try:
+            conn, scoped = self._acquire()
+            cursor = conn.cursor()
+            cursor.executemany(sql, seq_of_params)
+            if not self._in_transaction():
+                conn.commit()
+            self._invalidate_for(sql)
+            return {'rowcount': cursor.rowcount}
+        except Exception as e:
+            print(f"DB execute_many error: {repr(e)}", file=sys.stderr)
+            traceback.print_exc()
+            self._mark_failed()
+            if conn is not None and not self._in_transaction():
                 try:
-                    conn.close()
+                    conn.rollback()
                 except Exception:
                     pass
             return None
+        finally:
+            self._close_quietly(cursor)
+            if not scoped:
+                self._close_quietly(conn)
 
 db = Database()
\ No newline at end of file
@@ -0,0 +1,45 @@
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional: without it the app keeps Flask's stdlib json provider
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson (serializes straight to UTF-8 bytes,
+    several times faster than the stdlib encoder on listing pages).
+
+    Output matches the default provider apart from whitespace and non-ASCII
+    text being sent as UTF-8 instead of \\u escapes: keys stay sorted, and
+    dates and other non-native values still go through Flask's default().
+    """
+
+    def _options(self, indent=False):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_app(app):
+    """Use orjson for jsonify()/request.get_json() when installed and JSON_FAST is on"""
+    if orjson is not None and app.config.get('JSON_FAST', True):
+        app.json = ORJSONProvider(app)
+        print("✅ Using orjson for JSON responses")
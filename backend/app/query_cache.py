@@ -0,0 +1,174 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+([A-Za-z_][\w$#]*)', re.IGNORECASE)
+_WRITE_TABLE = re.compile(
+    r'^\s*(?:BEGIN\s+)?(?:INSERT\s+(?:OR\s+\w+\s+)?(?:/\*.*?\*/\s*)?INTO|UPDATE|DELETE\s+FROM|DELETE|MERGE\s+INTO)\s+([A-Za-z_][\w$#]*)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Writes to a table also change these tables (through triggers)
+WRITE_IMPLIES = {
+    'RATINGS': {'RESTAURANTS', 'RATING_HISTOGRAM'},
+}
+
+
+def read_tables(sql):
+    """Tables a SELECT reads from, upper-cased (used as cache tags)"""
+    return frozenset(t.upper() for t in _READ_TABLES.findall(sql)) - {'DUAL'}
+
+
+def written_tables(sql):
+    """Tables a DML statement changes, including trigger side effects"""
+    match = _WRITE_TABLE.match(sql)
+    if not match:
+        return set()
+    table = match.group(1).upper()
+    return {table} | WRITE_IMPLIES.get(table, set())
+
+
+def _estimate_size(value, depth=0):
+    """Rough deep size in bytes of a query result (lists/dicts/tuples of scalars)"""
+    size = sys.getsizeof(value)
+    if depth > 3:
+        return size
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k, depth + 1) + _estimate_size(v, depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(v, depth + 1) for v in value)
+    return size
+
+
+class QueryCache:
+    """
+    Result cache for read queries, keyed by SQL + bind parameters.
+
+    Entries expire after their TTL and the least recently used ones are evicted
+    once either max_entries or max_bytes is exceeded. Each entry is tagged with
+    the tables its SQL reads; a committed write to any of those tables drops
+    the entry. Per-table generation counters stop a query that was already
+    running when a write committed from storing its (now stale) result.
+
+    Cached results are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=512, max_bytes=8 * 1024 * 1024, enabled=True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (value, expires_at, size, tags)
+        self._by_tag = {}               # table -> set of keys
+        self._generations = {}          # table -> write generation
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(sql, params, *extra):
+        items = tuple(sorted((params or {}).items()))
+        try:
+            hash(items)
+        except TypeError:
+            items = repr(items)
+        return (sql, items) + extra
+
+    def generation(self, tags):
+        with self._lock:
+            return tuple(self._generations.get(t, 0) for t in sorted(tags))
+
+    def get(self, key):
+        """Return (hit, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, expires_at, _, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key, value, ttl, tags, generation):
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # A write to one of these tables committed while the query ran
+            if tuple(self._generations.get(t, 0) for t in sorted(tags)) != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, size, tags)
+            self.bytes += size
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tables):
+        """Drop every entry that reads any of `tables` (call after the write commits)"""
+        if not tables:
+            return
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_tag.get(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self.bytes = 0
+
+    def _remove(self, key):
+        value, _, size, tags = self._entries.pop(key)
+        self.bytes -= size
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+def cache_from_env():
+    return QueryCache(
+        max_entries=int(os.getenv('QUERY_CACHE_MAX_ENTRIES', 512)),
+        max_bytes=int(os.getenv('QUERY_CACHE_MAX_BYTES', 8 * 1024 * 1024)),
+        enabled=os.getenv('QUERY_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+    )
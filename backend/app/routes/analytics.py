@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify
 from app.database import db
+from app.utils.loaders import attach_cuisines
 
 bp = Blueprint('analytics', __name__)
 
@@ -7,17 +8,16 @@ bp = Blueprint('analytics', __name__)
 def top_rated():
     """Get top rated restaurants"""
     try:
-        # Use ROWNUM for Oracle 11g compatibility
-        query = """
-            SELECT * FROM (
-                SELECT restaurant_id, name, city, avg_rating, votes
-                FROM RESTAURANTS
-                WHERE votes >= 4
-                ORDER BY avg_rating DESC, votes DESC
-            ) WHERE ROWNUM <= 10
-        """
+        # Backend-specific top-N (ROWNUM on Oracle 11g)
+        query = db.paginate("""
+            SELECT restaurant_id, name, city, avg_rating, votes
+            FROM RESTAURANTS
+            WHERE votes >= 4
+            ORDER BY avg_rating DESC, votes DESC
+        """, 10)
         
-        restaurants = db.execute_query(query)
+        # Cached until a rating/restaurant write invalidates it
+        restaurants = db.execute_query(query, cache_ttl=300)
         
         if restaurants is None:
             print("ERROR: top_rated query returned None")
@@ -45,6 +45,12 @@ def top_rated():
             'votes': int(r['votes']) if r.get('votes') else 0
         })
     
+    try:
+        attach_cuisines(result)
+    except Exception as e:
+        print(f"ERROR loading cuisines for top_rated: {e}")
+        return jsonify({'error': 'Database query failed'}), 500
+    
     return jsonify(result), 200
 
 @bp.route('/city-stats', methods=['GET'])
@@ -60,7 +66,7 @@ def city_stats():
         ORDER BY city
     """
     
-    stats = db.execute_query(query)
+    stats = db.execute_query(query, row_format='tuple', cache_ttl=300)
     
     if stats is None:
         return jsonify({'error': 'Database query failed'}), 500
@@ -68,10 +74,10 @@ def city_stats():
     result = []
     for s in stats:
         result.append({
-            'city': s['city'],
-            'total_restaurants': int(s['total_restaurants']) if s.get('total_restaurants') else 0,
-            'avg_rating': float(s['avg_city_rating']) if s.get('avg_city_rating') else 0,
-            'total_votes': int(s['total_votes']) if s.get('total_votes') else 0
+            'city': s.city,
+            'total_restaurants': int(s.total_restaurants) if s.total_restaurants else 0,
+            'avg_rating': float(s.avg_city_rating) if s.avg_city_rating else 0,
+            'total_votes': int(s.total_votes) if s.total_votes else 0
         })
     
     return jsonify(result), 200
\ No newline at end of file
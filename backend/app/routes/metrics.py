@@ -0,0 +1,57 @@
+from flask import Blueprint, jsonify
+from app.aggregates import rating_reconciler
+from app.catalog import catalog
+from app.counters import helpful_ledger
+from app.database import db
+
+bp = Blueprint('metrics', __name__)
+
+@bp.route('/pool', methods=['GET'])
+def pool_metrics():
+    """Connection pool sizing, acquire wait times and timeouts"""
+    try:
+        return jsonify({
+            'backend': db.backend.name,
+            **db.pool_stats()
+        }), 200
+    except Exception as e:
+        print(f"Error in pool_metrics: {e}")
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+@bp.route('/cache', methods=['GET'])
+def cache_metrics():
+    """Query result cache size, hit/miss counters and invalidations"""
+    try:
+        return jsonify(db.cache.stats()), 200
+    except Exception as e:
+        print(f"Error in cache_metrics: {e}")
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+@bp.route('/catalog', methods=['GET'])
+def catalog_metrics():
+    """In-memory restaurant catalog size and age"""
+    try:
+        return jsonify(catalog.stats()), 200
+    except Exception as e:
+        print(f"Error in catalog_metrics: {e}")
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+@bp.route('/counters', methods=['GET'])
+def counter_metrics():
+    """Buffered helpful votes: the vote filter, pending votes and flushes"""
+    try:
+        return jsonify({
+            'helpful_votes': helpful_ledger.stats()
+        }), 200
+    except Exception as e:
+        print(f"Error in counter_metrics: {e}")
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+@bp.route('/aggregates', methods=['GET'])
+def aggregate_metrics():
+    """Rating aggregate reconciliation: runs, repaired restaurants and the last drift found"""
+    try:
+        return jsonify(rating_reconciler.stats()), 200
+    except Exception as e:
+        print(f"Error in aggregate_metrics: {e}")
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.database import db
 from app.utils.auth_helpers import token_required
+from app.utils.streaming import stream_sections
 import traceback
 import json
 
@@ -135,8 +136,9 @@ def update_profile():
 def get_activity():
     """Get user's recent activity"""
     try:
-        # Get recent ratings
-        ratings = db.execute_query(
+        # Both histories are streamed one after the other in fetch batches,
+        # so memory stays bounded regardless of how active the user is
+        ratings = db.stream_query(
             """SELECT rat.rating_id, rat.restaurant_id, r.name, rat.rating_value, rat.rating_date
                FROM RATINGS rat
                JOIN RESTAURANTS r ON rat.restaurant_id = r.restaurant_id
@@ -145,8 +147,7 @@ def get_activity():
             {'user_id': request.user_id}
         )
         
-        # Get recent reviews
-        reviews = db.execute_query(
+        reviews = db.stream_query(
             """SELECT rev.review_id, rev.restaurant_id, r.name, 
                       TO_CHAR(rev.review_text) as review_text, rev.review_date
                FROM REVIEWS rev
@@ -156,28 +157,28 @@ def get_activity():
             {'user_id': request.user_id}
         )
         
-        return jsonify({
-            'ratings': [
-                {
-                    'rating_id': r['rating_id'],
-                    'restaurant_id': r['restaurant_id'],
-                    'restaurant_name': r['name'],
-                    'rating_value': float(r['rating_value']),
-                    'rating_date': r['rating_date'].strftime('%Y-%m-%d') if r.get('rating_date') else None
-                }
-                for r in (ratings or [])
-            ],
-            'reviews': [
-                {
-                    'review_id': r['review_id'],
-                    'restaurant_id': r['restaurant_id'],
-                    'restaurant_name': r['name'],
-                    'review_text': r['review_text'],
-                    'review_date': r['review_date'].strftime('%Y-%m-%d') if r.get('review_date') else None
-                }
-                for r in (reviews or [])
-            ]
-        }), 200
+        def serialize_rating(r):
+            return {
+                'rating_id': r['rating_id'],
+                'restaurant_id': r['restaurant_id'],
+                'restaurant_name': r['name'],
+                'rating_value': float(r['rating_value']),
+                'rating_date': r['rating_date'].strftime('%Y-%m-%d') if r.get('rating_date') else None
+            }
+        
+        def serialize_review(r):
+            return {
+                'review_id': r['review_id'],
+                'restaurant_id': r['restaurant_id'],
+                'restaurant_name': r['name'],
+                'review_text': r['review_text'],
+                'review_date': r['review_date'].strftime('%Y-%m-%d') if r.get('review_date') else None
+            }
+        
+        return stream_sections([
+            ('ratings', ratings, serialize_rating),
+            ('reviews', reviews, serialize_review)
+        ])
         
     except Exception as e:
         print(f"ERROR in get_activity: {e}")
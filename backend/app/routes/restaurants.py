@@ -1,70 +1,104 @@
 from flask import Blueprint, request, jsonify
+from app.catalog import catalog, fetch_records
 from app.database import db
+from app.utils import details, facets, fields
+from app.utils.filters import list_arg, parse_filters, sql_predicates
+from app.utils.trie import TOP_K
+from app.utils.loaders import attach_cuisines, load_cuisines
+from app.utils.pagination import (
+    FIELD_TYPES, OLDEST, RATING_ORDER_BY, SORT_FIELDS, SORT_ORDERS, order_by, page_cursor, review_cursor,
+    seek_key, seek_params, seek_predicate
+)
+from app.utils.ranking import WEIGHTED_RATING_SQL, weighting_params
+
+# relevance needs a text query; without one (and in SQL) it falls back to rating order
+SORTS = tuple(SORT_ORDERS) + ('relevance',)
+
+# Most ids one /batch request may ask for
+MAX_BATCH_IDS = 500
+
+# Largest page a listing or search request may ask for
+MAX_PAGE_LIMIT = 100
 
 bp = Blueprint('restaurants', __name__)
 
 @bp.route('/', methods=['GET'])
 @bp.route('', methods=['GET'])  # Handle both with and without trailing slash
 def get_restaurants():
-    """Get all restaurants with filters"""
+    """
+    Get all restaurants with filters.
+    fields=name,city,... returns only those restaurant fields (see
+    app/utils/fields.py), and the SQL path selects only their columns.
+    """
     try:
-        city = request.args.get('city')
-        cuisine = request.args.get('cuisine')
-        min_rating = float(request.args.get('min_rating', 0) or 0)
+        try:
+            filters = parse_filters(request.args)
+            wanted = fields.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         search = request.args.get('search', '')
-        limit = int(request.args.get('limit', 50) or 50)
-        offset = int(request.args.get('offset', 0) or 0)
-        
-        # Build dynamic query - use subquery to avoid DISTINCT issues with JOINs
-        base_query = """
-            SELECT r.restaurant_id, r.name, r.address, r.city, r.region,
-                   r.phone_number, r.website_url, r.avg_rating, r.price_range,
-                   r.dining_type, r.timings, r.votes, r.rating_type
-            FROM RESTAURANTS r
-            WHERE r.avg_rating >= :min_rating
-        """
+        approximate = request.args.get('approximate', '').lower() == 'true'
+        try:
+            limit, offset = _page_window(request.args, default_limit=50)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        cursor = request.args.get('cursor')
+        sort = request.args.get('sort', 'rating')
         
-        params = {'min_rating': min_rating}
+        if sort not in SORTS:
+            return jsonify({'error': f"sort must be one of: {', '.join(SORTS)}"}), 400
         
-        if city:
-            base_query += " AND r.city = :city"
-            params['city'] = city
+        after = None
+        if cursor:
+            try:
+                after = seek_key(cursor, sort)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        # Answered from the in-memory catalog when it is loaded, SQL otherwise
+        page = catalog.select(
+            filters, search=search, sort=sort,
+            after=after, offset=0 if cursor else offset, limit=limit
+        )
+        if page is not None:
+            result, has_more, total = page
+            return jsonify(_listing_page(result, has_more, offset, limit, total, sort, wanted=wanted)), 200
+        
+        # SQL fallback: exact substring match, no relevance ranking
+        if sort == 'relevance':
+            sort = 'rating'
+        if cursor:
+            try:
+                seek = seek_params(cursor, sort)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
         
+        # Filters are EXISTS/IN predicates on RESTAURANTS alone, so no DISTINCT
+        predicates, params = sql_predicates(filters)
         if search:
-            base_query += " AND LOWER(r.name) LIKE LOWER(:search)"
+            predicates['search'] = "LOWER(r.name) LIKE LOWER(:search)"
             params['search'] = f'%{search}%'
-        
-        # If cuisine filter, need to join with categories
-        if cuisine:
-            base_query = """
-                SELECT DISTINCT r.restaurant_id, r.name, r.address, r.city, r.region,
-                       r.phone_number, r.website_url, r.avg_rating, r.price_range,
-                       r.dining_type, r.timings, r.votes, r.rating_type
-                FROM RESTAURANTS r
-                INNER JOIN RESTAURANT_CATEGORIES rc ON r.restaurant_id = rc.restaurant_id
-                INNER JOIN CATEGORIES c ON rc.category_id = c.category_id
-                WHERE r.avg_rating >= :min_rating
-                AND c.category_name = :cuisine
-            """
-            if city:
-                base_query += " AND r.city = :city"
-            if search:
-                base_query += " AND LOWER(r.name) LIKE LOWER(:search)"
-        
-        # Use ROWNUM for Oracle 11g compatibility (instead of OFFSET/FETCH)
-        # Wrap base_query in subquery for proper ROWNUM pagination
-        query = f"""
-            SELECT restaurant_id, name, address, city, region,
-                   phone_number, website_url, avg_rating, price_range,
-                   dining_type, timings, votes, rating_type
-            FROM (
-                SELECT inner.*, ROWNUM rnum FROM (
-                    {base_query}
-                    ORDER BY avg_rating DESC, votes DESC
-                ) inner WHERE ROWNUM <= {offset + limit}
-            ) outer WHERE rnum > {offset}
+        counted = _sql_total(predicates, params, approximate)
+        if counted is None:
+            return jsonify({'error': 'Database query failed', 'message': 'Unable to count restaurants'}), 500
+        total, estimated = counted
+        # The requested fields plus whatever the next cursor is built from
+        columns = fields.with_cursor_fields(wanted, sort)
+        base_query = f"""
+            SELECT {fields.select_list(columns)}{_sort_columns(sort, params)}
+            FROM RESTAURANTS r
+            WHERE {' AND '.join(predicates.values())}
         """
         
+        # Keyset mode: seek past the cursor row instead of counting off `offset` rows
+        if cursor:
+            base_query += seek_predicate(sort)
+            params.update(seek)
+        
+        # One extra row tells whether another page exists.
+        # Pagination syntax is backend-specific (ROWNUM on Oracle 11g)
+        query = db.paginate(f"{base_query} {order_by(sort)}", limit + 1, 0 if cursor else offset)
+        
         try:
             restaurants = db.execute_query(query, params)
         except Exception as query_error:
@@ -86,80 +120,157 @@ def get_restaurants():
             print(f"ERROR: Expected list, got {type(restaurants)}")
             return jsonify({'error': 'Database query failed', 'message': 'Invalid data format from database'}), 500
         
+        has_more = len(restaurants) > limit
+        restaurants = restaurants[:limit]
+        
+        try:
+            # One batched lookup for the whole page instead of one query per row
+            cuisines = load_cuisines(r['restaurant_id'] for r in restaurants) if 'cuisines' in wanted else {}
+        except Exception as e:
+            print(f"ERROR loading cuisines for restaurants page: {e}")
+            return jsonify({'error': 'Database query failed', 'message': 'Unable to fetch cuisines'}), 500
+        
         result = []
         for r in restaurants:
             try:
-                # Get cuisines for this restaurant
-                cuisines_query = """
-                    SELECT c.category_name
-                    FROM CATEGORIES c
-                    JOIN RESTAURANT_CATEGORIES rc ON c.category_id = rc.category_id
-                    WHERE rc.restaurant_id = :restaurant_id
-                """
-                cuisines = db.execute_query(cuisines_query, {'restaurant_id': r['restaurant_id']})
-                
-                result.append({
-                    'restaurant_id': r['restaurant_id'],
-                    'name': r['name'],
-                    'address': r.get('address'),
-                    'city': r.get('city'),
-                    'region': r.get('region'),
-                    'phone_number': r.get('phone_number'),
-                    'website_url': r.get('website_url'),
-                    'avg_rating': float(r['avg_rating']) if r.get('avg_rating') is not None else 0.0,
-                    'price_range': int(r['price_range']) if r.get('price_range') is not None else 0,
-                    'dining_type': r.get('dining_type'),
-                    'timings': r.get('timings'),
-                    'votes': int(r['votes']) if r.get('votes') is not None else 0,
-                    'rating_type': r.get('rating_type'),
-                    'cuisines': [c['category_name'] for c in cuisines] if cuisines else []
-                })
+                result.append({**fields.shape(r, columns, cuisines), **_sort_field(sort, r)})
             except Exception as e:
                 print(f"Error processing restaurant {r.get('restaurant_id', 'unknown')}: {e}")
                 import traceback
                 traceback.print_exc()
                 continue
         
+        return jsonify(_listing_page(result, has_more, offset, limit, total, sort, estimated, wanted)), 200
+    
+    except Exception as e:
+        print(f"Error in get_restaurants: {e}")
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+def _sql_total(predicates, params, approximate=False):
+    """
+    Number of restaurants matching `predicates` for the SQL fallback, as
+    (total, is_estimate). The COUNT(*) goes through the query result cache, so
+    it is computed once per filter signature until RESTAURANTS or its
+    categories are written. approximate=true answers unfiltered listings from
+    table statistics; filtered ones always get the exact count. Returns None
+    if the count query failed.
+    """
+    unfiltered = list(predicates) == ['rating'] and not params['min_rating']
+    if approximate and unfiltered:
+        estimate = db.estimate_rows('RESTAURANTS')
+        if estimate is not None:
+            return estimate, True
+    row = db.execute_query(
+        f"SELECT COUNT(*) FROM RESTAURANTS r WHERE {' AND '.join(predicates.values())}",
+        dict(params), fetch_one=True, row_format='tuple', cache_ttl=300
+    )
+    # COUNT(*) always returns a row, so None means the query failed
+    if row is None:
+        return None
+    return int(row[0]), False
+
+def _sort_columns(sort, params):
+    """Extra SELECT columns for `sort` in the SQL fallback (its cursor field), adding any binds to `params`"""
+    if sort == 'weighted':
+        params.update(weighting_params(db))
+        return f", {WEIGHTED_RATING_SQL} AS weighted_rating"
+    if sort == 'newest':
+        params['oldest'] = OLDEST
+        return ", r.created_at"
+    return ''
+
+def _sort_field(sort, row):
+    """{field: value} a listed restaurant carries for `sort` (see pagination.SORT_FIELDS)"""
+    field = SORT_FIELDS.get(sort)
+    return {field: FIELD_TYPES[field](row.get(field))} if field else {}
+
+def _page_window(args, default_limit):
+    """
+    (limit, offset) of a listing/search request, checked before either the
+    catalog or the SQL path runs. Raises ValueError for a non-integer, a limit
+    outside 1..MAX_PAGE_LIMIT or a negative offset.
+    """
+    try:
+        limit = int(args.get('limit') or default_limit)
+        offset = int(args.get('offset') or 0)
+    except ValueError:
+        raise ValueError('limit and offset must be integers')
+    if not 1 <= limit <= MAX_PAGE_LIMIT:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_LIMIT}')
+    if offset < 0:
+        raise ValueError('offset must not be negative')
+    return limit, offset
+
+def _listing_page(restaurants, has_more, offset, limit, total, sort, estimated=False, wanted=fields.ALL_FIELDS):
+    """
+    Response body shared by the catalog and SQL paths of get_restaurants
+    (`total` counts all pages). The cursor is taken before the rows are
+    narrowed to the `wanted` fields, so it works whatever fields were asked for.
+    """
+    return {
+        'restaurants': [fields.project(r, wanted) for r in restaurants],
+        'count': len(restaurants),
+        'total': total,
+        'total_is_estimate': estimated,
+        'offset': offset,
+        'limit': limit,
+        'has_more': has_more,
+        'next_cursor': page_cursor(restaurants[-1], sort) if has_more and restaurants else None
+    }
+
+@bp.route('/batch', methods=['GET'])
+def get_restaurants_batch():
+    """Restaurants for a list of ids (?ids=R0001,R0002,...), with cuisines, in the requested order"""
+    try:
+        ids = list_arg(request.args, 'ids')
+        try:
+            wanted = fields.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if not ids:
+            return jsonify({'error': 'ids is required'}), 400
+        if len(ids) > MAX_BATCH_IDS:
+            return jsonify({'error': f'At most {MAX_BATCH_IDS} ids per request'}), 400
+        
+        records = catalog.get_many(ids)
+        if records is None:
+            records = fetch_records(db, ids)
+        
         return jsonify({
-            'restaurants': result,
-            'total': len(result),
-            'offset': offset,
-            'limit': limit
+            'restaurants': [fields.project(records[rid], wanted) for rid in ids if rid in records],
+            'missing': [rid for rid in ids if rid not in records]
         }), 200
     
     except Exception as e:
-        print(f"Error in get_restaurants: {e}")
+        print(f"Error in get_restaurants_batch: {e}")
         return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
 
 @bp.route('/<restaurant_id>', methods=['GET'])
 def get_restaurant(restaurant_id):
-    """Get single restaurant details"""
+    """
+    Get single restaurant details.
+    include=ratings,reviews:N adds the rating summary and the newest N reviews
+    (as snippets, with a cursor for /api/reviews/restaurant/<id> to continue
+    from), all from one query, so the detail page needs a single request.
+    """
     try:
-        query = """
-            SELECT r.restaurant_id, r.name, r.address, r.city, r.region,
-                   r.phone_number, r.website_url, r.avg_rating, r.price_range,
-                   r.dining_type, r.timings, r.votes, r.rating_type
-            FROM RESTAURANTS r
-            WHERE r.restaurant_id = :restaurant_id
-        """
+        try:
+            include_ratings, review_limit = details.parse_include(request.args.get('include'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        restaurant = db.execute_query(query, {'restaurant_id': restaurant_id}, fetch_one=True)
+        rows = db.execute_query(
+            details.detail_sql(include_ratings, review_limit), {'restaurant_id': restaurant_id}
+        )
         
-        if not restaurant:
+        if rows is None:
+            return jsonify({'error': 'Database query failed'}), 500
+        if not rows:
             return jsonify({'error': 'Restaurant not found'}), 404
         
-        # Get cuisines
-        cuisines_query = """
-            SELECT c.category_name
-            FROM CATEGORIES c
-            JOIN RESTAURANT_CATEGORIES rc ON c.category_id = rc.category_id
-            WHERE rc.restaurant_id = :restaurant_id
-        """
-        cuisines = db.execute_query(cuisines_query, {'restaurant_id': restaurant_id})
-        
-        # Get recent reviews count
-        reviews_query = "SELECT COUNT(*) as count FROM REVIEWS WHERE restaurant_id = :restaurant_id"
-        review_count = db.execute_query(reviews_query, {'restaurant_id': restaurant_id}, fetch_one=True)
+        restaurant = rows[0]
+        cuisine_list = restaurant.get('cuisine_list')
+        cuisines = sorted(cuisine_list.split(details.CUISINE_SEPARATOR)) if cuisine_list else []
         
         result = {
             'restaurant_id': restaurant['restaurant_id'],
@@ -175,9 +286,17 @@ def get_restaurant(restaurant_id):
             'timings': restaurant.get('timings'),
             'votes': int(restaurant['votes']) if restaurant.get('votes') else 0,
             'rating_type': restaurant.get('rating_type'),
-            'cuisines': [c['category_name'] for c in cuisines] if cuisines else [],
-            'review_count': int(review_count['count']) if review_count and review_count.get('count') else 0
+            'cuisines': cuisines,
+            'review_count': int(restaurant['review_count']) if restaurant.get('review_count') else 0
         }
+        if include_ratings:
+            result['ratings'] = details.rating_stats(restaurant)
+        if review_limit:
+            # No reviews still yields the restaurant row, with NULL review columns
+            reviews = [r for r in rows if r.get('review_id')]
+            result['reviews'] = [details.review_item(r) for r in reviews]
+            more = reviews and result['review_count'] > len(reviews)
+            result['reviews_next_cursor'] = review_cursor(reviews[-1], 'newest') if more else None
         
         return jsonify(result), 200
     
@@ -195,12 +314,12 @@ def get_cities():
             GROUP BY city
             ORDER BY city
         """
-        cities = db.execute_query(query)
+        cities = db.execute_query(query, row_format='tuple', cache_ttl=300)
         
         if cities is None:
             return jsonify({'error': 'Database query failed'}), 500
         
-        result = [{'city': c['city'], 'count': int(c['restaurant_count'])} for c in cities]
+        result = [{'city': c.city, 'count': int(c.restaurant_count)} for c in cities]
         return jsonify(result), 200
     
     except Exception as e:
@@ -218,16 +337,16 @@ def get_categories():
             GROUP BY c.category_id, c.category_name
             ORDER BY c.category_name
         """
-        categories = db.execute_query(query)
+        categories = db.execute_query(query, row_format='tuple', cache_ttl=300)
         
         if categories is None:
             return jsonify({'error': 'Database query failed'}), 500
         
         result = [
             {
-                'id': c['category_id'], 
-                'name': c['category_name'],
-                'count': int(c['count']) if c.get('count') else 0
+                'id': c.category_id, 
+                'name': c.category_name,
+                'count': int(c.count) if c.count else 0
             } 
             for c in categories
         ]
@@ -237,67 +356,163 @@ def get_categories():
         print(f"Error in get_categories: {e}")
         return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
 
+@bp.route('/facets', methods=['GET'])
+def get_facets():
+    """Counts for every sidebar facet (city, cuisine, dining type, rating, price) under the current filters"""
+    try:
+        try:
+            filters = parse_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        search = request.args.get('search', '')
+        
+        counts = catalog.facets(filters, search)
+        if counts is None:
+            # Fallback: every facet from one grouped query
+            sql, params = facets.facets_sql(filters, search)
+            rows = db.execute_query(sql, params, row_format='tuple', cache_ttl=300)
+            if rows is None:
+                return jsonify({'error': 'Database query failed'}), 500
+            counts = facets.counts_from_rows(rows)
+        
+        return jsonify(facets.shape(counts)), 200
+    
+    except Exception as e:
+        print(f"Error in get_facets: {e}")
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+@bp.route('/suggest', methods=['GET'])
+def suggest():
+    """Autocomplete: top restaurants, cuisines and regions with a word starting with `q`"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        try:
+            limit = int(request.args.get('limit') or 5)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        limit = min(max(limit, 1), TOP_K)
+        
+        if not prefix:
+            return jsonify({'query': prefix, 'restaurants': [], 'cuisines': [], 'regions': []}), 200
+        
+        suggestions = catalog.suggest(prefix, limit)
+        if suggestions is None:
+            suggestions = _suggest_sql(prefix, limit)
+            if suggestions is None:
+                return jsonify({'error': 'Database query failed'}), 500
+        
+        return jsonify({'query': prefix, **suggestions}), 200
+    
+    except Exception as e:
+        print(f"Error in suggest: {e}")
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+def _suggest_sql(prefix, limit):
+    """Fallback when the catalog is not loaded: leading-prefix LIKE queries"""
+    params = {'prefix': f'{prefix.lower()}%'}
+    restaurants = db.execute_query(db.paginate(f"""
+        SELECT r.restaurant_id, r.name, r.city, r.avg_rating, r.votes
+        FROM RESTAURANTS r
+        WHERE LOWER(r.name) LIKE :prefix
+        {RATING_ORDER_BY}
+    """, limit), params)
+    cuisines = db.execute_query(db.paginate("""
+        SELECT c.category_name, COUNT(*) AS restaurant_count, SUM(r.votes) AS total_votes
+        FROM CATEGORIES c
+        JOIN RESTAURANT_CATEGORIES rc ON rc.category_id = c.category_id
+        JOIN RESTAURANTS r ON r.restaurant_id = rc.restaurant_id
+        WHERE LOWER(c.category_name) LIKE :prefix
+        GROUP BY c.category_name
+        ORDER BY total_votes DESC, restaurant_count DESC, c.category_name
+    """, limit), params, row_format='tuple')
+    regions = db.execute_query(db.paginate("""
+        SELECT r.region, r.city, COUNT(*) AS restaurant_count, SUM(r.votes) AS total_votes
+        FROM RESTAURANTS r
+        WHERE LOWER(r.region) LIKE :prefix
+        GROUP BY r.region, r.city
+        ORDER BY total_votes DESC, restaurant_count DESC, r.region
+    """, limit), params, row_format='tuple')
+    if restaurants is None or cuisines is None or regions is None:
+        return None
+    return {
+        'restaurants': [
+            {
+                'restaurant_id': r['restaurant_id'],
+                'name': r['name'],
+                'city': r['city'],
+                'avg_rating': float(r['avg_rating']) if r.get('avg_rating') is not None else 0.0,
+                'votes': int(r['votes']) if r.get('votes') is not None else 0
+            }
+            for r in restaurants
+        ],
+        'cuisines': [{'name': c.category_name, 'count': int(c.restaurant_count)} for c in cuisines],
+        'regions': [{'name': g.region, 'city': g.city, 'count': int(g.restaurant_count)} for g in regions]
+    }
+
 @bp.route('/search', methods=['GET'])
 def search_restaurants():
     """Advanced search endpoint"""
     try:
         query_text = request.args.get('q', '')
-        city = request.args.get('city')
-        min_rating = float(request.args.get('min_rating', 0))
-        max_price = request.args.get('max_price')
-        cuisine = request.args.get('cuisine')
-        
-        # Build base query without cuisine filter first
-        base_query = """
-            SELECT r.restaurant_id, r.name, r.city, r.avg_rating, 
-                   r.price_range, r.votes, r.dining_type
+        try:
+            filters = parse_filters(request.args)
+            wanted = fields.parse_fields(request.args.get('fields'), default=fields.SEARCH_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        try:
+            limit, offset = _page_window(request.args, default_limit=20)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        cursor = request.args.get('cursor')
+        # Text matches are ranked by relevance unless rating order is asked for
+        sort = request.args.get('sort') or ('relevance' if query_text else 'rating')
+        
+        if sort not in SORTS:
+            return jsonify({'error': f"sort must be one of: {', '.join(SORTS)}"}), 400
+        
+        after = None
+        if cursor:
+            try:
+                after = seek_key(cursor, sort)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        page = catalog.select(
+            filters, search=query_text, sort=sort,
+            after=after, offset=0 if cursor else offset, limit=limit
+        )
+        if page is not None:
+            results, has_more, total = page
+            return jsonify(_search_page(results, has_more, offset, limit, total, sort, wanted)), 200
+        
+        if sort == 'relevance':
+            sort = 'rating'
+        if cursor:
+            try:
+                seek = seek_params(cursor, sort)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        predicates, params = sql_predicates(filters)
+        if query_text:
+            predicates['search'] = "LOWER(r.name) LIKE LOWER(:search)"
+            params['search'] = f'%{query_text}%'
+        counted = _sql_total(predicates, params)
+        if counted is None:
+            return jsonify({'error': 'Database query failed'}), 500
+        total, _ = counted
+        columns = fields.with_cursor_fields(wanted, sort)
+        base_query = f"""
+            SELECT {fields.select_list(columns)}{_sort_columns(sort, params)}
             FROM RESTAURANTS r
-            WHERE r.avg_rating >= :min_rating
+            WHERE {' AND '.join(predicates.values())}
         """
         
-        params = {'min_rating': min_rating}
+        if cursor:
+            base_query += seek_predicate(sort)
+            params.update(seek)
         
-        if query_text:
-            base_query += " AND LOWER(r.name) LIKE LOWER(:query)"
-            params['query'] = f'%{query_text}%'
-        
-        if city:
-            base_query += " AND r.city = :city"
-            params['city'] = city
-        
-        if max_price:
-            base_query += " AND r.price_range <= :max_price"
-            params['max_price'] = int(max_price)
-        
-        # If cuisine filter, need to join with categories
-        if cuisine:
-            base_query = """
-                SELECT DISTINCT r.restaurant_id, r.name, r.city, r.avg_rating, 
-                       r.price_range, r.votes, r.dining_type
-                FROM RESTAURANTS r
-                INNER JOIN RESTAURANT_CATEGORIES rc ON r.restaurant_id = rc.restaurant_id
-                INNER JOIN CATEGORIES c ON rc.category_id = c.category_id
-                WHERE r.avg_rating >= :min_rating
-                AND c.category_name = :cuisine
-            """
-            if query_text:
-                base_query += " AND LOWER(r.name) LIKE LOWER(:query)"
-            if city:
-                base_query += " AND r.city = :city"
-            if max_price:
-                base_query += " AND r.price_range <= :max_price"
-        
-        # Use ROWNUM for Oracle 11g compatibility
-        query = f"""
-            SELECT restaurant_id, name, city, avg_rating, 
-                   price_range, votes, dining_type
-            FROM (
-                SELECT inner.*, ROWNUM rnum FROM (
-                    {base_query}
-                    ORDER BY avg_rating DESC, votes DESC
-                ) inner WHERE ROWNUM <= 20
-            ) outer WHERE rnum > 0
-        """
+        query = db.paginate(f"{base_query} {order_by(sort)}", limit + 1, 0 if cursor else offset)
         
         try:
             results = db.execute_query(query, params)
@@ -315,24 +530,34 @@ def search_restaurants():
         if results is None:
             return jsonify({'error': 'Database query failed'}), 500
         
-        restaurants = [
-            {
-                'restaurant_id': r['restaurant_id'],
-                'name': r['name'],
-                'city': r['city'],
-                'avg_rating': float(r['avg_rating']) if r.get('avg_rating') else 0,
-                'price_range': int(r['price_range']) if r.get('price_range') else 0,
-                'votes': int(r['votes']) if r.get('votes') else 0,
-                'dining_type': r.get('dining_type')
-            }
-            for r in results
-        ]
+        has_more = len(results) > limit
+        results = results[:limit]
         
-        return jsonify({
-            'results': restaurants,
-            'count': len(restaurants)
-        }), 200
+        if 'cuisines' in wanted:
+            attach_cuisines(results)
+        
+        return jsonify(_search_page(results, has_more, offset, limit, total, sort, wanted)), 200
     
     except Exception as e:
         print(f"Error in search_restaurants: {e}")
-        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+def _search_page(results, has_more, offset, limit, total, sort, wanted=fields.SEARCH_FIELDS):
+    """Response body shared by the catalog and SQL paths of search_restaurants"""
+    columns = fields.with_cursor_fields(wanted, sort)
+    restaurants = []
+    for r in results:
+        restaurant = fields.shape(r, columns)
+        if 'relevance' in r:
+            restaurant['relevance'] = r['relevance']
+        restaurant.update(_sort_field(sort, r))
+        restaurants.append(restaurant)
+    return {
+        'results': [fields.project(r, wanted) for r in restaurants],
+        'count': len(restaurants),
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'has_more': has_more,
+        'next_cursor': page_cursor(restaurants[-1], sort) if has_more and restaurants else None
+    }
\ No newline at end of file
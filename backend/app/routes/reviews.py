@@ -1,19 +1,38 @@
 from flask import Blueprint, request, jsonify
+from app.counters import helpful_ledger
 from app.database import db
+from app.utils import details
 from app.utils.auth_helpers import token_required
+from app.utils.pagination import REVIEW_ORDERS, review_cursor, seek_params
+from app.utils.streaming import stream_rows
 import uuid
 import traceback
 
 bp = Blueprint('reviews', __name__)
 
+# Any of these switches get_reviews from the full list to paginated snippets
+PAGE_PARAMS = ('limit', 'cursor', 'sort', 'snippet')
+
+# MERGE on Oracle, INSERT ... ON CONFLICT on SQLite
+REVIEW_UPSERT = db.upsert_sql(
+    'REVIEWS', 'review_id', ('user_id', 'restaurant_id'),
+    {'review_text': ':review_text', 'review_date': 'SYSDATE'}
+)
+
 @bp.route('/restaurant/<restaurant_id>', methods=['GET'])
 def get_reviews(restaurant_id):
-    """Get reviews for a restaurant"""
+    """
+    Get reviews for a restaurant.
+    With limit/cursor/sort/snippet the reviews come a page at a time, each
+    with the first `snippet` characters of its text (see get_review_page);
+    without them the full list is returned as before.
+    """
     try:
-        query = """
-            SELECT r.review_id, r.user_id, u.username, 
-                   TO_CHAR(r.review_text) as review_text,
-                   r.review_date, r.helpful_count
+        if any(name in request.args for name in PAGE_PARAMS):
+            return get_review_page(restaurant_id)
+        
+        query = f"""
+            SELECT {details.REVIEW_COLUMNS}
             FROM REVIEWS r
             JOIN USERS u ON r.user_id = u.user_id
             WHERE r.restaurant_id = :restaurant_id
@@ -25,23 +44,79 @@ def get_reviews(restaurant_id):
         if reviews is None:
             return jsonify({'error': 'Database query failed'}), 500
         
-        result = []
-        for r in reviews:
-            result.append({
-                'review_id': r['review_id'],
-                'user_id': r['user_id'],
-                'username': r['username'],
-                'review_text': r['review_text'],
-                'review_date': r['review_date'].strftime('%Y-%m-%d') if r.get('review_date') else None,
-                'helpful_count': int(r.get('helpful_count', 0))
-            })
-        
-        return jsonify(result), 200
+        return jsonify([details.review_item(r) for r in reviews]), 200
     except Exception as e:
         print(f"ERROR in get_reviews: {e}")
         traceback.print_exc()
         return jsonify({'error': 'Failed to fetch reviews'}), 500
 
+def get_review_page(restaurant_id):
+    """
+    Keyset-paginated reviews: sort=newest (review_date DESC, review_id) or
+    helpful (helpful_count DESC, then newest). Texts are cut to `snippet`
+    characters in SQL, so no CLOB is fetched; reviews marked `truncated` load
+    their full text from /api/reviews/<review_id>/text when expanded.
+    """
+    sort = request.args.get('sort', 'newest')
+    if sort not in REVIEW_ORDERS:
+        return jsonify({'error': f"sort must be one of: {', '.join(REVIEW_ORDERS)}"}), 400
+    try:
+        limit = int(request.args.get('limit') or details.DEFAULT_REVIEW_PAGE)
+        snippet = int(request.args.get('snippet') or details.DEFAULT_SNIPPET)
+    except ValueError:
+        return jsonify({'error': 'limit and snippet must be integers'}), 400
+    if not 1 <= limit <= details.MAX_REVIEW_PAGE:
+        return jsonify({'error': f'limit must be between 1 and {details.MAX_REVIEW_PAGE}'}), 400
+    if not 1 <= snippet <= details.MAX_SNIPPET:
+        return jsonify({'error': f'snippet must be between 1 and {details.MAX_SNIPPET}'}), 400
+    
+    params = {'restaurant_id': restaurant_id}
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            params.update(seek_params(cursor, sort, REVIEW_ORDERS))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    # One extra row tells whether another page exists
+    query = db.paginate(details.review_page_sql(sort, snippet, after=bool(cursor)), limit + 1)
+    rows = db.execute_query(query, params)
+    if rows is None:
+        return jsonify({'error': 'Database query failed'}), 500
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return jsonify({
+        'reviews': [details.review_item(r) for r in rows],
+        'count': len(rows),
+        'sort': sort,
+        'limit': limit,
+        'snippet': snippet,
+        'has_more': has_more,
+        'next_cursor': review_cursor(rows[-1], sort) if has_more else None
+    }), 200
+
+@bp.route('/<review_id>/text', methods=['GET'])
+def get_review_text(review_id):
+    """Full text of one review (the CLOB itself, not a TO_CHAR copy), for expanding a snippet"""
+    try:
+        # A list, not fetch_one: None then means the query failed, [] that there is no such review
+        rows = db.execute_query(
+            "SELECT review_id, review_text FROM REVIEWS WHERE review_id = :review_id",
+            {'review_id': review_id}
+        )
+        if rows is None:
+            return jsonify({'error': 'Database query failed'}), 500
+        if not rows:
+            return jsonify({'error': 'Review not found'}), 404
+        row = rows[0]
+        
+        return jsonify({'review_id': row['review_id'], 'review_text': row['review_text']}), 200
+    except Exception as e:
+        print(f"ERROR in get_review_text: {e}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to fetch review'}), 500
+
 @bp.route('/', methods=['POST'])
 @token_required
 def create_review():
@@ -55,41 +130,23 @@ def create_review():
         if not data.get('restaurant_id') or not data.get('review_text'):
             return jsonify({'error': 'Restaurant ID and review text are required'}), 400
         
-        # Check if user already reviewed this restaurant
-        existing = db.execute_query(
-            "SELECT review_id FROM REVIEWS WHERE user_id = :user_id AND restaurant_id = :restaurant_id",
-            {'user_id': request.user_id, 'restaurant_id': data['restaurant_id']},
-            fetch_one=True
+        # One statement creates the review or replaces the user's existing one
+        # (UNIQUE (user_id, restaurant_id)), returning whichever id it wrote
+        new_id = f"REV{uuid.uuid4().hex[:8].upper()}"
+        result = db.execute_non_query(
+            REVIEW_UPSERT,
+            {
+                'review_id': new_id,
+                'user_id': request.user_id,
+                'restaurant_id': data['restaurant_id'],
+                'review_text': data['review_text']
+            },
+            returning=('review_id', 'upsert_id')
         )
+        review_id = result.get('returning') if result else None
+        message = 'Review created successfully' if review_id == new_id else 'Review updated successfully'
         
-        if existing:
-            # Update existing review
-            result = db.execute_non_query(
-                """UPDATE REVIEWS 
-                   SET review_text = :review_text, review_date = SYSDATE 
-                   WHERE review_id = :review_id""",
-                {'review_text': data['review_text'], 'review_id': existing['review_id']}
-            )
-            message = 'Review updated successfully'
-            review_id = existing['review_id']
-        else:
-            # Create new review
-            review_id = f"REV{uuid.uuid4().hex[:8].upper()}"
-            result = db.execute_non_query(
-                """INSERT INTO REVIEWS (review_id, user_id, restaurant_id, review_text, review_date)
-                   VALUES (:review_id, :user_id, :restaurant_id, :review_text, SYSDATE)""",
-                {
-                    'review_id': review_id,
-                    'user_id': request.user_id,
-                    'restaurant_id': data['restaurant_id'],
-                    'review_text': data['review_text']
-                }
-            )
-            message = 'Review created successfully'
-        
-        success = result is not None and result.get('rowcount', 0) > 0
-        
-        if success:
+        if review_id is not None:
             return jsonify({
                 'message': message,
                 'review_id': review_id
@@ -117,23 +174,18 @@ def get_user_reviews():
             ORDER BY r.review_date DESC
         """
         
-        reviews = db.execute_query(query, {'user_id': request.user_id})
-        
-        if reviews is None:
-            return jsonify({'error': 'Database query failed'}), 500
-        
-        result = []
-        for r in reviews:
-            result.append({
+        def serialize(r):
+            return {
                 'review_id': r['review_id'],
                 'restaurant_id': r['restaurant_id'],
                 'restaurant_name': r['restaurant_name'],
                 'review_text': r['review_text'],
                 'review_date': r['review_date'].strftime('%Y-%m-%d') if r.get('review_date') else None,
-                'helpful_count': int(r.get('helpful_count', 0))
-            })
+                'helpful_count': int(r.get('helpful_count') or 0) + helpful_ledger.pending(r['review_id'])
+            }
         
-        return jsonify(result), 200
+        # Streamed in fetch batches: memory stays flat however long the history is
+        return stream_rows(db.stream_query(query, {'user_id': request.user_id}), serialize)
     except Exception as e:
         print(f"ERROR in get_user_reviews: {e}")
         traceback.print_exc()
@@ -142,19 +194,36 @@ def get_user_reviews():
 @bp.route('/<review_id>/helpful', methods=['POST'])
 @token_required
 def mark_helpful(review_id):
-    """Mark a review as helpful"""
+    """
+    Mark a review as helpful, once per user.
+    The vote is buffered and written with others in the next ledger flush
+    (app/counters.py), which also adds the votes it stored to helpful_count,
+    so clicks on a popular review don't queue on its row lock. Whether the
+    user already voted is answered by the ledger's in-memory filter, going to
+    HELPFUL_VOTES only when the filter can't rule it out.
+    """
     try:
-        result = db.execute_non_query(
-            """UPDATE REVIEWS 
-               SET helpful_count = helpful_count + 1 
-               WHERE review_id = :review_id""",
+        # A list, not fetch_one: None then means the query failed, [] that there is no such review
+        rows = db.execute_query(
+            "SELECT helpful_count FROM REVIEWS WHERE review_id = :review_id",
             {'review_id': review_id}
         )
-        
-        if result and result.get('rowcount', 0) > 0:
-            return jsonify({'message': 'Marked as helpful'}), 200
-        else:
+        if rows is None:
+            return jsonify({'error': 'Database query failed'}), 500
+        if not rows:
             return jsonify({'error': 'Review not found'}), 404
+        review = rows[0]
+        
+        if not helpful_ledger.add(request.user_id, review_id):
+            return jsonify({
+                'error': 'You already marked this review as helpful',
+                'helpful_count': int(review['helpful_count'] or 0) + helpful_ledger.pending(review_id)
+            }), 409
+        
+        return jsonify({
+            'message': 'Marked as helpful',
+            'helpful_count': int(review['helpful_count'] or 0) + helpful_ledger.pending(review_id)
+        }), 200
             
     except Exception as e:
         print(f"ERROR in mark_helpful: {e}")
@@ -0,0 +1,54 @@
+"""
+Bitmaps as plain Python ints: bit i is set when the item at ordinal i is in
+the set. AND/OR/popcount over ~1,000 restaurants is a handful of machine
+words, so combined filters cost a few int operations.
+"""
+
+
+def from_positions(positions):
+    mask = 0
+    for pos in positions:
+        mask |= 1 << pos
+    return mask
+
+
+def low_mask(n):
+    """Bits 0..n-1 set"""
+    return (1 << n) - 1
+
+
+def drop_below(mask, n):
+    """Clear bits 0..n-1"""
+    return mask >> n << n
+
+
+def delete_bit(mask, pos):
+    """Remove bit `pos`, shifting the higher bits down by one"""
+    return (mask & low_mask(pos)) | (mask >> (pos + 1) << pos)
+
+
+def insert_bit(mask, pos, bit):
+    """Open a slot at `pos` (higher bits move up by one) holding `bit`"""
+    return (mask & low_mask(pos)) | (int(bool(bit)) << pos) | (mask >> pos << (pos + 1))
+
+
+def iter_bits(mask):
+    """Positions of set bits, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def union(masks):
+    result = 0
+    for mask in masks:
+        result |= mask
+    return result
+
+
+def intersection(masks, universe):
+    result = universe
+    for mask in masks:
+        result &= mask
+    return result
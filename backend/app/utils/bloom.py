@@ -0,0 +1,44 @@
+import math
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings: `in` is never wrong for added
+    items and wrong for at most about `error_rate` of the others while no
+    more than `capacity` items have been added. About 9.6 bits per item at 1%.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k positions from the two halves of one 128-bit digest
+        digest = blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, item):
+        bits = self.bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[pos >> 3] >> (pos & 7) & 1 for pos in self._positions(item))
+
+    @property
+    def saturated(self):
+        """More items than it was sized for (the false-positive rate is climbing)"""
+        return self.count > self.capacity
+
+    def nbytes(self):
+        return len(self.bits)
@@ -0,0 +1,179 @@
+from app.counters import helpful_ledger
+from app.database import db
+from app.utils.pagination import REVIEW_ORDERS, order_by, seek_predicate
+
+# Reviews returned by include=reviews when no count is given, and the most allowed
+DEFAULT_REVIEWS = 10
+MAX_REVIEWS = 50
+
+CUISINE_SEPARATOR = '|'
+
+# Paginated reviews: page size, and the text snippet each review carries.
+# A snippet is a VARCHAR2 on Oracle (at most 4,000 bytes), hence MAX_SNIPPET.
+DEFAULT_REVIEW_PAGE = 20
+MAX_REVIEW_PAGE = 100
+DEFAULT_SNIPPET = 280
+MAX_SNIPPET = 1000
+
+# Half-star histogram bins, highest first. A rating counts in the bin it
+# rounds to (ROUND(rating_value * 2) / 2), like the RATINGS trigger does.
+RATING_BINS = tuple(half / 2 for half in range(10, 1, -1))
+
+
+def _bin_column(value):
+    return f"bin_{int(value * 10)}"
+
+
+# Rating summary of restaurant r (shared with /api/ratings/restaurant/<id>):
+# the trigger-maintained totals plus the restaurant's RATING_HISTOGRAM rows
+# pivoted into one row, so no RATINGS row is read
+RATING_STATS_COLUMNS = """
+    r.rating_count AS total_ratings,
+    ROUND(r.rating_sum / NULLIF(r.rating_count, 0), 1) AS ratings_avg,
+    """ + ', '.join(f"rh.{_bin_column(value)}" for value in RATING_BINS)
+
+_BIN_SUMS = ',\n               '.join(
+    f"SUM(CASE WHEN bin = {value} THEN rating_count ELSE 0 END) AS {_bin_column(value)}" for value in RATING_BINS
+)
+
+RATING_STATS_JOIN = f"""
+    LEFT JOIN (
+        SELECT restaurant_id,
+               {_BIN_SUMS}
+        FROM RATING_HISTOGRAM
+        WHERE restaurant_id = :restaurant_id
+        GROUP BY restaurant_id
+    ) rh ON rh.restaurant_id = r.restaurant_id"""
+
+REVIEW_COLUMNS = """
+    r.review_id, r.restaurant_id, r.user_id, u.username,
+    TO_CHAR(r.review_text) as review_text,
+    r.review_date, r.helpful_count
+"""
+
+
+def parse_include(value):
+    """
+    `include=ratings,reviews:10` -> (include_ratings, review_limit).
+    review_limit is 0 when reviews aren't requested. Raises ValueError.
+    """
+    ratings = False
+    reviews = 0
+    for part in (value or '').split(','):
+        name, _, count = part.strip().partition(':')
+        if not name:
+            continue
+        if name == 'ratings' and not count:
+            ratings = True
+        elif name == 'reviews':
+            try:
+                reviews = int(count) if count else DEFAULT_REVIEWS
+            except ValueError:
+                raise ValueError("include accepts: ratings, reviews[:count]")
+            if not 1 <= reviews <= MAX_REVIEWS:
+                raise ValueError(f"reviews count must be between 1 and {MAX_REVIEWS}")
+        else:
+            raise ValueError("include accepts: ratings, reviews[:count]")
+    return ratings, reviews
+
+
+def rating_stats(row):
+    """
+    Rating summary body of a restaurant row (see RATING_STATS_COLUMNS); a
+    restaurant without ratings gets zeros. `histogram` has every half-star bin ('5', '4.5', ... '1');
+    `distribution` keeps the whole-star keys, a half star counting with the
+    star below it (4.5 under '4'), so both add up to total_ratings.
+    """
+    histogram = {f"{value:g}": int(row.get(_bin_column(value)) or 0) for value in RATING_BINS}
+    distribution = {str(star): 0 for star in range(5, 0, -1)}
+    for value in RATING_BINS:
+        distribution[str(int(value))] += histogram[f"{value:g}"]
+    return {
+        'total_ratings': int(row.get('total_ratings') or 0),
+        'avg_rating': float(row['ratings_avg']) if row.get('ratings_avg') else 0,
+        'distribution': distribution,
+        'histogram': histogram
+    }
+
+
+def review_item(row):
+    item = {
+        'review_id': row['review_id'],
+        'user_id': row['user_id'],
+        'username': row['username'],
+        'review_text': row['review_text'],
+        'review_date': row['review_date'].strftime('%Y-%m-%d') if row.get('review_date') else None,
+        'helpful_count': int(row.get('helpful_count') or 0) + helpful_ledger.pending(row['review_id'])
+    }
+    if 'text_length' in row:
+        # Snippet rows: the full text is at /api/reviews/<id>/text when truncated
+        item['text_length'] = int(row['text_length'] or 0)
+        item['truncated'] = item['text_length'] > len(row['review_text'] or '')
+    return item
+
+
+def snippet_columns(snippet):
+    """REVIEW_COLUMNS with only the first `snippet` characters of the text, plus its full length"""
+    return f"""
+    r.review_id, r.restaurant_id, r.user_id, u.username,
+    {db.text_prefix('r.review_text', snippet)} as review_text,
+    {db.text_length('r.review_text')} as text_length,
+    r.review_date, r.helpful_count
+"""
+
+
+def review_page_sql(sort, snippet, after=False):
+    """
+    One page of a restaurant's reviews in REVIEW_ORDERS[sort] order, as
+    snippets (see snippet_columns). after=True seeks past a cursor (binds
+    :c0, :c1, ...). Wrap in db.paginate().
+    """
+    seek = seek_predicate(sort, REVIEW_ORDERS) if after else ''
+    return f"""
+        SELECT {snippet_columns(snippet)}
+        FROM REVIEWS r
+        JOIN USERS u ON r.user_id = u.user_id
+        WHERE r.restaurant_id = :restaurant_id{seek}
+        {order_by(sort, REVIEW_ORDERS)}
+    """
+
+
+def detail_sql(include_ratings=False, review_limit=0):
+    """
+    One query for the restaurant detail page. The restaurant row carries its
+    cuisine list (a string aggregate) and review count as scalar subqueries;
+    rating stats and the newest `review_limit` reviews (as DEFAULT_SNIPPET
+    snippets) are outer-joined, so the result is one row per included review
+    (or a single row).
+    """
+    columns = [f"""
+        r.restaurant_id, r.name, r.address, r.city, r.region,
+        r.phone_number, r.website_url, r.avg_rating, r.price_range,
+        r.dining_type, r.timings, r.votes, r.rating_type,
+        (SELECT COUNT(*) FROM REVIEWS rv WHERE rv.restaurant_id = r.restaurant_id) AS review_count,
+        (SELECT {db.list_agg('c.category_name', CUISINE_SEPARATOR)}
+         FROM RESTAURANT_CATEGORIES rc
+         JOIN CATEGORIES c ON c.category_id = rc.category_id
+         WHERE rc.restaurant_id = r.restaurant_id) AS cuisine_list"""]
+    joins = []
+    order_clause = ''
+
+    if include_ratings:
+        columns.append(RATING_STATS_COLUMNS)
+        joins.append(RATING_STATS_JOIN)
+
+    if review_limit:
+        newest = db.paginate(review_page_sql('newest', DEFAULT_SNIPPET), review_limit)
+        columns.append("""
+        rvw.review_id, rvw.user_id, rvw.username, rvw.review_text, rvw.text_length,
+        rvw.review_date, rvw.helpful_count""")
+        joins.append(f"""
+        LEFT JOIN ({newest}) rvw ON rvw.restaurant_id = r.restaurant_id""")
+        order_clause = "ORDER BY rvw.review_date DESC, rvw.review_id"
+
+    return f"""
+        SELECT {','.join(columns)}
+        FROM RESTAURANTS r{''.join(joins)}
+        WHERE r.restaurant_id = :restaurant_id
+        {order_clause}
+    """
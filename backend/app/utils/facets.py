@@ -0,0 +1,127 @@
+from app.utils.filters import sql_predicates
+
+# Sidebar buckets: "x & above" ratings and "up to x" price (cost for two)
+RATING_BANDS = (4.5, 4.0, 3.5, 3.0)
+PRICE_BANDS = (300, 500, 800, 1200)
+
+def rating_band(avg_rating):
+    """Highest rating band the value reaches, or None"""
+    for band in RATING_BANDS:
+        if avg_rating >= band:
+            return band
+    return None
+
+
+def price_band(price_range):
+    """Lowest price band the value fits in, or None"""
+    for band in sorted(PRICE_BANDS):
+        if price_range <= band:
+            return band
+    return None
+
+
+def empty_counts():
+    return {'total': 0, 'city': {}, 'cuisine': {}, 'dining_type': {}, 'rating': {}, 'price': {}}
+
+
+def shape(counts):
+    """Raw per-value/per-band counts -> response body (band counts made cumulative)"""
+    ratings = []
+    running = 0
+    for band in RATING_BANDS:
+        running += counts['rating'].get(band, 0)
+        ratings.append({'min_rating': band, 'count': running})
+
+    prices = []
+    running = 0
+    for band in sorted(PRICE_BANDS):
+        running += counts['price'].get(band, 0)
+        prices.append({'max_price': band, 'count': running})
+
+    return {
+        'total': counts['total'],
+        'cities': [{'city': k, 'count': v} for k, v in sorted(counts['city'].items())],
+        'cuisines': [{'name': k, 'count': v} for k, v in sorted(counts['cuisine'].items())],
+        'dining_types': [
+            {'name': k, 'count': v}
+            for k, v in sorted(counts['dining_type'].items(), key=lambda item: (-item[1], item[0]))
+        ],
+        'ratings': ratings,
+        'price_ranges': prices,
+    }
+
+
+def _band_case(column, bands, op):
+    whens = ' '.join(f"WHEN {column} {op} {band} THEN '{band}'" for band in bands)
+    return f"CASE {whens} END"
+
+
+def facets_sql(filters, search=None):
+    """
+    One UNION ALL query returning (facet, value, cnt) rows for every facet.
+    Each filter (app/utils/filters.parse_filters() shape) becomes a 0/1 flag
+    in the `f` subquery so every branch can apply all filters except its own.
+    """
+    predicates, params = sql_predicates(filters)
+
+    where = ''
+    if search:
+        where = "WHERE LOWER(r.name) LIKE :search"
+        params['search'] = f'%{search.lower()}%'
+
+    flags = ''.join(
+        f", CASE WHEN {predicate} THEN 1 ELSE 0 END AS ok_{name}"
+        for name, predicate in predicates.items()
+    )
+
+    def passing(exclude=None, extra=()):
+        conds = [f"f.ok_{name} = 1" for name in predicates if name != exclude] + list(extra)
+        return f"WHERE {' AND '.join(conds)}" if conds else ''
+
+    rating_case = _band_case('f.avg_rating', RATING_BANDS, '>=')
+    price_case = _band_case('f.price_range', sorted(PRICE_BANDS), '<=')
+    sql = f"""
+        WITH f AS (
+            SELECT r.restaurant_id, r.city, r.dining_type, r.avg_rating, r.price_range{flags}
+            FROM RESTAURANTS r
+            {where}
+        )
+        SELECT 'total' AS facet, NULL AS value, COUNT(*) AS cnt FROM f {passing()}
+        UNION ALL
+        SELECT 'city', f.city, COUNT(*) FROM f {passing('city')} GROUP BY f.city
+        UNION ALL
+        SELECT 'cuisine', c.category_name, COUNT(*)
+        FROM f
+        JOIN RESTAURANT_CATEGORIES rc ON rc.restaurant_id = f.restaurant_id
+        JOIN CATEGORIES c ON c.category_id = rc.category_id
+        {passing('cuisine')}
+        GROUP BY c.category_name
+        UNION ALL
+        SELECT 'dining_type', f.dining_type, COUNT(*) FROM f {passing('dining_type')} GROUP BY f.dining_type
+        UNION ALL
+        SELECT 'rating', {rating_case}, COUNT(*) FROM f {passing('rating')} GROUP BY {rating_case}
+        UNION ALL
+        SELECT 'price', {price_case}, COUNT(*) FROM f
+        {passing('price', ['f.price_range IS NOT NULL'])}
+        GROUP BY {price_case}
+    """
+    return sql, params
+
+
+def counts_from_rows(rows):
+    """(facet, value, cnt) rows from facets_sql -> the raw counts shape()"""
+    counts = empty_counts()
+    for facet, value, cnt in rows:
+        facet = facet.strip()  # Oracle blank-pads CHAR literals in a UNION
+        cnt = int(cnt or 0)
+        if facet == 'total':
+            counts['total'] = cnt
+        elif value is None:
+            continue
+        elif facet == 'rating':
+            counts['rating'][float(value)] = cnt
+        elif facet == 'price':
+            counts['price'][int(value)] = cnt
+        else:
+            counts[facet][value] = cnt
+    return counts
@@ -0,0 +1,92 @@
+from app.utils.pagination import SORT_ORDERS
+
+
+def _text(value):
+    return value
+
+
+def _rating(value):
+    return float(value) if value is not None else 0.0
+
+
+def _count(value):
+    return int(value) if value is not None else 0
+
+
+# Restaurant fields a listing may return, as (SELECT column, converter).
+# cuisines has no column: it comes from one batched RESTAURANT_CATEGORIES lookup.
+LISTING_FIELDS = {
+    'restaurant_id': ('r.restaurant_id', _text),
+    'name': ('r.name', _text),
+    'address': ('r.address', _text),
+    'city': ('r.city', _text),
+    'region': ('r.region', _text),
+    'phone_number': ('r.phone_number', _text),
+    'website_url': ('r.website_url', _text),
+    'avg_rating': ('r.avg_rating', _rating),
+    'price_range': ('r.price_range', _count),
+    'dining_type': ('r.dining_type', _text),
+    'timings': ('r.timings', _text),
+    'votes': ('r.votes', _count),
+    'rating_type': ('r.rating_type', _text),
+    'cuisines': (None, None),
+}
+
+ALL_FIELDS = tuple(LISTING_FIELDS)
+
+# What /search returns when no fields are asked for
+SEARCH_FIELDS = (
+    'restaurant_id', 'name', 'city', 'avg_rating', 'price_range', 'votes', 'dining_type', 'cuisines'
+)
+
+
+def parse_fields(value, default=ALL_FIELDS):
+    """
+    `fields=name,city,avg_rating` -> tuple of listing fields, in LISTING_FIELDS
+    order. restaurant_id is always included; `default` when no fields are
+    given. Raises ValueError for a field outside the whitelist.
+    """
+    names = {name.strip() for name in (value or '').split(',') if name.strip()}
+    if not names:
+        return default
+    unknown = names - LISTING_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(ALL_FIELDS)}")
+    names.add('restaurant_id')
+    return tuple(field for field in ALL_FIELDS if field in names)
+
+
+def select_list(fields):
+    """SELECT columns reading `fields` (cuisines needs none)"""
+    return ', '.join(LISTING_FIELDS[field][0] for field in fields if LISTING_FIELDS[field][0])
+
+
+def with_cursor_fields(fields, sort):
+    """`fields` plus the listing fields the cursor of `sort` is built from (relevance uses rating's)"""
+    columns = SORT_ORDERS.get(sort, SORT_ORDERS['rating'])
+    needed = set(fields) | {field for _, _, field in columns}
+    return tuple(field for field in ALL_FIELDS if field in needed)
+
+
+def shape(row, fields, cuisines=None):
+    """
+    A restaurant row as a listing item holding only `fields`. cuisines come
+    from the batched {restaurant_id: [names]} lookup, else from the row itself.
+    """
+    item = {}
+    for field in fields:
+        if field == 'cuisines':
+            item['cuisines'] = cuisines.get(row['restaurant_id'], []) if cuisines is not None else row.get('cuisines', [])
+        else:
+            item[field] = LISTING_FIELDS[field][1](row.get(field))
+    return item
+
+
+def project(record, fields):
+    """
+    Narrow a full listing record (e.g. from the catalog) to `fields`. Keys
+    outside LISTING_FIELDS, like relevance or a sort's cursor field, are kept.
+    """
+    if fields is ALL_FIELDS:
+        return record
+    return {key: value for key, value in record.items() if key in fields or key not in LISTING_FIELDS}
@@ -0,0 +1,69 @@
+from app.utils.loaders import bind_in_list
+
+MATCH_MODES = ('any', 'all')
+
+
+def list_arg(args, name):
+    """Repeated and/or comma-separated query values: ?cuisine=A&cuisine=B or ?cuisine=A,B"""
+    values = []
+    for raw in args.getlist(name):
+        values.extend(v.strip() for v in raw.split(',') if v.strip())
+    return list(dict.fromkeys(values))
+
+
+def parse_filters(args):
+    """
+    Listing filters shared by /api/restaurants, /search and /facets.
+    Values within city/cuisine/dining_type are OR'ed (cuisine_match=all makes a
+    restaurant need every listed cuisine); different filters are AND'ed.
+    Raises ValueError on bad input.
+    """
+    cuisine_match = args.get('cuisine_match', 'any') or 'any'
+    if cuisine_match not in MATCH_MODES:
+        raise ValueError(f"cuisine_match must be one of: {', '.join(MATCH_MODES)}")
+    max_price = args.get('max_price')
+    return {
+        'cities': list_arg(args, 'city'),
+        'cuisines': list_arg(args, 'cuisine'),
+        'cuisine_match': cuisine_match,
+        'dining_types': list_arg(args, 'dining_type'),
+        'min_rating': float(args.get('min_rating', 0) or 0),
+        'max_price': int(max_price) if max_price else None,
+    }
+
+
+def sql_predicates(filters):
+    """
+    ({facet: SQL predicate on RESTAURANTS r}, binds) for parse_filters() output.
+    Cuisines use EXISTS (any) or a counted subquery (all) instead of a join, so
+    the outer query never needs DISTINCT. List values are bound in sorted order
+    so equivalent filters produce the same SQL and binds (one cache entry).
+    """
+    predicates = {}
+    params = {}
+    if filters['cities']:
+        placeholders, binds = bind_in_list(sorted(filters['cities']), 'city')
+        predicates['city'] = f"r.city IN ({placeholders})"
+        params.update(binds)
+    if filters['cuisines']:
+        placeholders, binds = bind_in_list(sorted(filters['cuisines']), 'cuisine')
+        params.update(binds)
+        matches = f"""
+            FROM RESTAURANT_CATEGORIES rc
+            JOIN CATEGORIES c ON c.category_id = rc.category_id
+            WHERE rc.restaurant_id = r.restaurant_id AND c.category_name IN ({placeholders})"""
+        if filters['cuisine_match'] == 'all':
+            predicates['cuisine'] = f"(SELECT COUNT(DISTINCT c.category_name) {matches}) = :cuisine_count"
+            params['cuisine_count'] = len(filters['cuisines'])
+        else:
+            predicates['cuisine'] = f"EXISTS (SELECT 1 {matches})"
+    if filters['dining_types']:
+        placeholders, binds = bind_in_list(sorted(filters['dining_types']), 'dining')
+        predicates['dining_type'] = f"r.dining_type IN ({placeholders})"
+        params.update(binds)
+    predicates['rating'] = "r.avg_rating >= :min_rating"
+    params['min_rating'] = filters['min_rating']
+    if filters['max_price'] is not None:
+        predicates['price'] = "r.price_range <= :max_price"
+        params['max_price'] = filters['max_price']
+    return predicates, params
@@ -0,0 +1,46 @@
+from app.database import db
+
+# Oracle caps an IN-list at 1000 expressions; stay well below it
+IN_LIST_CHUNK = 500
+
+
+def bind_in_list(values, prefix='id'):
+    """Build an IN-list of named binds -> (':id0, :id1, ...', {'id0': v0, ...})"""
+    params = {f'{prefix}{i}': value for i, value in enumerate(values)}
+    placeholders = ', '.join(f':{name}' for name in params)
+    return placeholders, params
+
+
+def load_cuisines(restaurant_ids):
+    """
+    Fetch cuisines for many restaurants with one set-based query per chunk.
+    Returns: dict restaurant_id -> list of category names (missing ids map to []).
+    """
+    ids = list(dict.fromkeys(rid for rid in restaurant_ids if rid))
+    cuisines = {rid: [] for rid in ids}
+
+    for start in range(0, len(ids), IN_LIST_CHUNK):
+        chunk = ids[start:start + IN_LIST_CHUNK]
+        placeholders, params = bind_in_list(chunk, 'rid')
+        rows = db.execute_query(
+            f"""SELECT rc.restaurant_id, c.category_name
+                FROM RESTAURANT_CATEGORIES rc
+                JOIN CATEGORIES c ON c.category_id = rc.category_id
+                WHERE rc.restaurant_id IN ({placeholders})
+                ORDER BY rc.restaurant_id, c.category_name""",
+            params
+        )
+        if rows is None:
+            raise RuntimeError("Failed to load cuisines")
+        for row in rows:
+            cuisines.setdefault(row['restaurant_id'], []).append(row['category_name'])
+
+    return cuisines
+
+
+def attach_cuisines(items, key='restaurant_id', field='cuisines'):
+    """Attach a cuisine list to each dict in `items` in place, using one batched lookup."""
+    cuisines = load_cuisines(item[key] for item in items)
+    for item in items:
+        item[field] = cuisines.get(item[key], [])
+    return items
@@ -0,0 +1,195 @@
+import base64
+import json
+from datetime import datetime
+from app.utils.ranking import WEIGHTED_RATING_SQL
+
+_BY_ID = ('r.restaurant_id', False, 'restaurant_id')
+
+# Listing orders as (SQL expression, descending, row field) columns.
+# restaurant_id breaks ties so every row has exactly one position.
+SORT_ORDERS = {
+    'rating': (('r.avg_rating', True, 'avg_rating'), ('r.votes', True, 'votes'), _BY_ID),
+    'weighted': ((WEIGHTED_RATING_SQL, True, 'weighted_rating'), ('r.votes', True, 'votes'), _BY_ID),
+    'votes': (('r.votes', True, 'votes'), ('r.avg_rating', True, 'avg_rating'), _BY_ID),
+    'price_asc': (('NVL(r.price_range, 0)', False, 'price_range'), ('r.avg_rating', True, 'avg_rating'), _BY_ID),
+    'price_desc': (('NVL(r.price_range, 0)', True, 'price_range'), ('r.avg_rating', True, 'avg_rating'), _BY_ID),
+    # NVL: a NULL created_at counts as OLDEST (binds :oldest, see the SQL path's _sort_columns)
+    'newest': (('NVL(r.created_at, :oldest)', True, 'created_at'), _BY_ID),
+}
+
+# Review orders for /api/reviews/restaurant/<id> (same column shape)
+_BY_REVIEW = ('r.review_id', False, 'review_id')
+REVIEW_ORDERS = {
+    'newest': (('r.review_date', True, 'review_date'), _BY_REVIEW),
+    'helpful': (('r.helpful_count', True, 'helpful_count'), ('r.review_date', True, 'review_date'), _BY_REVIEW),
+}
+
+# Fields an order adds to each listed restaurant (the values its cursor needs)
+SORT_FIELDS = {'weighted': 'weighted_rating', 'newest': 'created_at'}
+
+# Where a NULL date sorts: as the oldest possible, i.e. last in newest-first
+# orders (the way NULL numbers count as 0)
+OLDEST = datetime.min
+
+
+def _number(value):
+    return float(value or 0)
+
+
+def _count(value):
+    return int(value or 0)
+
+
+def timestamp_text(value):
+    """DATE value -> 'YYYY-MM-DD HH:MM:SS' (sorts like the date; validates strings). NULL stays None."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(' ', 'seconds')
+    datetime.fromisoformat(value)  # validate
+    return value
+
+
+FIELD_TYPES = {
+    'avg_rating': _number,
+    'weighted_rating': _number,
+    'votes': _count,
+    'price_range': _count,
+    'created_at': timestamp_text,
+    'restaurant_id': str,
+    'review_date': timestamp_text,
+    'helpful_count': _count,
+    'review_id': str,
+}
+
+
+def order_by(sort, orders=SORT_ORDERS):
+    return "ORDER BY " + ', '.join(f"{sql} DESC" if desc else sql for sql, desc, _ in orders[sort])
+
+
+def seek_predicate(sort, orders=SORT_ORDERS):
+    """AND clause keeping rows after the cursor (binds :c0, :c1, ...) in `sort` order"""
+    columns = orders[sort]
+    branches = []
+    for i, (sql, desc, _) in enumerate(columns):
+        conds = [f"{columns[j][0]} = :c{j}" for j in range(i)]
+        conds.append(f"{sql} {'<' if desc else '>'} :c{i}")
+        branches.append(f"({' AND '.join(conds)})")
+    return "\n    AND (" + "\n         OR ".join(branches) + ")"
+
+
+RATING_ORDER_BY = order_by('rating')
+
+
+def sort_values(sort, row, orders=SORT_ORDERS):
+    """A row's values for the columns of `sort`, JSON-ready (NULL numbers count as 0)"""
+    return [FIELD_TYPES[field](row.get(field)) for _, _, field in orders[sort]]
+
+
+def _ascending(sort, values):
+    key = []
+    for (_, desc, field), value in zip(SORT_ORDERS[sort], values):
+        if field == 'created_at':
+            value = float('-inf') if value is None else datetime.fromisoformat(value).timestamp()
+        key.append(-value if desc else value)
+    return tuple(key)
+
+
+def sort_key(sort, row):
+    """Ascending Python sort key equivalent to order_by(sort)"""
+    return _ascending(sort, sort_values(sort, row))
+
+
+def encode_cursor(values):
+    """Encode a list of sort-key values into an opaque, URL-safe cursor"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def rating_cursor(row):
+    """Cursor pointing just after `row` in rating order"""
+    return encode_cursor(sort_values('rating', row))
+
+
+def relevance_cursor(row):
+    """Cursor pointing just after `row` in relevance order (score DESC, then rating order)"""
+    return encode_cursor([float(row['relevance'])] + sort_values('rating', row))
+
+
+def page_cursor(row, sort='rating'):
+    """
+    Cursor for the last row of a page, in whichever order produced it.
+    Rating and relevance cursors are bare value lists; other orders are
+    prefixed with the sort name so a cursor can't be replayed in another order.
+    """
+    if 'relevance' in row:
+        return relevance_cursor(row)
+    if sort in ('rating', 'relevance'):
+        return rating_cursor(row)
+    return encode_cursor([sort] + sort_values(sort, row))
+
+
+def _cursor_values(cursor, sort, orders=SORT_ORDERS):
+    """(order, typed values, relevance or None) for a cursor used with `sort`"""
+    values = decode_cursor(cursor)
+    relevance = None
+    if values and isinstance(values[0], str) and values[0] in orders:
+        if values[0] != sort:
+            raise ValueError('Cursor belongs to a different sort')
+        order, values = sort, values[1:]
+    elif orders is SORT_ORDERS and sort in ('rating', 'relevance'):
+        order = 'rating'
+        if len(values) == 4:
+            relevance, values = values[0], values[1:]
+    else:
+        raise ValueError('Invalid cursor')
+    columns = orders[order]
+    if len(values) != len(columns):
+        raise ValueError('Invalid cursor')
+    try:
+        typed = [FIELD_TYPES[field](value) for (_, _, field), value in zip(columns, values)]
+        relevance = float(relevance) if relevance is not None else None
+    except (TypeError, ValueError):
+        raise ValueError('Invalid cursor')
+    return order, typed, relevance
+
+
+def seek_key(cursor, sort='rating'):
+    """
+    Decode a cursor into the ascending sort key it points after (see
+    sort_key), prefixed by -relevance for relevance cursors. Raises ValueError
+    if malformed.
+    """
+    order, values, relevance = _cursor_values(cursor, sort)
+    key = _ascending(order, values)
+    return key if relevance is None else (-relevance,) + key
+
+
+def seek_params(cursor, sort='rating', orders=SORT_ORDERS):
+    """Bind params for seek_predicate(sort, orders) from an opaque cursor"""
+    order, values, relevance = _cursor_values(cursor, sort, orders)
+    if relevance is not None or order != sort:
+        raise ValueError('Invalid cursor')
+    params = {}
+    for i, ((_, _, field), value) in enumerate(zip(orders[sort], values)):
+        if FIELD_TYPES[field] is timestamp_text:
+            value = OLDEST if value is None else datetime.fromisoformat(value)
+        params[f'c{i}'] = value
+    return params
+
+
+def review_cursor(row, sort):
+    """Cursor just after review `row` in REVIEW_ORDERS[sort] order (prefixed with the sort name)"""
+    return encode_cursor([sort] + sort_values(sort, row, REVIEW_ORDERS))
@@ -0,0 +1,35 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+# Bayesian average: a restaurant's rating is pulled towards the overall mean
+# rating as if it had PRIOR_VOTES extra votes at that mean, so one 5.0 vote no
+# longer outranks a thousand votes averaging 4.9.
+PRIOR_VOTES = 25
+
+FOUR_PLACES = Decimal('0.0001')
+
+WEIGHTED_RATING_SQL = "ROUND((r.votes * r.avg_rating + :w_prior * :w_mean) / (r.votes + :w_prior), 4)"
+
+# Mean of all individual ratings (each restaurant's average weighted by its votes)
+MEAN_RATING_SQL = "SELECT SUM(avg_rating * votes) / NULLIF(SUM(votes), 0) FROM RESTAURANTS"
+
+
+def mean_rating(records):
+    """Vote-weighted mean of avg_rating over restaurant records, as MEAN_RATING_SQL computes it"""
+    votes = sum(rec['votes'] for rec in records)
+    if not votes:
+        return 0.0
+    return round(sum(rec['avg_rating'] * rec['votes'] for rec in records) / votes, 4)
+
+
+def weighted_rating(avg_rating, votes, mean, prior=PRIOR_VOTES):
+    """WEIGHTED_RATING_SQL in decimal arithmetic, rounded half-up like Oracle's NUMBER ROUND"""
+    avg_rating, mean = Decimal(repr(avg_rating)), Decimal(repr(mean))
+    value = (votes * avg_rating + prior * mean) / (votes + prior)
+    return float(value.quantize(FOUR_PLACES, rounding=ROUND_HALF_UP))
+
+
+def weighting_params(database):
+    """Binds for WEIGHTED_RATING_SQL; the mean comes from the query result cache"""
+    row = database.execute_query(MEAN_RATING_SQL, fetch_one=True, row_format='tuple', cache_ttl=300)
+    mean = round(float(row[0]), 4) if row and row[0] is not None else 0.0
+    return {'w_prior': PRIOR_VOTES, 'w_mean': mean}
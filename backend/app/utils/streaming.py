@@ -0,0 +1,91 @@
+from itertools import chain
+from flask import Response, current_app, jsonify, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson():
+    """NDJSON when asked for via ?format=ndjson or an Accept header that prefers it"""
+    if request.args.get('format') == 'ndjson':
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def _peek(rows):
+    """
+    Pull the first row so query errors surface before any bytes are sent.
+    Returns an iterator equivalent to `rows`.
+    """
+    rows = iter(rows)
+    try:
+        first = next(rows)
+    except StopIteration:
+        return iter(())
+    return chain((first,), rows)
+
+
+def _json_array(rows, serialize):
+    dumps = current_app.json.dumps
+    yield '['
+    for i, row in enumerate(rows):
+        yield (',' if i else '') + dumps(serialize(row))
+    yield ']'
+
+
+def _ndjson_lines(rows, serialize, extra=None):
+    dumps = current_app.json.dumps
+    for row in rows:
+        item = serialize(row)
+        if extra:
+            item = {**extra, **item}
+        yield dumps(item) + '\n'
+
+
+def stream_rows(rows, serialize):
+    """
+    Stream `rows` (e.g. from db.stream_query) as a chunked JSON array, or as
+    NDJSON when the client asks for it. Each row is serialized as it is fetched.
+    """
+    try:
+        rows = _peek(rows)
+    except Exception as e:
+        return jsonify({'error': 'Database query failed', 'message': str(e)}), 500
+
+    if wants_ndjson():
+        body = _ndjson_lines(rows, serialize)
+        mimetype = NDJSON_MIMETYPE
+    else:
+        body = _json_array(rows, serialize)
+        mimetype = 'application/json'
+    return Response(stream_with_context(body), mimetype=mimetype)
+
+
+def stream_sections(sections):
+    """
+    Stream several row sources as one JSON object of arrays:
+        {"<key>": [...], "<key>": [...]}
+    `sections` is a list of (key, rows, serialize). Sources are consumed one
+    after another, so only one query is open at a time. In NDJSON mode each
+    line carries a "type" field naming its section.
+    """
+    try:
+        key, rows, serialize = sections[0]
+        sections = [(key, _peek(rows), serialize)] + list(sections[1:])
+    except Exception as e:
+        return jsonify({'error': 'Database query failed', 'message': str(e)}), 500
+
+    if wants_ndjson():
+        def body():
+            for key, rows, serialize in sections:
+                yield from _ndjson_lines(rows, serialize, {'type': key})
+        return Response(stream_with_context(body()), mimetype=NDJSON_MIMETYPE)
+
+    def body():
+        dumps = current_app.json.dumps
+        yield '{'
+        for i, (key, rows, serialize) in enumerate(sections):
+            yield (',' if i else '') + dumps(key) + ':'
+            yield from _json_array(rows, serialize)
+        yield '}'
+    return Response(stream_with_context(body()), mimetype='application/json')
@@ -0,0 +1,141 @@
+import threading
+from app.utils.trigram import normalize
+
+# Entries kept per trie node; the most a single suggest call can return
+TOP_K = 10
+
+
+class _Node:
+    __slots__ = ('children', 'entries', 'top')
+
+    def __init__(self):
+        self.children = {}   # char -> _Node
+        self.entries = set() # rank keys of entries whose indexed text ends here
+        self.top = []        # best TOP_K rank keys in this subtree, ascending
+
+
+class PrefixTrie:
+    """
+    Prefix index for autocomplete. Every word start of an entry's label is
+    indexed ("Domino's Pizza" is found by "dom" and by "piz"), and each node
+    caches the TOP_K best entries of its subtree, so a lookup is a walk down
+    the prefix plus a copy of one short list.
+
+    Entries are ranked by a sort key supplied by the caller (lower is better);
+    the key's last element must be the entry id. put()/remove() fix up only
+    the nodes on the entry's paths, recomputing each node's top list from its
+    children's lists, so updates stay cheap and removals never leave gaps.
+    Readers don't lock: each node's list is replaced atomically.
+    """
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.root = _Node()
+        self.ranks = {}      # entry id -> rank key
+        self.payloads = {}   # entry id -> what suggest returns
+        self.labels = {}     # entry id -> label it is indexed under
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ranks)
+
+    @staticmethod
+    def _keys(label):
+        words = normalize(label).split()
+        return {' '.join(words[i:]) for i in range(len(words))}
+
+    @classmethod
+    def build(cls, items, k=TOP_K):
+        """Bulk-load (entry_id, label, rank, payload) items, computing top lists once"""
+        trie = cls(k)
+        for entry_id, label, rank, payload in items:
+            trie.ranks[entry_id] = rank
+            trie.payloads[entry_id] = payload
+            trie.labels[entry_id] = label
+            for key in cls._keys(label):
+                node = trie.root
+                for ch in key:
+                    node = node.children.setdefault(ch, _Node())
+                node.entries.add(rank)
+        trie._fix_subtree(trie.root)
+        return trie
+
+    def _fix_subtree(self, node):
+        # Iterative post-order: children's lists are final before their parent's
+        stack = [(node, False)]
+        while stack:
+            current, done = stack.pop()
+            if done:
+                self._fix([current])
+                continue
+            stack.append((current, True))
+            stack.extend((child, False) for child in current.children.values())
+
+    def put(self, entry_id, label, rank, payload):
+        """Insert or update an entry; `rank` is its sort key (ending with entry_id)"""
+        with self._lock:
+            self._remove(entry_id)
+            self.ranks[entry_id] = rank
+            self.payloads[entry_id] = payload
+            self.labels[entry_id] = label
+            for key in self._keys(label):
+                path = [self.root]
+                node = self.root
+                for ch in key:
+                    node = node.children.setdefault(ch, _Node())
+                    path.append(node)
+                node.entries.add(rank)
+                self._fix(path)
+
+    def remove(self, entry_id):
+        with self._lock:
+            self._remove(entry_id)
+
+    def _remove(self, entry_id):
+        rank = self.ranks.pop(entry_id, None)
+        if rank is None:
+            return
+        label = self.labels.pop(entry_id)
+        self.payloads.pop(entry_id, None)
+        for key in self._keys(label):
+            path = [self.root]
+            node = self.root
+            for ch in key:
+                node = node.children.get(ch)
+                if node is None:
+                    break
+                path.append(node)
+            else:
+                node.entries.discard(rank)
+                # Drop branches that no longer lead anywhere
+                for depth in range(len(key), 0, -1):
+                    child = path[depth]
+                    if child.entries or child.children:
+                        break
+                    del path[depth - 1].children[key[depth - 1]]
+                    path.pop()
+                self._fix(path)
+
+    def _fix(self, path):
+        """Recompute top lists bottom-up along a root..node path"""
+        k = self.k
+        for node in reversed(path):
+            candidates = set(node.entries)
+            for child in node.children.values():
+                candidates.update(child.top)
+            # An entry indexed under several words reaches a node more than once
+            node.top = sorted(candidates)[:k]
+
+    def suggest(self, prefix, limit=TOP_K):
+        """Payloads of the best `limit` entries with a word starting with `prefix`"""
+        node = self.root
+        for ch in normalize(prefix):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        results = []
+        for rank in node.top[:limit]:
+            payload = self.payloads.get(rank[-1])
+            if payload is not None:
+                results.append(payload)
+        return results
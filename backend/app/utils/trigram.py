@@ -0,0 +1,133 @@
+import re
+import unicodedata
+
+# Fuzzy matches need at least this share of the query's trigrams
+MIN_SIMILARITY = 0.5
+
+_APOSTROPHES = re.compile(r"['’`]")
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(text):
+    """Lowercase, strip accents and apostrophes, collapse everything else to single spaces"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = _APOSTROPHES.sub('', text)
+    return _NON_WORD.sub(' ', text).strip()
+
+
+def trigrams(normalized):
+    """
+    Trigrams of each word, padded like pg_trgm ('  w', ' wo', ..., 'rd '), so
+    word starts/ends count and short words still produce trigrams.
+    """
+    grams = set()
+    for word in normalized.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def score_text(query, text, query_grams, text_grams):
+    """
+    Relevance of `text` for `query` (both normalized):
+      2.0   equal
+      1.5   text starts with the query
+      1.25  a word of text starts with the query
+      1.0   query occurs anywhere in text (what LIKE '%q%' matches)
+      <1.0  share of query trigrams found in text (typos, reordered words)
+    """
+    if query == text:
+        return 2.0
+    pos = text.find(query)
+    if pos == 0:
+        return 1.5
+    if pos > 0:
+        return 1.25 if text[pos - 1] == ' ' else 1.0
+    if not query_grams:
+        return 0.0
+    return min(len(query_grams & text_grams) / len(query_grams), 0.99)
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigram -> document ids over one short text field.
+
+    search() gathers candidates from the posting lists of the query's
+    trigrams, so it only touches documents sharing at least one trigram, and
+    ranks them with score_text(). Documents are added/replaced/removed one at
+    a time; copy() gives an independent index for copy-on-write snapshots.
+    """
+
+    def __init__(self):
+        self.texts = {}      # doc id -> normalized text
+        self.grams = {}      # doc id -> set of trigrams
+        self.postings = {}   # trigram -> set of doc ids
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, doc_id, text):
+        self.remove(doc_id)
+        normalized = normalize(text)
+        grams = trigrams(normalized)
+        self.texts[doc_id] = normalized
+        self.grams[doc_id] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id):
+        grams = self.grams.pop(doc_id, None)
+        self.texts.pop(doc_id, None)
+        if not grams:
+            return
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[gram]
+
+    def copy(self):
+        new = TrigramIndex()
+        new.texts = dict(self.texts)
+        new.grams = dict(self.grams)
+        new.postings = {gram: set(ids) for gram, ids in self.postings.items()}
+        return new
+
+    def search(self, query, min_similarity=MIN_SIMILARITY):
+        """Return {doc_id: score} for documents matching `query` (score >= min_similarity)"""
+        query = normalize(query)
+        if not query:
+            return {}
+        query_grams = trigrams(query)
+        texts = self.texts
+
+        if len(query.replace(' ', '')) < 3:
+            # Too short for meaningful trigrams: plain substring match
+            scores = {}
+            for doc_id, text in texts.items():
+                score = score_text(query, text, None, None)
+                if score:
+                    scores[doc_id] = score
+            return scores
+
+        counts = {}
+        for gram in query_grams:
+            for doc_id in self.postings.get(gram, ()):
+                counts[doc_id] = counts.get(doc_id, 0) + 1
+
+        # A doc sharing fewer trigrams than this can neither contain the query
+        # nor reach min_similarity
+        inner = {g for g in query_grams if ' ' not in g}
+        needed = min(len(inner), int(min_similarity * len(query_grams) + 0.999999)) if inner else 1
+        scores = {}
+        for doc_id, count in counts.items():
+            if count < needed:
+                continue
+            score = score_text(query, texts[doc_id], query_grams, self.grams[doc_id])
+            if score >= min_similarity:
+                scores[doc_id] = score
+        return scores
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Response benchmark: bytes on the wire and CPU per /api/restaurants?limit=100 page
+
+Serializes a listing page shaped like /api/restaurants?limit=100 with Flask's
+stdlib JSON provider and with the orjson provider, then compresses each body
+with gzip (and brotli when installed) at the configured levels.
+No database connection is needed.
+
+    python benchmarks/bench_responses.py
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app import compression, json_provider  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.utils.pagination import encode_cursor  # noqa: E402
+
+LIMIT = 100
+REPEAT = 200
+
+CITIES = ['Bangalore', 'Mumbai', 'New Delhi', 'Pune', 'Kolkata', 'Chennai', 'Dehradun']
+CUISINES = ['North Indian', 'Chinese', 'Cafe', 'South Indian', 'Biryani', 'Desserts', 'Fast Food']
+
+
+def make_page(limit=LIMIT):
+    created = datetime(2024, 1, 1)
+    restaurants = []
+    for i in range(limit):
+        restaurants.append({
+            'restaurant_id': f'R{i:05d}',
+            'name': f'Restaurant number {i}',
+            'address': f'{i} Main Road, Sector {i % 40}',
+            'city': CITIES[i % len(CITIES)],
+            'region': f'Area {i % 25}',
+            'phone_number': f'+91 98{i:08d}',
+            'website_url': f'https://www.example.com/restaurants/r{i:05d}',
+            'avg_rating': round(4.9 - i * 0.01, 1),
+            'price_range': 200 + (i % 12) * 100,
+            'dining_type': 'Dining' if i % 3 else 'Delivery',
+            'timings': '11am to 11pm (Mon-Sun)',
+            'votes': 5000 - i * 37,
+            'rating_type': 'Very Good',
+            'cuisines': CUISINES[i % 4:i % 4 + 3],
+            'created_at': created + timedelta(hours=i),
+        })
+    last = restaurants[-1]
+    return {
+        'restaurants': restaurants,
+        'count': limit,
+        'total': 9000,
+        'total_is_estimate': False,
+        'offset': 0,
+        'limit': limit,
+        'has_more': True,
+        'next_cursor': encode_cursor([last['avg_rating'], last['votes'], last['restaurant_id']]),
+        'sort': 'rating',
+    }
+
+
+def make_app(provider_class):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.json = provider_class(app)
+    return app
+
+
+def cpu_ms(fn):
+    fn()
+    start = time.process_time()
+    for _ in range(REPEAT):
+        fn()
+    return (time.process_time() - start) * 1000 / REPEAT
+
+
+def main():
+    page = make_page()
+    providers = [('stdlib json', DefaultJSONProvider)]
+    if json_provider.orjson is not None:
+        providers.append(('orjson', json_provider.ORJSONProvider))
+    else:
+        print("orjson not installed: showing the stdlib provider only\n")
+    encodings = ['identity'] + list(reversed(compression._encodings()))
+    config = {
+        'COMPRESS_GZIP_LEVEL': Config.COMPRESS_GZIP_LEVEL,
+        'COMPRESS_BROTLI_QUALITY': Config.COMPRESS_BROTLI_QUALITY,
+    }
+
+    print(f"{'provider':<14} {'encoding':<10} {'bytes':>8} {'encode ms':>10} {'compress ms':>12} {'total ms':>9}")
+    for name, provider_class in providers:
+        app = make_app(provider_class)
+        with app.app_context():
+            def encode():
+                return app.json.response(page).get_data()
+
+            body = encode()
+            encode_ms = cpu_ms(encode)
+            for encoding in encodings:
+                if encoding == 'identity':
+                    size, compress_ms = len(body), 0.0
+                else:
+                    size = len(compression._compress(body, encoding, config))
+                    compress_ms = cpu_ms(lambda: compression._compress(body, encoding, config))
+                print(f"{name:<14} {encoding:<10} {size:>8} {encode_ms:>10.3f} {compress_ms:>12.3f} "
+                      f"{encode_ms + compress_ms:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
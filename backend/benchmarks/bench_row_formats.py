@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Row shaping benchmark: allocations and time per 1,000 rows
+
+Compares the original per-cell dict builder (with hasattr(value, 'read') on
+every value) against Database._shape_rows in 'dict', 'tuple' and 'columns'
+modes, using a fake cursor shaped like the /api/restaurants page query.
+No database connection is needed.
+
+    python benchmarks/bench_row_formats.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.database import Database  # noqa: E402
+
+ROWS = 1000
+REPEAT = 20
+
+COLUMNS = [
+    'RESTAURANT_ID', 'NAME', 'ADDRESS', 'CITY', 'REGION', 'PHONE_NUMBER',
+    'WEBSITE_URL', 'AVG_RATING', 'PRICE_RANGE', 'DINING_TYPE', 'TIMINGS',
+    'VOTES', 'RATING_TYPE'
+]
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.description = [(name, None, None, None, None, None, True) for name in COLUMNS]
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+def make_rows(n):
+    return [
+        (
+            f'R{i:04d}', f'Restaurant {i}', f'Region {i % 40}', 'Dehradun', f'Region {i % 40}',
+            '+91-9634123456', f'https://www.zomato.com/dehradun/restaurant-{i}', 4.2,
+            500 + i % 1500, 'Casual Dining', '10am to 10pm', i % 1200, 'Very Good'
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_dict_from_cursor(cursor):
+    """The original Database._dict_from_cursor, kept here as the baseline"""
+    cols = []
+    if cursor.description:
+        cols = [d[0].lower() for d in cursor.description]
+    rows = cursor.fetchall()
+    if not cols:
+        return rows
+    result = []
+    for row in rows:
+        row_dict = {}
+        for i, col in enumerate(cols):
+            value = row[i]
+            if hasattr(value, 'read'):
+                try:
+                    value = value.read()
+                except Exception:
+                    value = str(value)
+            row_dict[col] = value
+        result.append(row_dict)
+    return result
+
+
+def measure(label, fn, cursor):
+    # Allocation count/size for a single run, per 1,000 rows
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn(cursor)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+    size = sum(s.size_diff for s in stats if s.size_diff > 0)
+    del result
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(cursor)
+    elapsed = (time.perf_counter() - start) / REPEAT
+
+    scale = 1000 / ROWS
+    print(f"{label:<22} {blocks * scale:>10,.0f} {size * scale / 1024:>10,.1f} {elapsed * 1000 * scale:>10.3f}")
+
+
+def main():
+    db = Database()
+    cursor = FakeCursor(make_rows(ROWS))
+
+    print(f"{'mode':<22} {'allocs/1k':>10} {'KiB/1k':>10} {'ms/1k':>10}")
+    measure('legacy dict (before)', legacy_dict_from_cursor, cursor)
+    measure('dict', lambda c: db._shape_rows(c, c.fetchall(), 'dict'), cursor)
+    measure('tuple', lambda c: db._shape_rows(c, c.fetchall(), 'tuple'), cursor)
+    measure('columns', lambda c: db._shape_rows(c, c.fetchall(), 'columns'), cursor)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,8 +11,9 @@ import oracledb
 # ================================
 # ORACLE CLIENT (THICK MODE) - 11g
 # ================================
+# Initialized in main() so the CSV helpers below can be imported by
+# seed_sqlite.py without an Oracle client installed
 INSTANT_CLIENT_DIR = r"C:\Users\sonal\OneDrive\Desktop\PBL_5TH SEM\instantclient_19_28"
-oracledb.init_oracle_client(lib_dir=INSTANT_CLIENT_DIR)
 
 # ================================
 # DATABASE CONNECTION
@@ -358,6 +359,8 @@ def main():
     print("   DINEWISE DATABASE - HYBRID DATA IMPORT")
     print("=" * 60)
 
+    oracledb.init_oracle_client(lib_dir=INSTANT_CLIENT_DIR)
+
     try:
         connection = oracledb.connect(**DB_CONFIG)
         print("\n✅ Connected to Oracle!")
@@ -387,12 +390,21 @@ def main():
         cursor.execute("""
             MERGE INTO SYSTEM.RESTAURANTS r
             USING (
-                SELECT restaurant_id, ROUND(AVG(rating_value), 1) avg_rating
+                SELECT restaurant_id, ROUND(AVG(rating_value), 1) avg_rating,
+                       SUM(rating_value) rating_sum, COUNT(*) rating_count
                 FROM SYSTEM.RATINGS
                 GROUP BY restaurant_id
             ) x
             ON (r.restaurant_id = x.restaurant_id)
-            WHEN MATCHED THEN UPDATE SET r.avg_rating = x.avg_rating
+            WHEN MATCHED THEN UPDATE SET r.avg_rating = x.avg_rating,
+                r.rating_sum = x.rating_sum, r.rating_count = x.rating_count
+        """)
+        cursor.execute("DELETE FROM SYSTEM.RATING_HISTOGRAM")
+        cursor.execute("""
+            INSERT INTO SYSTEM.RATING_HISTOGRAM (restaurant_id, bin, rating_count)
+            SELECT restaurant_id, ROUND(rating_value * 2) / 2, COUNT(*)
+            FROM SYSTEM.RATINGS
+            GROUP BY restaurant_id, ROUND(rating_value * 2) / 2
         """)
         connection.commit()
         print("✅ Average ratings recalculated!")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Check (and repair) the running rating aggregates on RESTAURANTS
+
+rating_sum/rating_count and the RATING_HISTOGRAM bins are maintained by
+delta in the RATINGS triggers. This compares them with a full aggregate of
+RATINGS and recounts the restaurants that drifted. The API runs the same
+check at startup and every RATING_RECONCILE_SECONDS; use this for cron,
+after bulk loads or to inspect.
+
+    python database/reconcile_ratings.py             # report and repair
+    python database/reconcile_ratings.py --dry-run   # report only
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.aggregates import RatingReconciler  # noqa: E402
+from app.database import db  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile RESTAURANTS rating aggregates with RATINGS")
+    parser.add_argument('--dry-run', action='store_true', help="Report drift without repairing it")
+    args = parser.parse_args()
+
+    if not db.connect():
+        sys.exit("❌ Database connection failed")
+    result = RatingReconciler(db).run(fix=not args.dry_run)
+    if result is None:
+        sys.exit(1)
+    drift, histogram_drift = result
+
+    for row in drift[:50]:
+        print(f"{row['restaurant_id']:>12}  sum {row['rating_sum']} -> {row['actual_sum']}  "
+              f"count {row['rating_count']} -> {row['actual_count']}  avg {row['avg_rating']}")
+    if len(drift) > 50:
+        print(f"... and {len(drift) - 50} more")
+    action = "found" if args.dry_run else "repaired"
+    print(f"\n{len(drift)} restaurants with drifted rating aggregates {action}")
+    print(f"{len(histogram_drift)} restaurants with drifted rating histograms {action}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,10 @@
 -- ============================================
 -- DROP TABLES (if exist)
 -- ============================================
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE HELPFUL_VOTES CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE RATING_HISTOGRAM CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
+/
 BEGIN EXECUTE IMMEDIATE 'DROP TABLE REVIEWS CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
 /
 BEGIN EXECUTE IMMEDIATE 'DROP TABLE RATINGS CASCADE CONSTRAINTS'; EXCEPTION WHEN OTHERS THEN NULL; END;
@@ -70,7 +74,10 @@ CREATE TABLE RESTAURANTS (
     timings VARCHAR2(100),
     votes NUMBER(10,0) DEFAULT 0,
     rating_type VARCHAR2(50),
-    created_at DATE DEFAULT SYSDATE
+    created_at DATE DEFAULT SYSDATE,
+    -- Running SUM/COUNT of RATINGS.rating_value, kept by trg_update_avg_rating
+    rating_sum NUMBER(12,1) DEFAULT 0 NOT NULL,
+    rating_count NUMBER(10,0) DEFAULT 0 NOT NULL
 );
 
 -- ============================================
@@ -103,7 +110,21 @@ CREATE TABLE REVIEWS (
     review_date DATE DEFAULT SYSDATE NOT NULL,
     helpful_count NUMBER(10,0) DEFAULT 0,
     FOREIGN KEY (user_id) REFERENCES USERS(user_id) ON DELETE CASCADE,
-    FOREIGN KEY (restaurant_id) REFERENCES RESTAURANTS(restaurant_id) ON DELETE CASCADE
+    FOREIGN KEY (restaurant_id) REFERENCES RESTAURANTS(restaurant_id) ON DELETE CASCADE,
+    CONSTRAINT uq_review_user_restaurant UNIQUE (user_id, restaurant_id)
+);
+
+-- ============================================
+-- HELPFUL_VOTES TABLE (one row per user per review marked helpful)
+-- ============================================
+CREATE TABLE HELPFUL_VOTES (
+    review_id VARCHAR2(36) NOT NULL,
+    user_id VARCHAR2(36) NOT NULL,
+    voted_at DATE DEFAULT SYSDATE NOT NULL,
+    flush_id VARCHAR2(32),
+    CONSTRAINT pk_helpful_votes PRIMARY KEY (review_id, user_id),
+    FOREIGN KEY (review_id) REFERENCES REVIEWS(review_id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES USERS(user_id) ON DELETE CASCADE
 );
 
 -- ============================================
@@ -120,15 +141,33 @@ CREATE TABLE RATINGS (
     UNIQUE (user_id, restaurant_id)
 );
 
+-- ============================================
+-- RATING_HISTOGRAM TABLE (ratings per restaurant per half-star bin, kept by trg_update_avg_rating)
+-- ============================================
+CREATE TABLE RATING_HISTOGRAM (
+    restaurant_id VARCHAR2(36) NOT NULL,
+    bin NUMBER(2,1) NOT NULL,
+    rating_count NUMBER(10,0) DEFAULT 0 NOT NULL,
+    CONSTRAINT pk_rating_histogram PRIMARY KEY (restaurant_id, bin),
+    FOREIGN KEY (restaurant_id) REFERENCES RESTAURANTS(restaurant_id) ON DELETE CASCADE
+);
+
 -- ============================================
 -- INDEXES (no duplicates)
 -- ============================================
 CREATE INDEX idx_restaurant_city ON RESTAURANTS(city);
 CREATE INDEX idx_restaurant_rating ON RESTAURANTS(avg_rating);
 CREATE INDEX idx_restaurant_name ON RESTAURANTS(name);
+-- Matches the listing order so keyset pages seek instead of sorting/skipping
+CREATE INDEX idx_restaurant_rank ON RESTAURANTS(avg_rating DESC, votes DESC, restaurant_id);
 
-CREATE INDEX idx_review_restaurant ON REVIEWS(restaurant_id);
-CREATE INDEX idx_review_user ON REVIEWS(user_id);
+-- Match the review page orders (newest / most helpful) for keyset pagination
+CREATE INDEX idx_review_restaurant ON REVIEWS(restaurant_id, review_date DESC, review_id);
+CREATE INDEX idx_review_helpful ON REVIEWS(restaurant_id, helpful_count DESC, review_date DESC, review_id);
+-- idx_review_user is covered by uq_review_user_restaurant (user_id first)
+
+-- The votes one ledger flush stored, counted into REVIEWS.helpful_count
+CREATE INDEX idx_helpful_vote_flush ON HELPFUL_VOTES(flush_id);
 
 CREATE INDEX idx_rating_restaurant ON RATINGS(restaurant_id);
 CREATE INDEX idx_rating_user ON RATINGS(user_id);
@@ -136,49 +175,41 @@ CREATE INDEX idx_rating_user ON RATINGS(user_id);
 -- DO NOT ADD: idx_category_name (unique index already created by UNIQUE constraint)
 
 -- ============================================
--- COMPOUND TRIGGER (fixes mutating table error)
+-- RATING AGGREGATE TRIGGER
 -- ============================================
+-- Applies each rating change to RESTAURANTS.rating_sum/rating_count as a
+-- delta and derives avg_rating and votes from them, and moves the rating's
+-- half-star RATING_HISTOGRAM bin by one, so a write costs the same however
+-- many ratings the restaurant has. The trigger never reads RATINGS, so a
+-- row-level trigger is safe from ORA-04091 (mutating table). The RESTAURANTS
+-- update locks the restaurant row first, which serializes concurrent MERGEs
+-- into the same bin.
 CREATE OR REPLACE TRIGGER trg_update_avg_rating
-FOR INSERT OR UPDATE OR DELETE ON ratings
-COMPOUND TRIGGER
-
-    TYPE t_rest_list IS TABLE OF ratings.restaurant_id%TYPE;
-    g_rest_ids t_rest_list := t_rest_list();
+AFTER INSERT OR DELETE OR UPDATE OF rating_value, restaurant_id ON ratings
+FOR EACH ROW
+DECLARE
+    PROCEDURE apply_delta(p_rest_id VARCHAR2, p_value NUMBER, p_count NUMBER) IS
+    BEGIN
+        UPDATE restaurants
+        SET rating_sum = rating_sum + p_value * p_count,
+            rating_count = rating_count + p_count,
+            avg_rating = NVL(ROUND((rating_sum + p_value * p_count) / NULLIF(rating_count + p_count, 0), 1), 0),
+            votes = rating_count + p_count
+        WHERE restaurant_id = p_rest_id;
 
-AFTER EACH ROW IS
+        MERGE INTO rating_histogram h
+        USING DUAL ON (h.restaurant_id = p_rest_id AND h.bin = ROUND(p_value * 2) / 2)
+        WHEN MATCHED THEN UPDATE SET h.rating_count = h.rating_count + p_count
+        WHEN NOT MATCHED THEN INSERT (restaurant_id, bin, rating_count)
+            VALUES (p_rest_id, ROUND(p_value * 2) / 2, p_count);
+    END apply_delta;
 BEGIN
-    IF INSERTING THEN
-        g_rest_ids.EXTEND;
-        g_rest_ids(g_rest_ids.LAST) := :NEW.restaurant_id;
-
-    ELSIF UPDATING THEN
-        g_rest_ids.EXTEND;
-        g_rest_ids(g_rest_ids.LAST) := :NEW.restaurant_id;
-
-    ELSIF DELETING THEN
-        g_rest_ids.EXTEND;
-        g_rest_ids(g_rest_ids.LAST) := :OLD.restaurant_id;
+    IF DELETING OR UPDATING THEN
+        apply_delta(:OLD.restaurant_id, :OLD.rating_value, -1);
+    END IF;
+    IF INSERTING OR UPDATING THEN
+        apply_delta(:NEW.restaurant_id, :NEW.rating_value, 1);
     END IF;
-END AFTER EACH ROW;
-
-AFTER STATEMENT IS
-BEGIN
-    DECLARE v_rest_id VARCHAR2(36);
-    BEGIN
-        FOR i IN 1 .. g_rest_ids.COUNT LOOP
-            v_rest_id := g_rest_ids(i);
-
-            UPDATE restaurants r
-            SET (avg_rating, votes) =
-                ( SELECT NVL(ROUND(AVG(rating_value), 1), 0),
-                         COUNT(*)
-                  FROM ratings
-                  WHERE restaurant_id = v_rest_id )
-            WHERE r.restaurant_id = v_rest_id;
-        END LOOP;
-    END;
-END AFTER STATEMENT;
-
 END trg_update_avg_rating;
 /
 
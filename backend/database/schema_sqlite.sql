@@ -0,0 +1,236 @@
+-- ============================================
+-- DINEWISE DATABASE SCHEMA (SQLite, for local runs and benchmarks)
+-- Mirrors schema_final.sql: same tables, constraints, indexes and
+-- avg-rating trigger semantics. Stored procedures have no SQLite
+-- equivalent and are not used by the API.
+-- ============================================
+
+PRAGMA foreign_keys = ON;
+
+-- Oracle's one-row table, so "SELECT ... FROM DUAL" runs unchanged
+CREATE TABLE IF NOT EXISTS DUAL (dummy TEXT);
+INSERT INTO DUAL (dummy) SELECT 'X' WHERE NOT EXISTS (SELECT 1 FROM DUAL);
+
+-- ============================================
+-- USERS TABLE
+-- ============================================
+CREATE TABLE USERS (
+    user_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    registration_date DATE DEFAULT (datetime('now', 'localtime')) NOT NULL,
+    role TEXT DEFAULT 'user' CHECK (role IN ('user', 'admin'))
+);
+
+-- ============================================
+-- RESTAURANTS TABLE
+-- ============================================
+CREATE TABLE RESTAURANTS (
+    restaurant_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    address TEXT NOT NULL,
+    city TEXT NOT NULL CHECK (city IN ('Dehradun', 'Haridwar', 'Mussoorie', 'Rishikesh')),
+    region TEXT,
+    phone_number TEXT,
+    website_url TEXT,
+    avg_rating REAL DEFAULT 0 CHECK (avg_rating BETWEEN 0 AND 5),
+    price_range INTEGER,
+    dining_type TEXT,
+    timings TEXT,
+    votes INTEGER DEFAULT 0,
+    rating_type TEXT,
+    created_at DATE DEFAULT (datetime('now', 'localtime')),
+    -- Running SUM/COUNT of RATINGS.rating_value, kept by the trg_rating_* triggers
+    rating_sum REAL DEFAULT 0 NOT NULL,
+    rating_count INTEGER DEFAULT 0 NOT NULL
+);
+
+-- ============================================
+-- CATEGORIES TABLE
+-- ============================================
+CREATE TABLE CATEGORIES (
+    category_id TEXT PRIMARY KEY,
+    category_name TEXT NOT NULL UNIQUE
+);
+
+-- ============================================
+-- RESTAURANT_CATEGORIES (Many-to-Many)
+-- ============================================
+CREATE TABLE RESTAURANT_CATEGORIES (
+    restaurant_id TEXT,
+    category_id TEXT,
+    PRIMARY KEY (restaurant_id, category_id),
+    FOREIGN KEY (restaurant_id) REFERENCES RESTAURANTS(restaurant_id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES CATEGORIES(category_id) ON DELETE CASCADE
+);
+
+-- ============================================
+-- REVIEWS TABLE
+-- ============================================
+CREATE TABLE REVIEWS (
+    review_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    restaurant_id TEXT NOT NULL,
+    review_text TEXT NOT NULL,
+    review_date DATE DEFAULT (datetime('now', 'localtime')) NOT NULL,
+    helpful_count INTEGER DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES USERS(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (restaurant_id) REFERENCES RESTAURANTS(restaurant_id) ON DELETE CASCADE
+);
+
+-- ============================================
+-- HELPFUL_VOTES TABLE (one row per user per review marked helpful)
+-- ============================================
+CREATE TABLE HELPFUL_VOTES (
+    review_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    voted_at DATE DEFAULT (datetime('now', 'localtime')) NOT NULL,
+    flush_id TEXT,
+    CONSTRAINT pk_helpful_votes PRIMARY KEY (review_id, user_id),
+    FOREIGN KEY (review_id) REFERENCES REVIEWS(review_id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES USERS(user_id) ON DELETE CASCADE
+);
+
+-- ============================================
+-- RATINGS TABLE
+-- ============================================
+CREATE TABLE RATINGS (
+    rating_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    restaurant_id TEXT NOT NULL,
+    rating_value REAL NOT NULL CHECK (rating_value BETWEEN 1 AND 5),
+    rating_date DATE DEFAULT (datetime('now', 'localtime')) NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES USERS(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (restaurant_id) REFERENCES RESTAURANTS(restaurant_id) ON DELETE CASCADE,
+    UNIQUE (user_id, restaurant_id)
+);
+
+-- ============================================
+-- RATING_HISTOGRAM TABLE (ratings per restaurant per half-star bin, kept by the trg_rating_* triggers)
+-- ============================================
+CREATE TABLE RATING_HISTOGRAM (
+    restaurant_id TEXT NOT NULL,
+    bin REAL NOT NULL,
+    rating_count INTEGER DEFAULT 0 NOT NULL,
+    CONSTRAINT pk_rating_histogram PRIMARY KEY (restaurant_id, bin),
+    FOREIGN KEY (restaurant_id) REFERENCES RESTAURANTS(restaurant_id) ON DELETE CASCADE
+);
+
+-- ============================================
+-- INDEXES
+-- ============================================
+CREATE INDEX idx_restaurant_city ON RESTAURANTS(city);
+CREATE INDEX idx_restaurant_rating ON RESTAURANTS(avg_rating);
+CREATE INDEX idx_restaurant_name ON RESTAURANTS(name);
+CREATE INDEX idx_restaurant_rank ON RESTAURANTS(avg_rating DESC, votes DESC, restaurant_id);
+
+CREATE INDEX idx_review_restaurant ON REVIEWS(restaurant_id, review_date DESC, review_id);
+CREATE INDEX idx_review_helpful ON REVIEWS(restaurant_id, helpful_count DESC, review_date DESC, review_id);
+-- One review per user per restaurant (the upsert conflict target); also serves user_id lookups
+CREATE UNIQUE INDEX uq_review_user_restaurant ON REVIEWS(user_id, restaurant_id);
+
+-- The votes one ledger flush stored, counted into REVIEWS.helpful_count
+CREATE INDEX idx_helpful_vote_flush ON HELPFUL_VOTES(flush_id);
+
+CREATE INDEX idx_rating_restaurant ON RATINGS(restaurant_id);
+CREATE INDEX idx_rating_user ON RATINGS(user_id);
+
+-- ============================================
+-- RATING AGGREGATE TRIGGERS (same deltas as trg_update_avg_rating)
+-- ============================================
+CREATE TRIGGER trg_rating_insert AFTER INSERT ON RATINGS
+BEGIN
+    UPDATE RESTAURANTS
+    SET rating_sum = rating_sum + NEW.rating_value,
+        rating_count = rating_count + 1,
+        avg_rating = IFNULL(ROUND((rating_sum + NEW.rating_value) / NULLIF(rating_count + 1, 0), 1), 0),
+        votes = rating_count + 1
+    WHERE restaurant_id = NEW.restaurant_id;
+    INSERT INTO RATING_HISTOGRAM (restaurant_id, bin, rating_count)
+    VALUES (NEW.restaurant_id, ROUND(NEW.rating_value * 2) / 2.0, 1)
+    ON CONFLICT (restaurant_id, bin) DO UPDATE SET rating_count = rating_count + 1;
+END;
+
+CREATE TRIGGER trg_rating_update AFTER UPDATE OF rating_value, restaurant_id ON RATINGS
+BEGIN
+    UPDATE RESTAURANTS
+    SET rating_sum = rating_sum - OLD.rating_value,
+        rating_count = rating_count - 1,
+        avg_rating = IFNULL(ROUND((rating_sum - OLD.rating_value) / NULLIF(rating_count - 1, 0), 1), 0),
+        votes = rating_count - 1
+    WHERE restaurant_id = OLD.restaurant_id;
+    UPDATE RATING_HISTOGRAM
+    SET rating_count = rating_count - 1
+    WHERE restaurant_id = OLD.restaurant_id AND bin = ROUND(OLD.rating_value * 2) / 2.0;
+    UPDATE RESTAURANTS
+    SET rating_sum = rating_sum + NEW.rating_value,
+        rating_count = rating_count + 1,
+        avg_rating = IFNULL(ROUND((rating_sum + NEW.rating_value) / NULLIF(rating_count + 1, 0), 1), 0),
+        votes = rating_count + 1
+    WHERE restaurant_id = NEW.restaurant_id;
+    INSERT INTO RATING_HISTOGRAM (restaurant_id, bin, rating_count)
+    VALUES (NEW.restaurant_id, ROUND(NEW.rating_value * 2) / 2.0, 1)
+    ON CONFLICT (restaurant_id, bin) DO UPDATE SET rating_count = rating_count + 1;
+END;
+
+CREATE TRIGGER trg_rating_delete AFTER DELETE ON RATINGS
+BEGIN
+    UPDATE RESTAURANTS
+    SET rating_sum = rating_sum - OLD.rating_value,
+        rating_count = rating_count - 1,
+        avg_rating = IFNULL(ROUND((rating_sum - OLD.rating_value) / NULLIF(rating_count - 1, 0), 1), 0),
+        votes = rating_count - 1
+    WHERE restaurant_id = OLD.restaurant_id;
+    UPDATE RATING_HISTOGRAM
+    SET rating_count = rating_count - 1
+    WHERE restaurant_id = OLD.restaurant_id AND bin = ROUND(OLD.rating_value * 2) / 2.0;
+END;
+
+-- ============================================
+-- VIEWS
+-- ============================================
+CREATE VIEW vw_restaurant_summary AS
+SELECT
+    r.restaurant_id,
+    r.name,
+    r.city,
+    r.region,
+    r.avg_rating,
+    r.votes,
+    r.price_range,
+    r.dining_type,
+    r.rating_type,
+    (SELECT GROUP_CONCAT(category_name, ', ') FROM (
+        SELECT c.category_name FROM RESTAURANT_CATEGORIES rc
+        JOIN CATEGORIES c ON rc.category_id = c.category_id
+        WHERE rc.restaurant_id = r.restaurant_id
+        ORDER BY c.category_name
+    )) AS cuisines,
+    (SELECT COUNT(*) FROM REVIEWS rev WHERE rev.restaurant_id = r.restaurant_id) AS review_count
+FROM RESTAURANTS r;
+
+CREATE VIEW vw_user_activity AS
+SELECT
+    u.user_id,
+    u.username,
+    u.email,
+    u.registration_date,
+    COUNT(DISTINCT rat.rating_id) AS ratings_given,
+    COUNT(DISTINCT rev.review_id) AS reviews_written,
+    IFNULL(AVG(rat.rating_value), 0) AS avg_rating_given
+FROM USERS u
+LEFT JOIN RATINGS rat ON u.user_id = rat.user_id
+LEFT JOIN REVIEWS rev ON u.user_id = rev.user_id
+GROUP BY u.user_id, u.username, u.email, u.registration_date;
+
+CREATE VIEW vw_city_statistics AS
+SELECT
+    city,
+    COUNT(*) AS total_restaurants,
+    ROUND(AVG(avg_rating), 2) AS avg_city_rating,
+    SUM(votes) AS total_votes,
+    MIN(price_range) AS min_price,
+    MAX(price_range) AS max_price
+FROM RESTAURANTS
+GROUP BY city;
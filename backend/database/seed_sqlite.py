@@ -0,0 +1,199 @@
+# seed_sqlite.py
+#
+# Build a local SQLite copy of the DineWise database for development, load
+# tests and benchmarks (DB_BACKEND=sqlite). Restaurants and categories come
+# from zomato_restaurants.csv, parsed with the same helpers as the Oracle
+# import; users, ratings and reviews are generated.
+#
+#   python database/seed_sqlite.py                       # ~1k restaurants
+#   python database/seed_sqlite.py --copies 20 --users 500   # ~20k restaurants
+#
+# Every generated user can log in with password "password123".
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+import csv
+
+import bcrypt
+
+from import_hybrid_data import (
+    clean_float, clean_int, clean_price, generate_id, generate_phone,
+    parse_cuisines, pick
+)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.backends.sqlite import DEFAULT_PATH, SCHEMA_PATH  # noqa: E402
+
+CSV_PATH = BACKEND_DIR.parent / 'zomato_restaurants.csv'
+
+REVIEW_TEMPLATES = [
+    "Absolutely amazing! The {cuisine} was outstanding. Best {dining_type} in {city}!",
+    "Great place! The {cuisine} was really good. Will visit again.",
+    "Very good food quality. Definitely worth visiting in {city}.",
+    "Decent {cuisine}. Nothing extraordinary but okay for the price.",
+    "Average experience. The food was okay but nothing special.",
+    "Not impressed. The {cuisine} lacked flavor.",
+]
+RATING_VALUES = [5, 4.5, 4, 3.5, 3, 2.5, 2]
+RATING_WEIGHTS = [20, 25, 30, 15, 7, 2, 1]
+
+
+def read_restaurants(csv_file, copies):
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    restaurants = []
+    for copy in range(copies):
+        for row in rows:
+            idx = len(restaurants) + 1
+            name = (pick(row, 'NAME') or '').strip()
+            region = (pick(row, 'REGION') or '').strip()
+            restaurants.append({
+                'id': generate_id('R', idx),
+                'name': name if copy == 0 else f"{name} #{copy + 1}",
+                'city': (pick(row, 'city', 'CITY') or '').strip(),
+                'region': region,
+                'phone': generate_phone(),
+                'url': (pick(row, 'URL') or '')[:500],
+                'rating': clean_float(pick(row, 'RATING'), default=3.5),
+                'price': clean_price(pick(row, 'PRICE', 'COST', 'PRICE_RANGE') or '500'),
+                'dining_type': (pick(row, 'CUSINE TYPE', 'CUISINE TYPE', 'DINING_TYPE') or 'Casual Dining').strip(),
+                'timings': (pick(row, 'TIMING') or '10am to 10pm').strip(),
+                'votes': clean_int(pick(row, 'VOTES', 'REVIEWS', 'VOTE_COUNT'), default=0),
+                'rating_type': (pick(row, 'RATING_TYPE') or 'Good').strip(),
+                'cuisines': parse_cuisines(pick(row, 'CUSINE_CATEGORY', 'CUISINE_CATEGORY', 'CUISINES') or 'Indian'),
+            })
+    return restaurants
+
+
+def seed(conn, restaurants, user_count, max_ratings):
+    cur = conn.cursor()
+
+    print(f"👥 Inserting {user_count} users...")
+    password_hash = bcrypt.hashpw(b'password123', bcrypt.gensalt()).decode('utf-8')
+    users = [generate_id('U', i) for i in range(1, user_count + 1)]
+    cur.executemany(
+        "INSERT INTO USERS (user_id, username, email, password_hash) VALUES (?, ?, ?, ?)",
+        [(uid, f"user{uid[1:]}", f"user{uid[1:]}@example.com", password_hash) for uid in users]
+    )
+
+    categories = sorted({c for r in restaurants for c in r['cuisines']})
+    category_map = {name: generate_id('C', i) for i, name in enumerate(categories, start=1)}
+    print(f"📦 Inserting {len(categories)} categories...")
+    cur.executemany(
+        "INSERT INTO CATEGORIES (category_id, category_name) VALUES (?, ?)",
+        [(cid, name) for name, cid in category_map.items()]
+    )
+
+    print(f"🏪 Inserting {len(restaurants)} restaurants...")
+    cur.executemany(
+        """INSERT INTO RESTAURANTS (
+               restaurant_id, name, address, city, region, phone_number, website_url,
+               avg_rating, price_range, dining_type, timings, votes, rating_type
+           ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [(r['id'], r['name'], r['region'], r['city'], r['region'], r['phone'], r['url'],
+          r['rating'], r['price'], r['dining_type'], r['timings'], r['votes'], r['rating_type'])
+         for r in restaurants]
+    )
+    cur.executemany(
+        "INSERT OR IGNORE INTO RESTAURANT_CATEGORIES (restaurant_id, category_id) VALUES (?, ?)",
+        [(r['id'], category_map[c]) for r in restaurants for c in r['cuisines']]
+    )
+
+    print("⭐ Generating ratings and reviews...")
+    ratings, reviews = [], []
+    now = datetime.now()
+    for rest in random.sample(restaurants, min(len(restaurants), max(1, len(restaurants) * 2 // 5))):
+        for user_id in random.sample(users, min(random.randint(2, max_ratings), len(users))):
+            value = random.choices(RATING_VALUES, weights=RATING_WEIGHTS)[0]
+            when = now - timedelta(days=random.randint(1, 120))
+            ratings.append((generate_id('RAT', len(ratings) + 1), user_id, rest['id'], value, when))
+            if random.random() < 0.5:
+                text = random.choice(REVIEW_TEMPLATES).format(
+                    city=rest['city'], cuisine=random.choice(rest['cuisines']), dining_type=rest['dining_type']
+                )
+                reviews.append((generate_id('REV', len(reviews) + 1), user_id, rest['id'], text, when))
+
+    # Bulk-load ratings with the per-row triggers off, then recompute the
+    # aggregates once (the Oracle import does the same with its trigger)
+    for trigger in ('trg_rating_insert', 'trg_rating_update', 'trg_rating_delete'):
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cur.executemany(
+        "INSERT INTO RATINGS (rating_id, user_id, restaurant_id, rating_value, rating_date) VALUES (?, ?, ?, ?, ?)",
+        ratings
+    )
+    cur.executemany(
+        "INSERT INTO REVIEWS (review_id, user_id, restaurant_id, review_text, review_date) VALUES (?, ?, ?, ?, ?)",
+        reviews
+    )
+    cur.execute("""
+        UPDATE RESTAURANTS
+        SET (avg_rating, rating_sum, rating_count) = (
+            SELECT ROUND(AVG(rating_value), 1), SUM(rating_value), COUNT(*)
+            FROM RATINGS WHERE RATINGS.restaurant_id = RESTAURANTS.restaurant_id
+        )
+        WHERE restaurant_id IN (SELECT restaurant_id FROM RATINGS)
+    """)
+    cur.execute("""
+        INSERT INTO RATING_HISTOGRAM (restaurant_id, bin, rating_count)
+        SELECT restaurant_id, ROUND(rating_value * 2) / 2.0, COUNT(*)
+        FROM RATINGS
+        GROUP BY restaurant_id, ROUND(rating_value * 2) / 2.0
+    """)
+    conn.commit()
+    return len(ratings), len(reviews)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create and seed a local SQLite DineWise database")
+    parser.add_argument('--db', default=os.getenv('SQLITE_PATH') or DEFAULT_PATH, help="SQLite file to (re)create")
+    parser.add_argument('--csv', default=str(CSV_PATH), help="Zomato restaurants CSV")
+    parser.add_argument('--copies', type=int, default=1, help="Replicate the CSV N times for larger volumes")
+    parser.add_argument('--users', type=int, default=20, help="Number of users to generate")
+    parser.add_argument('--max-ratings', type=int, default=10, help="Max ratings per rated restaurant")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print("=" * 60)
+    print("   DINEWISE DATABASE - SQLITE SEED")
+    print("=" * 60)
+
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+
+    conn = sqlite3.connect(args.db)
+    with open(SCHEMA_PATH, encoding='utf-8') as f:
+        conn.executescript(f.read())
+
+    restaurants = read_restaurants(args.csv, args.copies)
+    rating_count, review_count = seed(conn, restaurants, args.users, args.max_ratings)
+
+    # Restore the triggers dropped for the bulk load
+    with open(SCHEMA_PATH, encoding='utf-8') as f:
+        schema = f.read()
+    start = schema.index('CREATE TRIGGER trg_rating_insert')
+    end = schema.index('-- ============================================\n-- VIEWS')
+    conn.executescript(schema[start:end])
+    conn.commit()
+
+    print("\n" + "=" * 60)
+    for table in ('USERS', 'RESTAURANTS', 'CATEGORIES', 'RESTAURANT_CATEGORIES', 'RATINGS', 'REVIEWS'):
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        print(f"{table:25} : {count:6} records")
+    print("=" * 60)
+    conn.close()
+    print(f"\n✅ Seeded {args.db} ({rating_count} ratings, {review_count} reviews)")
+    print("   Run the API against it with DB_BACKEND=sqlite\n")
+
+
+if __name__ == '__main__':
+    main()
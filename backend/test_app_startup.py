@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+App startup test
+Builds the app with create_app() over a fresh SQLite file and checks that
+startup work (rating reconciliation, the catalog load) hands its pooled
+connections back. Needs no server: python test_app_startup.py
+(or pytest test_app_startup.py).
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import create_app  # noqa: E402
+from app.backends.sqlite import SQLiteBackend  # noqa: E402
+from app.catalog import catalog  # noqa: E402
+from app.database import db  # noqa: E402
+
+
+def use_fresh_database():
+    """Point the shared db at an empty SQLite file (schema created on connect)"""
+    db.disconnect()
+    db.backend = SQLiteBackend(os.path.join(tempfile.mkdtemp(), 'startup.sqlite3'))
+
+
+def test_pool_idle_after_create_app():
+    use_fresh_database()
+    assert catalog.enabled
+    app = create_app()
+    assert catalog.snapshot() is not None
+    assert db.pool_stats()['pool']['busy'] == 0
+    # A request's connection goes back to the pool as well
+    response = app.test_client().get('/api/health')
+    assert response.get_json()['database'] == 'connected'
+    assert db.pool_stats()['pool']['busy'] == 0
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {e!r}")
+    sys.exit(1 if failed else 0)
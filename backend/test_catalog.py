@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Restaurant catalog test
+Loads the in-memory catalog from a fresh SQLite file holding a restaurant
+with a NULL created_at and pages through the newest order, in the catalog
+and in the SQL fallback. Needs no server: python test_catalog.py
+(or pytest test_catalog.py).
+"""
+
+import os
+import sys
+import tempfile
+
+from werkzeug.datastructures import MultiDict
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.backends.sqlite import SQLiteBackend  # noqa: E402
+from app.catalog import Catalog  # noqa: E402
+from app.database import Database  # noqa: E402
+from app.utils.filters import parse_filters, sql_predicates  # noqa: E402
+from app.utils.pagination import OLDEST, order_by, page_cursor, seek_key, seek_params, seek_predicate  # noqa: E402
+
+# restaurant_id -> created_at; R3 has none
+CREATED = {'R1': '2024-01-01 10:00:00', 'R2': '2025-06-01 09:30:00', 'R3': None, 'R4': '2023-03-15 00:00:00'}
+NEWEST_FIRST = ['R2', 'R1', 'R4', 'R3']
+
+
+def make_database():
+    path = os.path.join(tempfile.mkdtemp(), 'catalog.sqlite3')
+    database = Database(SQLiteBackend(path))
+    for restaurant_id, created_at in CREATED.items():
+        database.execute_non_query(
+            """INSERT INTO RESTAURANTS (restaurant_id, name, address, city, created_at)
+               VALUES (:id, :name, 'Road 1', 'Dehradun', :created_at)""",
+            {'id': restaurant_id, 'name': f'Cafe {restaurant_id}', 'created_at': created_at}
+        )
+    return database
+
+
+def test_newest_order_with_null_created_at():
+    database = make_database()
+    catalog = Catalog(database)
+    assert catalog.load()
+    filters = parse_filters(MultiDict())
+
+    rows, has_more, total = catalog.select(filters, sort='newest', limit=10)
+    assert [r['restaurant_id'] for r in rows] == NEWEST_FIRST
+    assert total == 4 and not has_more
+    assert rows[-1]['created_at'] is None
+
+    # Keyset pages of one, including the cursor taken on the NULL row
+    seen, after = [], None
+    while True:
+        rows, has_more, _ = catalog.select(filters, sort='newest', after=after, limit=1)
+        seen += [r['restaurant_id'] for r in rows]
+        if not has_more:
+            break
+        after = seek_key(page_cursor(rows[-1], 'newest'), 'newest')
+    assert seen == NEWEST_FIRST
+    assert catalog.select(filters, sort='newest', after=seek_key(page_cursor(rows[-1], 'newest'), 'newest'))[0] == []
+
+
+def test_sql_newest_order_matches_catalog():
+    database = make_database()
+    predicates, params = sql_predicates(parse_filters(MultiDict()))
+    params['oldest'] = OLDEST
+    base = f"SELECT r.restaurant_id, r.created_at FROM RESTAURANTS r WHERE {' AND '.join(predicates.values())}"
+
+    rows = database.execute_query(f"{base} {order_by('newest')}", dict(params))
+    assert [r['restaurant_id'] for r in rows] == NEWEST_FIRST
+
+    seen, cursor = [], None
+    while True:
+        page_params = dict(params)
+        query = base
+        if cursor:
+            query += seek_predicate('newest')
+            page_params.update(seek_params(cursor, 'newest'))
+        rows = database.execute_query(database.paginate(f"{query} {order_by('newest')}", 1), page_params)
+        if not rows:
+            break
+        seen += [r['restaurant_id'] for r in rows]
+        cursor = page_cursor(rows[-1], 'newest')
+    assert seen == NEWEST_FIRST
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {e!r}")
+    sys.exit(1 if failed else 0)
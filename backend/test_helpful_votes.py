@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Helpful-vote ledger test
+Runs two VoteLedgers (as two API workers would, each with its own pool and
+Bloom filter) over one SQLite database and checks that a vote both accept
+is stored and counted once. Needs no server: python test_helpful_votes.py
+(or pytest test_helpful_votes.py).
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.backends.sqlite import SQLiteBackend  # noqa: E402
+from app.counters import VoteLedger  # noqa: E402
+from app.database import Database  # noqa: E402
+
+REVIEW = 'rev-1'
+USERS = ('user-1', 'user-2')
+
+
+def make_workers(enabled=True):
+    """Two Database/VoteLedger pairs over one fresh SQLite file, with a review to vote on"""
+    path = os.path.join(tempfile.mkdtemp(), 'votes.sqlite3')
+    databases = [Database(SQLiteBackend(path)) for _ in range(2)]
+    db = databases[0]
+    for user_id in USERS + ('author',):
+        db.execute_non_query(
+            "INSERT INTO USERS (user_id, username, email, password_hash) VALUES (:id, :id, :email, 'x')",
+            {'id': user_id, 'email': f'{user_id}@example.com'}
+        )
+    db.execute_non_query(
+        "INSERT INTO RESTAURANTS (restaurant_id, name, address, city) VALUES ('rest-1', 'Cafe', 'Road 1', 'Dehradun')"
+    )
+    db.execute_non_query(
+        "INSERT INTO REVIEWS (review_id, user_id, restaurant_id, review_text) VALUES (:id, 'author', 'rest-1', 'Good')",
+        {'id': REVIEW}
+    )
+    # No background flushes: the test flushes explicitly
+    ledgers = [VoteLedger(database, flush_seconds=3600, enabled=enabled) for database in databases]
+    return db, ledgers
+
+
+def stored(db):
+    votes = db.execute_query("SELECT COUNT(*) FROM HELPFUL_VOTES", fetch_one=True, row_format='tuple')[0]
+    count = db.execute_query(
+        "SELECT helpful_count FROM REVIEWS WHERE review_id = :id", {'id': REVIEW}, fetch_one=True, row_format='tuple'
+    )[0]
+    return votes, count
+
+
+def test_same_vote_on_two_workers_counts_once():
+    db, (a, b) = make_workers()
+    # Neither filter knows the other's vote, so both accept it
+    assert a.add(USERS[0], REVIEW)
+    assert b.add(USERS[0], REVIEW)
+    assert a.add(USERS[1], REVIEW)
+    assert a.pending(REVIEW) == 2 and b.pending(REVIEW) == 1
+    a.flush()
+    b.flush()
+    assert stored(db) == (2, 2)
+    assert a.pending(REVIEW) == 0 and b.pending(REVIEW) == 0
+    assert a.stats()['votes_stored'] == 2 and b.stats()['votes_stored'] == 0
+    # Once stored, the table check turns the repeat away on either worker
+    assert not b.add(USERS[0], REVIEW)
+    assert not a.add(USERS[1], REVIEW)
+
+
+def test_unbuffered_second_worker_reports_duplicate():
+    db, (a, b) = make_workers(enabled=False)
+    assert a.add(USERS[0], REVIEW)
+    assert not b.add(USERS[0], REVIEW)
+    assert stored(db) == (1, 1)
+
+
+def test_failed_vote_lookup_raises():
+    db, (a, b) = make_workers()
+    a.add(USERS[0], REVIEW)
+    a.flush()
+    # A worker whose filter and table lookups both fail must not accept the vote
+    b.db.execute_query = lambda *args, **kwargs: None
+    try:
+        b.add(USERS[0], REVIEW)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("add() accepted a vote it could not check")
+    finally:
+        del b.db.execute_query
+    assert b.pending(REVIEW) == 0
+    assert stored(db) == (1, 1)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {e!r}")
+    sys.exit(1 if failed else 0)
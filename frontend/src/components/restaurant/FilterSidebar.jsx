@@ -1,4 +1,8 @@
-export function FilterSidebar({ filters, categories, cities, onFilterChange, onClearFilters }) {
+export function FilterSidebar({ filters, facets, onFilterChange, onClearFilters }) {
+  const cities = facets?.cities || [];
+  const cuisines = facets?.cuisines || [];
+  const ratingCounts = Object.fromEntries((facets?.ratings || []).map((r) => [r.min_rating, r.count]));
+
   return (
     <div className="card">
       <div className="flex justify-between items-center mb-6">
@@ -37,9 +41,9 @@ export function FilterSidebar({ filters, categories, cities, onFilterChange, onC
           className="input"
         >
           <option value="">All Cuisines</option>
-          {categories.map((cat) => (
-            <option key={cat.id} value={cat.name}>
-              {cat.name}
+          {cuisines.map((cat) => (
+            <option key={cat.name} value={cat.name}>
+              {cat.name} ({cat.count})
             </option>
           ))}
         </select>
@@ -59,6 +63,9 @@ export function FilterSidebar({ filters, categories, cities, onFilterChange, onC
                 className="w-4 h-4"
               />
               <span>⭐ {rating} & above</span>
+              {ratingCounts[rating] !== undefined && (
+                <span className="ml-auto text-sm opacity-60">{ratingCounts[rating]}</span>
+              )}
             </label>
           ))}
           <label className="flex items-center gap-2 cursor-pointer hover:bg-gray-100 dark:hover:bg-gray-700 p-2 rounded">
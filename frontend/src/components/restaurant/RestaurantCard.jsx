@@ -40,6 +40,10 @@ function getRandomFoodImage(restaurant) {
 }
 
 
+// The restaurant fields this card reads; listings pass them as ?fields= to skip the rest
+export const CARD_FIELDS =
+  "restaurant_id,name,city,avg_rating,votes,price_range,dining_type,cuisines,website_url";
+
 export default function RestaurantCard({ restaurant }) {
   const [isFavorite, setIsFavorite] = useState(false);
 
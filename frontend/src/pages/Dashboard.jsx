@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { ratingAPI, restaurantAPI,reviewAPI} from '../services/api';
-import RestaurantCard from '../components/restaurant/RestaurantCard';
+import RestaurantCard, { CARD_FIELDS } from '../components/restaurant/RestaurantCard';
 import LoadingSpinner from '../components/common/LoadingSpinner';
 
 export default function Dashboard() {
@@ -30,13 +30,19 @@ const ratings = Array.isArray(ratingsResponse) ? ratingsResponse : [];
        const reviewResponse = await reviewAPI.getUserReviews();
     const reviews = Array.isArray(reviewResponse) ? reviewResponse : [];
       
-      // Get most common city from ratings
+      // Get most common city from ratings (one batch lookup for all rated restaurants)
       let favoriteCity = 'Dehradun';
       if (ratings.length > 0) {
+        const ids = [...new Set(ratings.map(r => r.restaurant_id))].slice(0, 500);
+        const batch = await restaurantAPI.getBatch(ids, 'city');
+        const cityById = Object.fromEntries((batch.restaurants || []).map(r => [r.restaurant_id, r.city]));
         const cityCount = {};
         ratings.forEach(r => {
-          // We'll get city from recommendations or default
+          const city = cityById[r.restaurant_id];
+          if (city) cityCount[city] = (cityCount[city] || 0) + 1;
         });
+        const [topCity] = Object.entries(cityCount).sort((a, b) => b[1] - a[1]);
+        if (topCity) favoriteCity = topCity[0];
       }
       
       setRecentRatings(ratings.slice(0, 5));
@@ -44,6 +50,7 @@ const ratings = Array.isArray(ratingsResponse) ? ratingsResponse : [];
       // Fetch recommendations based on user's ratings
       const recsResponse = await restaurantAPI.getAll({ 
         limit: 4,
+        fields: CARD_FIELDS,
         min_rating: ratings.length > 0 ? 3.5 : 0
       });
       const restaurants = recsResponse.restaurants || recsResponse || [];
@@ -1,29 +1,63 @@
 import { useState, useEffect } from 'react';
-import { useSearchParams } from 'react-router-dom';
+import { Link, useSearchParams } from 'react-router-dom';
 import { restaurantAPI } from '../services/api';
-import RestaurantCard from '../components/restaurant/RestaurantCard';
+import RestaurantCard, { CARD_FIELDS } from '../components/restaurant/RestaurantCard';
 import FilterSidebar from '../components/restaurant/FilterSidebar';
 import LoadingSpinner from '../components/common/LoadingSpinner';
 
+const SORT_OPTIONS = [
+  { value: 'weighted', label: 'Top rated (weighted)' },
+  { value: 'rating', label: 'Highest rating' },
+  { value: 'votes', label: 'Most rated' },
+  { value: 'price_asc', label: 'Price: low to high' },
+  { value: 'price_desc', label: 'Price: high to low' },
+  { value: 'newest', label: 'Newest' },
+];
+
 export default function DiscoverPage() {
   const [searchParams, setSearchParams] = useSearchParams();
   const [restaurants, setRestaurants] = useState([]);
+  const [total, setTotal] = useState(null);
   const [loading, setLoading] = useState(true);
   const [filters, setFilters] = useState({
     city: searchParams.get('city') || '',
     cuisine: searchParams.get('cuisine') || '',
     min_rating: searchParams.get('min_rating') || '',
     price_range: searchParams.get('price_range') || '',
-    search: searchParams.get('search') || ''
+    search: searchParams.get('search') || '',
+    sort: searchParams.get('sort') || ''
   });
   const [showFilters, setShowFilters] = useState(false);
-  const [categories, setCategories] = useState([]);
-  const [cities, setCities] = useState([]);
+  const [facets, setFacets] = useState(null);
+  // What is typed in the search box; only applied to the listing on submit/pick
+  const [searchInput, setSearchInput] = useState(filters.search);
+  const [suggestions, setSuggestions] = useState(null);
+
+  useEffect(() => {
+    const prefix = searchInput.trim();
+    if (!prefix || prefix === filters.search) {
+      setSuggestions(null);
+      return;
+    }
+    let cancelled = false;
+    // Short debounce so fast typing sends one request
+    const timer = setTimeout(async () => {
+      try {
+        const response = await restaurantAPI.suggest(prefix, 5);
+        if (!cancelled) setSuggestions(response);
+      } catch (error) {
+        console.error('Error fetching suggestions:', error);
+      }
+    }, 120);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchInput]);
 
   useEffect(() => {
     fetchRestaurants();
-    fetchCategories();
-    fetchCities();
+    fetchFacets();
   }, [filters]);
 
   const fetchRestaurants = async () => {
@@ -34,40 +68,42 @@ export default function DiscoverPage() {
       if (filters.cuisine) params.cuisine = filters.cuisine;
       if (filters.min_rating) params.min_rating = filters.min_rating;
       if (filters.search) params.search = filters.search;
+      if (filters.sort) params.sort = filters.sort;
+      params.fields = CARD_FIELDS;
       
       const response = await restaurantAPI.getAll(params);
-      // API returns { restaurants: [], total: number, ... }
+      // API returns { restaurants: [], total: number (all pages), ... }
       setRestaurants(response.restaurants || response || []);
+      setTotal(response.total ?? null);
     } catch (error) {
       console.error('Error fetching restaurants:', error);
       setRestaurants([]);
+      setTotal(null);
     } finally {
       setLoading(false);
     }
   };
 
-  const fetchCategories = async () => {
+  // One request for every sidebar count under the current filters
+  const fetchFacets = async () => {
     try {
-      const response = await restaurantAPI.getCategories();
-      setCategories(Array.isArray(response) ? response : []);
-    } catch (error) {
-      console.error('Error fetching categories:', error);
-      setCategories([]);
-    }
-  };
+      const params = {};
+      if (filters.city) params.city = filters.city;
+      if (filters.cuisine) params.cuisine = filters.cuisine;
+      if (filters.min_rating) params.min_rating = filters.min_rating;
+      if (filters.search) params.search = filters.search;
 
-  const fetchCities = async () => {
-    try {
-      const response = await restaurantAPI.getCities();
-      setCities(Array.isArray(response) ? response : []);
+      setFacets(await restaurantAPI.getFacets(params));
     } catch (error) {
-      console.error('Error fetching cities:', error);
-      setCities([]);
+      console.error('Error fetching facets:', error);
+      setFacets(null);
     }
   };
 
-  const handleFilterChange = (key, value) => {
-    const newFilters = { ...filters, [key]: value };
+  const handleFilterChange = (key, value) => updateFilters({ [key]: value });
+
+  const updateFilters = (changes) => {
+    const newFilters = { ...filters, ...changes };
     setFilters(newFilters);
     
     // Update URL params
@@ -78,13 +114,27 @@ export default function DiscoverPage() {
     setSearchParams(params);
   };
 
+  const applySearch = (e) => {
+    e.preventDefault();
+    setSuggestions(null);
+    handleFilterChange('search', searchInput.trim());
+  };
+
+  const pickCuisine = (name) => {
+    setSuggestions(null);
+    setSearchInput('');
+    updateFilters({ cuisine: name, search: '' });
+  };
+
   const clearFilters = () => {
+    setSearchInput('');
     setFilters({
       city: '',
       cuisine: '',
       min_rating: '',
       price_range: '',
-      search: ''
+      search: '',
+      sort: ''
     });
     setSearchParams({});
   };
@@ -99,24 +149,54 @@ export default function DiscoverPage() {
             {filters.city && <span className="text-gradient"> in {filters.city}</span>}
           </h1>
           <p className="text-lg opacity-70">
-            Browse {restaurants.length}+ restaurants across Uttarakhand
+            Browse {total ?? `${restaurants.length}+`} restaurants across Uttarakhand
           </p>
         </div>
 
         {/* Search Bar */}
         <div className="mb-8">
-          <div className="relative max-w-2xl">
+          <form className="relative max-w-2xl" onSubmit={applySearch}>
             <input
               type="text"
               placeholder="Search restaurants by name..."
-              value={filters.search}
-              onChange={(e) => handleFilterChange('search', e.target.value)}
+              value={searchInput}
+              onChange={(e) => setSearchInput(e.target.value)}
               className="input pr-12"
             />
-            <button className="absolute right-3 top-1/2 transform -translate-y-1/2 text-2xl">
+            <button type="submit" className="absolute right-3 top-1/2 transform -translate-y-1/2 text-2xl">
               🔍
             </button>
-          </div>
+            {suggestions && (suggestions.restaurants.length > 0 || suggestions.cuisines.length > 0 || suggestions.regions.length > 0) && (
+              <ul className="absolute left-0 right-0 top-full mt-2 z-20 bg-white dark:bg-gray-800 rounded-xl shadow-lg overflow-hidden">
+                {suggestions.restaurants.map((r) => (
+                  <li key={r.restaurant_id}>
+                    <Link to={`/restaurant/${r.restaurant_id}`} className="flex justify-between px-4 py-2 hover:bg-gray-100 dark:hover:bg-gray-700">
+                      <span>{r.name} <span className="opacity-60 text-sm">· {r.city}</span></span>
+                      <span className="text-sm">⭐ {r.avg_rating}</span>
+                    </Link>
+                  </li>
+                ))}
+                {suggestions.cuisines.map((c) => (
+                  <li key={`cuisine-${c.name}`}>
+                    <button type="button" onClick={() => pickCuisine(c.name)} className="w-full text-left px-4 py-2 hover:bg-gray-100 dark:hover:bg-gray-700">
+                      🍽️ {c.name} <span className="opacity-60 text-sm">({c.count})</span>
+                    </button>
+                  </li>
+                ))}
+                {suggestions.regions.map((g) => (
+                  <li key={`region-${g.city}-${g.name}`}>
+                    <button
+                      type="button"
+                      onClick={() => { setSearchInput(g.name); setSuggestions(null); handleFilterChange('search', g.name); }}
+                      className="w-full text-left px-4 py-2 hover:bg-gray-100 dark:hover:bg-gray-700"
+                    >
+                      📍 {g.name}, {g.city} <span className="opacity-60 text-sm">({g.count})</span>
+                    </button>
+                  </li>
+                ))}
+              </ul>
+            )}
+          </form>
         </div>
 
         <div className="flex gap-8">
@@ -125,8 +205,7 @@ export default function DiscoverPage() {
             <div className="sticky top-24">
               <FilterSidebar
                 filters={filters}
-                categories={categories}
-                cities={cities}
+                facets={facets}
                 onFilterChange={handleFilterChange}
                 onClearFilters={clearFilters}
               />
@@ -151,8 +230,7 @@ export default function DiscoverPage() {
                 </div>
                 <FilterSidebar
                   filters={filters}
-                  categories={categories}
-                  cities={cities}
+                  facets={facets}
                   onFilterChange={handleFilterChange}
                   onClearFilters={clearFilters}
                 />
@@ -199,6 +277,21 @@ export default function DiscoverPage() {
               </div>
             )}
 
+            {/* Sort */}
+            <div className="mb-6 flex justify-end items-center gap-3">
+              <label htmlFor="sort" className="text-sm opacity-70">Sort by</label>
+              <select
+                id="sort"
+                value={filters.sort || 'rating'}
+                onChange={(e) => handleFilterChange('sort', e.target.value)}
+                className="input w-auto"
+              >
+                {SORT_OPTIONS.map((option) => (
+                  <option key={option.value} value={option.value}>{option.label}</option>
+                ))}
+              </select>
+            </div>
+
             {/* Results */}
             {loading ? (
               <div className="flex justify-center py-20">
@@ -37,11 +37,17 @@ function getRandomFoodImage(restaurant) {
   return IMAGES[index] + "?auto=compress&cs=tinysrgb&w=600";
 }
 
+// Reviews per page: the detail endpoint embeds the first page (include=reviews:N),
+// later pages come from /reviews/restaurant/<id> with a cursor
+const REVIEWS_LIMIT = 20;
+
 export default function RestaurantDetail() {
   const { id } = useParams();
   const { isAuthenticated, user } = useAuth();
   const [restaurant, setRestaurant] = useState(null);
   const [reviews, setReviews] = useState([]);
+  const [reviewsCursor, setReviewsCursor] = useState(null);
+  const [reviewSort, setReviewSort] = useState('newest');
   const [userRating, setUserRating] = useState(null);
   const [userReview, setUserReview] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -58,15 +64,20 @@ export default function RestaurantDetail() {
     }
   }, [id, isAuthenticated]);
 
+  // Detail, cuisines, rating summary and reviews in one request
   const fetchAllData = async () => {
     setLoading(true);
     try {
-      await Promise.all([
-        fetchRestaurantDetails(),
-        fetchReviews()
-      ]);
+      const response = await restaurantAPI.getById(id, `ratings,reviews:${REVIEWS_LIMIT}`);
+      setRestaurant(response || null);
+      setReviews(Array.isArray(response?.reviews) ? response.reviews : []);
+      setReviewsCursor(response?.reviews_next_cursor || null);
+      setReviewSort('newest');
     } catch (error) {
       console.error('Error fetching data:', error);
+      setRestaurant(null);
+      setReviews([]);
+      setReviewsCursor(null);
     } finally {
       setLoading(false);
     }
@@ -82,13 +93,43 @@ export default function RestaurantDetail() {
     }
   };
 
-  const fetchReviews = async () => {
+  // First page of reviews (snippets) in the given order
+  const fetchReviews = async (sort = reviewSort) => {
     try {
-      const response = await reviewAPI.getByRestaurant(id);
-      setReviews(Array.isArray(response) ? response : []);
+      const response = await reviewAPI.getPage(id, { sort, limit: REVIEWS_LIMIT });
+      setReviews(Array.isArray(response?.reviews) ? response.reviews : []);
+      setReviewsCursor(response?.next_cursor || null);
     } catch (error) {
       console.error('Error fetching reviews:', error);
       setReviews([]);
+      setReviewsCursor(null);
+    }
+  };
+
+  const loadMoreReviews = async () => {
+    try {
+      const response = await reviewAPI.getPage(id, { sort: reviewSort, cursor: reviewsCursor, limit: REVIEWS_LIMIT });
+      setReviews(prev => [...prev, ...(response?.reviews || [])]);
+      setReviewsCursor(response?.next_cursor || null);
+    } catch (error) {
+      console.error('Error fetching more reviews:', error);
+    }
+  };
+
+  const changeReviewSort = (sort) => {
+    setReviewSort(sort);
+    fetchReviews(sort);
+  };
+
+  // Snippets are cut at the server; the full text is loaded only when asked for
+  const expandReview = async (reviewId) => {
+    try {
+      const response = await reviewAPI.getText(reviewId);
+      setReviews(prev => prev.map(r => (
+        r.review_id === reviewId ? { ...r, review_text: response.review_text, truncated: false } : r
+      )));
+    } catch (error) {
+      console.error('Error fetching review text:', error);
     }
   };
 
@@ -202,7 +243,7 @@ export default function RestaurantDetail() {
                 </div>
                 <div className="px-4 py-2 bg-gray-100 dark:bg-gray-700 rounded-lg flex items-center gap-2">
                   <span>💬</span>
-                  <span>{reviews.length} reviews</span>
+                  <span>{restaurant.review_count ?? reviews.length} reviews</span>
                 </div>
               </div>
 
@@ -298,7 +339,7 @@ export default function RestaurantDetail() {
                   : 'opacity-70 hover:opacity-100'
               }`}
             >
-              Reviews ({reviews.length})
+              Reviews ({restaurant.review_count ?? reviews.length})
             </button>
             {isAuthenticated && (
               <button
@@ -361,6 +402,18 @@ export default function RestaurantDetail() {
 
         {activeTab === 'reviews' && (
           <div>
+            {reviews.length > 0 && (
+              <div className="flex justify-end mb-4">
+                <select
+                  value={reviewSort}
+                  onChange={(e) => changeReviewSort(e.target.value)}
+                  className="input w-auto"
+                >
+                  <option value="newest">Newest first</option>
+                  <option value="helpful">Most helpful</option>
+                </select>
+              </div>
+            )}
             {reviews.length > 0 ? (
               <div className="space-y-4">
                 {reviews.map((review) => (
@@ -385,11 +438,31 @@ export default function RestaurantDetail() {
                             <span className="badge badge-primary text-xs">Your Review</span>
                           )}
                         </div>
-                        <p className="leading-relaxed">{review.review_text}</p>
+                        <p className="leading-relaxed">
+                          {review.review_text}
+                          {review.truncated && (
+                            <>
+                              {'… '}
+                              <button
+                                onClick={() => expandReview(review.review_id)}
+                                className="text-orange-500 hover:underline"
+                              >
+                                Read more
+                              </button>
+                            </>
+                          )}
+                        </p>
                       </div>
                     </div>
                   </div>
                 ))}
+                {reviewsCursor && (
+                  <div className="text-center">
+                    <button onClick={loadMoreReviews} className="btn btn-secondary">
+                      Load more reviews
+                    </button>
+                  </div>
+                )}
               </div>
             ) : (
               <div className="card text-center py-12">
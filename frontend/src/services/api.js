@@ -104,16 +104,29 @@ export const authAPI = {
 };
 
 // --- Restaurants API ---
+// city / cuisine / dining_type accept a single value or an array (OR'ed;
+// cuisine_match: 'all' requires every listed cuisine)
+const appendListFilters = (params, filters) => {
+  ['city', 'cuisine', 'dining_type'].forEach((name) => {
+    const value = filters[name];
+    if (Array.isArray(value)) value.forEach((v) => params.append(name, v));
+    else if (value) params.append(name, value);
+  });
+  if (filters.cuisine_match) params.append('cuisine_match', filters.cuisine_match);
+};
+
 export const restaurantsAPI = {
   getAll: async (filters = {}) => {
     const params = new URLSearchParams();
 
-    if (filters.city) params.append('city', filters.city);
-    if (filters.cuisine) params.append('cuisine', filters.cuisine);
+    appendListFilters(params, filters);
     if (filters.search) params.append('search', filters.search);
     if (filters.min_rating) params.append('min_rating', filters.min_rating);
     if (filters.limit) params.append('limit', filters.limit);
     if (filters.offset) params.append('offset', filters.offset);
+    if (filters.sort) params.append('sort', filters.sort);
+    if (filters.cursor) params.append('cursor', filters.cursor);
+    if (filters.fields) params.append('fields', filters.fields);
 
     const queryString = params.toString();
     const endpoint = `/restaurants${queryString ? '?' + queryString : ''}`; // FIXED: no extra slash before ?
@@ -121,8 +134,18 @@ export const restaurantsAPI = {
     return apiCall(endpoint);
   },
 
-  getById: async (restaurantId) => {
-    return apiCall(`/restaurants/${restaurantId}`);
+  // include: e.g. 'ratings,reviews:10' to embed the rating summary and newest reviews
+  getById: async (restaurantId, include) => {
+    const query = include ? `?${new URLSearchParams({ include }).toString()}` : '';
+    return apiCall(`/restaurants/${restaurantId}${query}`);
+  },
+
+  // Many restaurants in one request, returned in the order of `ids` (max 500)
+  getBatch: async (ids = [], fields) => {
+    if (ids.length === 0) return { restaurants: [], missing: [] };
+    const params = new URLSearchParams({ ids: ids.join(',') });
+    if (fields) params.append('fields', fields);
+    return apiCall(`/restaurants/batch?${params.toString()}`);
   },
 
   getCities: async () => {
@@ -133,13 +156,32 @@ export const restaurantsAPI = {
     return apiCall('/restaurants/categories');
   },
 
+  getFacets: async (filters = {}) => {
+    const params = new URLSearchParams();
+
+    appendListFilters(params, filters);
+    if (filters.search) params.append('search', filters.search);
+    if (filters.min_rating) params.append('min_rating', filters.min_rating);
+    if (filters.max_price) params.append('max_price', filters.max_price);
+
+    const queryString = params.toString();
+    return apiCall(`/restaurants/facets${queryString ? '?' + queryString : ''}`);
+  },
+
+  suggest: async (prefix, limit = 5) => {
+    const params = new URLSearchParams({ q: prefix, limit });
+    return apiCall(`/restaurants/suggest?${params.toString()}`);
+  },
+
   search: async (query, filters = {}) => {
     const params = new URLSearchParams({ q: query });
 
-    if (filters.city) params.append('city', filters.city);
-    if (filters.cuisine) params.append('cuisine', filters.cuisine);
+    appendListFilters(params, filters);
     if (filters.min_rating) params.append('min_rating', filters.min_rating);
     if (filters.max_price) params.append('max_price', filters.max_price);
+    if (filters.limit) params.append('limit', filters.limit);
+    if (filters.sort) params.append('sort', filters.sort);
+    if (filters.cursor) params.append('cursor', filters.cursor);
 
     return apiCall(`/restaurants/search?${params.toString()}`);
   },
@@ -151,6 +193,20 @@ export const reviewsAPI = {
     return apiCall(`/reviews/restaurant/${restaurantId}`);
   },
 
+  // One page of review snippets: { sort: 'newest' | 'helpful', cursor, limit, snippet }
+  getPage: async (restaurantId, options = {}) => {
+    const params = new URLSearchParams({ sort: options.sort || 'newest' });
+    if (options.cursor) params.append('cursor', options.cursor);
+    if (options.limit) params.append('limit', options.limit);
+    if (options.snippet) params.append('snippet', options.snippet);
+    return apiCall(`/reviews/restaurant/${restaurantId}?${params.toString()}`);
+  },
+
+  // Full text of a review whose snippet was truncated
+  getText: async (reviewId) => {
+    return apiCall(`/reviews/${reviewId}/text`);
+  },
+
   create: async (restaurantId, reviewText) => {
     return apiCall('/reviews', {
       method: 'POST',
@@ -193,14 +249,19 @@ export const healthCheck = async () => {
 // These let you keep older imports like `import { restaurantAPI } from './api'` working
 export const restaurantAPI = {
   getAll: (params) => restaurantsAPI.getAll(params),
-  getById: (id) => restaurantsAPI.getById(id),
+  getById: (id, include) => restaurantsAPI.getById(id, include),
+  getBatch: (ids, fields) => restaurantsAPI.getBatch(ids, fields),
   getCities: () => restaurantsAPI.getCities(),
   getCategories: () => restaurantsAPI.getCategories(),
+  getFacets: (filters) => restaurantsAPI.getFacets(filters),
+  suggest: (prefix, limit) => restaurantsAPI.suggest(prefix, limit),
 };
 
 export const reviewAPI = {
   // old code expected create(data)
   getByRestaurant: (restaurantId) => reviewsAPI.getByRestaurant(restaurantId),
+  getPage: (restaurantId, options) => reviewsAPI.getPage(restaurantId, options),
+  getText: (reviewId) => reviewsAPI.getText(reviewId),
   create: (data) => {
     // Accept either (restaurantId, reviewText) or a data object
     if (data && data.restaurant_id && data.review_text) {